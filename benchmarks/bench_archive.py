@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+报价单存档性能测试
+在临时数据库中保存数万个报价单，测量分页列表、按客户筛选和打开单个报价单的耗时
+
+用法:
+    python benchmarks/bench_archive.py [报价单数] [每单行数]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+# 将项目根目录添加到路径，确保可以导入模块
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.models.data_models import QuotationItem, QuotationDocument, ComponentPool, SphereItem, FlangeItem
+from src.models.quotation_archive import QuotationArchive
+
+DEFAULT_DOCUMENTS = 20000
+DEFAULT_LINES = 20
+CUSTOMERS = 300
+REPEAT = 20
+
+
+def best_of(func):
+    """重复执行取最快耗时（毫秒）"""
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    documents = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DOCUMENTS
+    lines_per_document = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_LINES
+    rng = random.Random(7)
+    pool = ComponentPool()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        archive = QuotationArchive(os.path.join(data_dir, "archive.db"))
+
+        start = time.perf_counter()
+        for i in range(documents):
+            lines = [
+                QuotationItem(
+                    pool.intern(SphereItem, f"球体{rng.randrange(40)}", f"DN{rng.choice([50, 80, 100])}", 100),
+                    pool.intern(FlangeItem, f"法兰{rng.randrange(20)}", "DN100", 20),
+                    pool.intern(FlangeItem, f"法兰{rng.randrange(20)}", "DN100", 20),
+                    rng.randint(1, 100)
+                )
+                for _ in range(lines_per_document)
+            ]
+            archive.save_document(QuotationDocument(name=f"报价单{i}", customer=f"客户{i % CUSTOMERS}"), lines)
+        save_s = time.perf_counter() - start
+
+        last_page = (documents + 49) // 50
+        first_ms = best_of(lambda: archive.list_documents(1))
+        last_ms = best_of(lambda: archive.list_documents(last_page))
+        customer_ms = best_of(lambda: archive.list_documents(1, customer="客户7"))
+        keyword_ms = best_of(lambda: archive.list_documents(1, keyword="报价单123"))
+        open_ms = best_of(lambda: archive.load_lines(documents // 2))
+        assert len(archive.load_lines(documents // 2)) == lines_per_document
+        archive.close()
+        db_mb = os.path.getsize(os.path.join(data_dir, "archive.db")) / 1e6
+
+    print(f"报价单 {documents} 个，每单 {lines_per_document} 行（数据库 {db_mb:.1f} MB，保存耗时 {save_s:.2f} s）")
+    print(f"第一页列表:     {first_ms:8.2f} ms")
+    print(f"最后一页列表:   {last_ms:8.2f} ms")
+    print(f"按客户筛选:     {customer_ms:8.2f} ms")
+    print(f"关键字搜索:     {keyword_ms:8.2f} ms")
+    print(f"打开一个报价单: {open_ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+原子写入性能测试
+对比原先直接 json.dump 写入目标文件与 atomic_write_json（临时文件 + fsync + 重命名）的耗时
+
+用法:
+    python benchmarks/bench_atomic_write.py
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+
+# 将项目根目录添加到路径，确保可以导入模块
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.utils.file_utils import atomic_write_json
+
+CATALOG_SIZES = [1000, 10000, 50000]
+REPEAT = 5
+
+
+def direct_write(filepath, data):
+    """原先的写入方式：直接以 'w' 打开目标文件并 json.dump"""
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def best_time(func, *args):
+    """多次运行取最短耗时（毫秒）"""
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    print(f"{'目录规模':>10} {'直接写入(ms)':>14} {'原子写入(ms)':>14} {'原子+备份(ms)':>16}")
+    with tempfile.TemporaryDirectory() as data_dir:
+        filepath = os.path.join(data_dir, "spheres.json")
+        for size in CATALOG_SIZES:
+            data = [
+                {"type_name": f"橡胶软接头{i % 50}", "model": f"DN{i}", "cost_price": float(i)}
+                for i in range(size)
+            ]
+            direct_ms = best_time(direct_write, filepath, data)
+            atomic_ms = best_time(atomic_write_json, filepath, data)
+            backup_ms = best_time(lambda: atomic_write_json(filepath, data, backup_count=3))
+            print(f"{size:>10} {direct_ms:>14.2f} {atomic_ms:>14.2f} {backup_ms:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+后台导出响应性测试
+比较在当前线程中导出（界面在整个导出期间无响应）与后台导出时主线程定时任务的最长间隔
+
+用法:
+    python benchmarks/bench_background_export.py [行数]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# 将项目根目录添加到路径，确保可以导入模块
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from bench_export import build_quotations, SETTINGS
+from src.utils.export_utils import write_pdf, write_excel
+from src.utils.background_export import BackgroundExport
+
+DEFAULT_LINES = 10000
+# 模拟界面事件循环的定时间隔（秒）
+TICK_INTERVAL = 0.02
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LINES
+    quotations = build_quotations(size)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        print(f"报价行数: {size}")
+        for export_format, write in (("pdf", write_pdf), ("xlsx", write_excel)):
+            filepath = os.path.join(output_dir, f"quotation.{export_format}")
+
+            start = time.perf_counter()
+            write(quotations, filepath, SETTINGS)
+            blocked = time.perf_counter() - start
+
+            # 后台导出期间主线程按固定间隔“处理事件”，记录相邻两次之间的最长间隔
+            task = BackgroundExport(export_format, quotations, filepath, SETTINGS)
+            start = last_tick = time.perf_counter()
+            task.start()
+            longest_gap = 0
+            while not task.is_done():
+                time.sleep(TICK_INTERVAL)
+                now = time.perf_counter()
+                longest_gap = max(longest_gap, now - last_tick)
+                last_tick = now
+            success, message = task.result
+            assert success, message
+
+            print(f"{export_format}: 当前线程导出阻塞 {blocked:7.3f} s；后台导出 {time.perf_counter() - start:7.3f} s，"
+                  f"主线程最长间隔 {longest_gap * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
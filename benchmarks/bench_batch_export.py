@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+批量导出性能测试
+比较逐份串行导出与进程池并行导出多份报价单（PDF和Excel）的总耗时
+
+用法:
+    python benchmarks/bench_batch_export.py [报价单数] [每份行数]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# 将项目根目录添加到路径，确保可以导入模块
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from bench_export import build_quotations, SETTINGS
+from src.utils.batch_export import export_batch
+
+DEFAULT_DOCUMENTS = 40
+DEFAULT_LINES = 500
+
+
+def main():
+    documents = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DOCUMENTS
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_LINES
+    quotations = build_quotations(size)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        jobs = [
+            (quotations, os.path.join(output_dir, f"quotation_{i}.{extension}"))
+            for i in range(documents)
+            for extension in ("pdf", "xlsx")
+        ]
+        print(f"报价单数: {documents}，每份行数: {size}，文件数: {len(jobs)}，CPU核数: {os.cpu_count()}")
+        for label, workers in (("串行", 1), ("进程池", None)):
+            start = time.perf_counter()
+            success, message, results = export_batch(jobs, SETTINGS, False, workers)
+            seconds = time.perf_counter() - start
+            assert success, message
+            slowest = max(result["seconds"] for result in results)
+            print(f"{label}: {seconds:8.3f} s，单个文件最长 {slowest:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+目录索引性能测试
+验证球体查找和更新（upsert）的耗时不随目录规模增长
+
+用法:
+    python benchmarks/bench_catalog_index.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# 将项目根目录添加到路径，确保可以导入模块
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.models.data_manager import DataManager
+from src.models.data_models import SphereItem
+
+CATALOG_SIZES = [1000, 10000, 50000]
+OPERATIONS = 20000
+
+
+def build_manager(data_dir, size):
+    """创建包含指定数量球体的数据管理器（禁用写盘，只测量内存中的索引开销）"""
+    manager = DataManager(data_dir)
+    manager.save_spheres = lambda: True
+    manager.spheres = [SphereItem(f"类型{i % 50}", f"DN{i}", float(i)) for i in range(size)]
+    manager._sphere_index.rebuild(manager.spheres)
+    return manager
+
+
+def main():
+    print(f"{'目录规模':>10} {'查找(us/次)':>14} {'更新(us/次)':>14}")
+    with tempfile.TemporaryDirectory() as data_dir:
+        for size in CATALOG_SIZES:
+            manager = build_manager(data_dir, size)
+            keys = [(f"类型{i % 50}", f"DN{i}") for i in range(0, size, max(1, size // OPERATIONS))]
+
+            start = time.perf_counter()
+            for _ in range(OPERATIONS // len(keys) + 1):
+                for type_name, model in keys:
+                    manager.find_sphere(type_name, model)
+            lookup_us = (time.perf_counter() - start) / (len(keys) * (OPERATIONS // len(keys) + 1)) * 1e6
+
+            start = time.perf_counter()
+            for type_name, model in keys:
+                manager.add_sphere(SphereItem(type_name, model, 1.0))
+            upsert_us = (time.perf_counter() - start) / len(keys) * 1e6
+
+            print(f"{size:>10} {lookup_us:>14.3f} {upsert_us:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+报价单导出性能测试
+测量大报价单导出PDF和Excel的耗时和峰值内存（tracemalloc 统计的Python内存分配）
+
+用法:
+    python benchmarks/bench_export.py [行数]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+
+# 将项目根目录添加到路径，确保可以导入模块
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.models.data_models import QuotationItem, ComponentPool, SphereItem, FlangeItem
+from src.utils.export_utils import export_to_pdf, export_to_excel
+
+DEFAULT_LINES = 20000
+SETTINGS = {"company_name": "橡胶接头有限公司", "contact_info": "电话: 010-12345678"}
+
+
+def build_quotations(size):
+    """生成使用共享配件的报价行"""
+    pool = ComponentPool()
+    return [
+        QuotationItem(
+            pool.intern(SphereItem, f"球体{i % 40}", f"DN{i % 300}", 100 + i % 97 * 0.37),
+            pool.intern(FlangeItem, f"法兰{i % 20}", "DN100", 20.5),
+            pool.intern(FlangeItem, f"法兰{i % 20}", "DN100", 20.5),
+            i % 50 + 1
+        )
+        for i in range(size)
+    ]
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LINES
+    quotations = build_quotations(size)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        print(f"报价行数: {size}")
+        for name, export, extension in (("PDF", export_to_pdf, "pdf"), ("Excel", export_to_excel, "xlsx")):
+            filepath = os.path.join(output_dir, f"quotation.{extension}")
+            for show_cost_price in (False, True):
+                start = time.perf_counter()
+                assert export(quotations, filepath, SETTINGS, show_cost_price)
+                seconds = time.perf_counter() - start
+
+                # 单独再导出一次统计峰值内存，tracemalloc 会拖慢执行，不计入耗时
+                tracemalloc.start()
+                assert export(quotations, filepath, SETTINGS, show_cost_price)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                label = "含成本列" if show_cost_price else "不含成本"
+                print(f"{name}（{label}）: {seconds:8.3f} s，峰值内存 {peak / 1e6:6.2f} MB，"
+                      f"文件 {os.path.getsize(filepath) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+模块导入耗时测试
+在新的解释器进程中导入数据管理和导出模块，测量启动时的导入耗时，并检查是否加载了 pandas
+
+用法:
+    python benchmarks/bench_import_time.py [重复次数]
+"""
+
+import os
+import sys
+import subprocess
+
+# 项目根目录
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_REPEAT = 5
+
+# 在子进程中执行的导入代码，输出耗时和是否加载了 pandas
+_IMPORT_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import src.models.data_manager
+import src.utils.export_utils
+print(time.perf_counter() - start, "pandas" in sys.modules)
+"""
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REPEAT
+    timings = []
+    pandas_loaded = False
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _IMPORT_SCRIPT], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.split()
+        timings.append(float(output[0]))
+        pandas_loaded = output[1] == "True"
+
+    print(f"导入 data_manager + export_utils（{repeat} 次中最快）: {min(timings) * 1000:8.1f} ms")
+    print(f"是否加载 pandas: {'是' if pandas_loaded else '否'}")
+
+
+if __name__ == "__main__":
+    main()
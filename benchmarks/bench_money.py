@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+金额计算性能测试
+对比原先的浮点数计价与整数分计价在 10 万行报价上的耗时，并统计浮点方式的分位误差
+
+原先的浮点计价方式在本文件中按原实现复制一份（LegacyQuotation），
+两种方式使用相同的成本价、数量和利润率。
+
+用法:
+    python benchmarks/bench_money.py [行数]
+"""
+
+import os
+import sys
+import time
+import random
+
+# 将项目根目录添加到路径，确保可以导入模块
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.models.data_models import SphereItem, FlangeItem, QuotationItem
+from src.models.money import format_cents
+from src.models.pricing import QuotationPricing
+
+DEFAULT_LINES = 100000
+REPEAT = 5
+
+
+class LegacyQuotation:
+    """原先的报价行：成本价为浮点数，派生价格用浮点数计算"""
+
+    __slots__ = ("sphere_cost", "flange1_cost", "flange2_cost", "quantity", "profit_percentage")
+
+    def __init__(self, sphere_cost, flange1_cost, flange2_cost, quantity, profit_percentage):
+        self.sphere_cost = sphere_cost
+        self.flange1_cost = flange1_cost
+        self.flange2_cost = flange2_cost
+        self.quantity = quantity
+        self.profit_percentage = profit_percentage
+
+    @property
+    def unit_cost_price(self):
+        return self.sphere_cost + self.flange1_cost + self.flange2_cost
+
+    @property
+    def total_cost_price(self):
+        return self.unit_cost_price * self.quantity
+
+    @property
+    def unit_price(self):
+        return self.unit_cost_price * (1 + self.profit_percentage / 100)
+
+    @property
+    def total_price(self):
+        return self.unit_price * self.quantity
+
+
+def build_quotations(size):
+    """生成成本价、数量和利润率相同的两组报价行"""
+    rng = random.Random(42)
+    legacy, current = [], []
+    for _ in range(size):
+        costs = [rng.randint(100, 99999) / 100 for _ in range(3)]
+        quantity = rng.randint(1, 200)
+        profit = rng.choice([15.0, 20.0, 25.0, 30.0, 33.5])
+        legacy.append(LegacyQuotation(*costs, quantity, profit))
+        current.append(QuotationItem(
+            SphereItem("球体", "DN100", costs[0]),
+            FlangeItem("法兰", "DN100", costs[1]),
+            FlangeItem("法兰", "DN100", costs[2]),
+            quantity,
+            profit
+        ))
+    return legacy, current
+
+
+def legacy_prices(quotations):
+    """原先的计价：逐行调用浮点属性并累加总计"""
+    prices = [(q.unit_cost_price, q.total_cost_price, q.unit_price, q.total_price) for q in quotations]
+    total = 0
+    for price in prices:
+        total += price[3]
+    return prices, total
+
+
+def cents_property_prices(quotations):
+    """整数分计价：逐行调用 QuotationItem 的分属性并求总计"""
+    prices = [(q.unit_cost_cents, q.total_cost_cents, q.unit_price_cents, q.total_price_cents)
+              for q in quotations]
+    return prices, sum(price[3] for price in prices)
+
+
+def cents_pricing_prices(quotations):
+    """整数分计价：批量计价"""
+    pricing = QuotationPricing(quotations)
+    return list(pricing.iter_rows()), pricing.grand_total_cents
+
+
+def legacy_export_rows(quotations):
+    """原先导出时的做法：逐行调用浮点属性、格式化并累加总计"""
+    rows = []
+    total = 0
+    for q in quotations:
+        rows.append((f"{q.unit_cost_price:.2f}", f"{q.total_cost_price:.2f}",
+                     f"{q.unit_price:.2f}", f"{q.total_price:.2f}"))
+        total += q.total_price
+    return rows, f"{total:.2f}"
+
+
+def cents_property_rows(quotations):
+    """整数分方式：逐行调用 QuotationItem 的分属性"""
+    rows = []
+    total = 0
+    for q in quotations:
+        rows.append((format_cents(q.unit_cost_cents), format_cents(q.total_cost_cents),
+                     format_cents(q.unit_price_cents), format_cents(q.total_price_cents)))
+        total += q.total_price_cents
+    return rows, format_cents(total)
+
+
+def cents_pricing_rows(quotations):
+    """整数分方式：导出时使用的批量计价"""
+    pricing = QuotationPricing(quotations)
+    rows = [
+        (format_cents(unit_cost), format_cents(total_cost), format_cents(unit_price), format_cents(total_price))
+        for unit_cost, total_cost, unit_price, total_price in pricing.iter_rows()
+    ]
+    return rows, format_cents(pricing.grand_total_cents)
+
+
+def best_of(func, quotations):
+    """重复执行取最短耗时"""
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func(quotations)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def column_mismatch(rows, total):
+    """统计显示的行合计之和与显示的总计相差的分数"""
+    line_sum = sum(round(float(row[3]) * 100) for row in rows)
+    return abs(line_sum - round(float(total) * 100))
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LINES
+    legacy, current = build_quotations(size)
+
+    legacy_price_s, _ = best_of(legacy_prices, legacy)
+    property_price_s, (property_prices, property_price_total) = best_of(cents_property_prices, current)
+    pricing_price_s, (pricing_prices, pricing_price_total) = best_of(cents_pricing_prices, current)
+    assert property_prices == pricing_prices and property_price_total == pricing_price_total
+
+    legacy_s, (legacy_rows, legacy_total) = best_of(legacy_export_rows, legacy)
+    property_s, (property_rows, property_total) = best_of(cents_property_rows, current)
+    pricing_s, (pricing_rows, pricing_total) = best_of(cents_pricing_rows, current)
+    assert property_rows == pricing_rows and property_total == pricing_total
+
+    print(f"报价行数: {size}（取 {REPEAT} 次中最快）")
+    print("只计价并求总计:")
+    print(f"  浮点数逐行属性: {legacy_price_s:8.3f} s")
+    print(f"  整数分逐行属性: {property_price_s:8.3f} s")
+    print(f"  整数分批量计价: {pricing_price_s:8.3f} s  ({legacy_price_s / pricing_price_s:.1f}x)")
+    print("计价、格式化为两位小数并求总计（导出时的工作量）:")
+    print(f"  浮点数逐行属性: {legacy_s:8.3f} s  行合计之和与总计相差 {column_mismatch(legacy_rows, legacy_total)} 分")
+    print(f"  整数分逐行属性: {property_s:8.3f} s  行合计之和与总计相差 {column_mismatch(property_rows, property_total)} 分")
+    print(f"  整数分批量计价: {pricing_s:8.3f} s  ({legacy_s / pricing_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
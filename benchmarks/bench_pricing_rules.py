@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+定价规则性能测试
+用数百条规则（按类型加价、数量阶梯、客户折扣）对 10 万条报价行批量计算利润率
+
+用法:
+    python benchmarks/bench_pricing_rules.py [行数]
+"""
+
+import os
+import sys
+import time
+import random
+
+# 将项目根目录添加到路径，确保可以导入模块
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.models.data_models import QuotationItem, ComponentPool, SphereItem, FlangeItem
+from src.models.pricing_rules import PricingRules, RULE_MARKUP, RULE_QUANTITY_BREAK, RULE_CUSTOMER_DISCOUNT
+
+DEFAULT_LINES = 100000
+SPHERE_TYPES = 150
+FLANGE_TYPES = 40
+CUSTOMERS = 50
+
+
+def build_rules(rng):
+    """生成约 300 条规则"""
+    rules = []
+    for i in range(SPHERE_TYPES):
+        rules.append({"rule": RULE_MARKUP, "part": "sphere", "type_name": f"球体{i}",
+                      "profit_percentage": rng.choice([20, 25, 30, 35])})
+    for i in range(FLANGE_TYPES):
+        rules.append({"rule": RULE_MARKUP, "part": "flange", "type_name": f"法兰{i}",
+                      "profit_percentage": rng.choice([25, 32.5, 40])})
+    for i in range(0, SPHERE_TYPES, 10):
+        for min_quantity, discount in ((10, 2), (50, 5), (100, 8), (500, 12)):
+            rules.append({"rule": RULE_QUANTITY_BREAK, "type_name": f"球体{i}",
+                          "min_quantity": min_quantity, "discount_percentage": discount})
+    for min_quantity, discount in ((20, 3), (200, 6), (1000, 10)):
+        rules.append({"rule": RULE_QUANTITY_BREAK, "min_quantity": min_quantity, "discount_percentage": discount})
+    for i in range(CUSTOMERS):
+        rules.append({"rule": RULE_CUSTOMER_DISCOUNT, "customer": f"客户{i}",
+                      "discount_percentage": rng.choice([1, 2.5, 5])})
+    return rules
+
+
+def build_quotations(rng, size):
+    """生成使用共享配件的报价行"""
+    pool = ComponentPool()
+    return [
+        QuotationItem(
+            pool.intern(SphereItem, f"球体{rng.randrange(SPHERE_TYPES)}", f"DN{rng.choice([50, 80, 100, 150])}", 100),
+            pool.intern(FlangeItem, f"法兰{rng.randrange(FLANGE_TYPES)}", "DN100", 20),
+            pool.intern(FlangeItem, f"法兰{rng.randrange(FLANGE_TYPES)}", "DN100", 20),
+            rng.randint(1, 2000)
+        )
+        for _ in range(size)
+    ]
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LINES
+    rng = random.Random(7)
+    rules = build_rules(rng)
+    quotations = build_quotations(rng, size)
+
+    start = time.perf_counter()
+    compiled = PricingRules(rules)
+    compile_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    changed = compiled.apply(quotations, customer="客户3")
+    apply_s = time.perf_counter() - start
+
+    # 抽样核对批量结果与逐行计算一致
+    for line in rng.sample(quotations, min(1000, size)):
+        assert line.profit_bp == compiled.profit_bp_for(line, "客户3")
+
+    print(f"规则数: {len(rules)}，报价行数: {size}")
+    print(f"编译规则: {compile_s * 1000:8.2f} ms")
+    print(f"批量应用: {apply_s:8.3f} s（{changed} 行利润率变化）")
+
+
+if __name__ == "__main__":
+    main()
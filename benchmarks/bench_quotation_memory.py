@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+报价数据内存占用测试
+测量从JSON加载 10 万条报价行后常驻的内存，对比每行复制配件与共享配件两种方式
+
+用法:
+    python benchmarks/bench_quotation_memory.py
+"""
+
+import gc
+import os
+import sys
+import json
+import tracemalloc
+
+# 将项目根目录添加到路径，确保可以导入模块
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.models.data_models import QuotationItem, ComponentPool
+
+LINES = 100000
+
+
+def build_raw_quotations():
+    """用示例目录生成 10 万条报价行的JSON文本"""
+    with open(os.path.join(ROOT_DIR, "data", "spheres.json"), 'r', encoding='utf-8') as f:
+        spheres = json.load(f)
+    with open(os.path.join(ROOT_DIR, "data", "flanges.json"), 'r', encoding='utf-8') as f:
+        flanges = json.load(f)
+    return json.dumps([
+        {
+            "sphere": spheres[i % len(spheres)],
+            "flange1": flanges[i % len(flanges)],
+            "flange2": flanges[(i * 7) % len(flanges)],
+            "quantity": i % 20 + 1,
+            "profit_percentage": 30.0
+        }
+        for i in range(LINES)
+    ], ensure_ascii=False)
+
+
+def resident_mb(raw, pool):
+    """加载报价并释放中间数据后，返回仍被报价对象占用的内存（MB）"""
+    gc.collect()
+    tracemalloc.start()
+    data = json.loads(raw)
+    items = [QuotationItem.from_dict(item, pool) for item in data]
+    del data
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(items) == LINES
+    return current / 1e6
+
+
+def main():
+    raw = build_raw_quotations()
+    copied = resident_mb(raw, None)
+    shared = resident_mb(raw, ComponentPool())
+    print(f"每 {LINES} 条报价行的常驻内存")
+    print(f"每行复制配件: {copied:8.1f} MB")
+    print(f"共享配件:     {shared:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+启动加载性能测试
+在临时数据目录中生成大目录和报价历史，对比 DataManager 从JSON冷启动与从二进制快照热启动的耗时，
+以及报价延迟加载时创建 DataManager（界面可显示）所需的时间
+
+用法:
+    python benchmarks/bench_startup.py [目录条数] [报价行数]
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import atexit
+import tempfile
+
+# 将项目根目录添加到路径，确保可以导入模块
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.models.data_manager import DataManager
+
+DEFAULT_CATALOG_ITEMS = 50000
+DEFAULT_QUOTATION_LINES = 100000
+REPEAT = 3
+
+
+def write_data(data_dir, catalog_items, quotation_lines):
+    """生成球体、法兰、报价和设置文件"""
+    spheres = [{"type_name": f"球体{i % 40}", "model": f"DN{i}", "cost_price": round(50 + i % 997 * 0.37, 2)}
+               for i in range(catalog_items)]
+    flanges = [{"type_name": f"法兰{i % 20}", "model": f"DN{i}", "cost_price": round(10 + i % 499 * 0.21, 2)}
+               for i in range(catalog_items)]
+    quotations = [
+        {
+            "sphere": spheres[(i * 7) % 2000],
+            "flange1": flanges[(i * 3) % 2000],
+            "flange2": flanges[(i * 3) % 2000],
+            "quantity": i % 50 + 1,
+            "profit_percentage": 30.0
+        }
+        for i in range(quotation_lines)
+    ]
+    for name, data in (("spheres", spheres), ("flanges", flanges), ("quotations", quotations),
+                       ("settings", {"snapshot_cache": True})):
+        with open(os.path.join(data_dir, f"{name}.json"), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def timed_load(data_dir, touch_quotations=True):
+    """计时创建 DataManager，touch_quotations 为True时包含首次访问报价触发的加载"""
+    gc.collect()
+    start = time.perf_counter()
+    manager = DataManager(data_dir)
+    if touch_quotations:
+        len(manager.quotations)
+    seconds = time.perf_counter() - start
+    # 临时目录在测试结束时删除，不需要退出时写快照
+    atexit.unregister(manager.save_snapshot)
+    return seconds, manager
+
+
+def main():
+    catalog_items = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CATALOG_ITEMS
+    quotation_lines = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_QUOTATION_LINES
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_data(data_dir, catalog_items, quotation_lines)
+        snapshot_file = os.path.join(data_dir, "snapshot.bin")
+
+        cold = []
+        first_window = []
+        for _ in range(REPEAT):
+            if os.path.exists(snapshot_file):
+                os.remove(snapshot_file)
+            first_window.append(timed_load(data_dir, touch_quotations=False)[0])
+            seconds, manager = timed_load(data_dir)
+            cold.append(seconds)
+
+        start = time.perf_counter()
+        manager.save_snapshot()
+        save_s = time.perf_counter() - start
+        expected = ([item.to_dict() for item in manager.spheres[:100]],
+                    [item.to_dict() for item in manager.quotations[:100]])
+
+        warm = []
+        warm_window = []
+        for _ in range(REPEAT):
+            warm_window.append(timed_load(data_dir, touch_quotations=False)[0])
+            seconds, manager = timed_load(data_dir)
+            warm.append(seconds)
+        assert ([item.to_dict() for item in manager.spheres[:100]],
+                [item.to_dict() for item in manager.quotations[:100]]) == expected
+        assert len(manager.quotations) == quotation_lines
+
+        json_mb = sum(os.path.getsize(os.path.join(data_dir, f"{name}.json"))
+                      for name in ("spheres", "flanges", "quotations")) / 1e6
+        snapshot_mb = os.path.getsize(snapshot_file) / 1e6
+
+    print(f"球体/法兰各 {catalog_items} 条，报价 {quotation_lines} 行（取 {REPEAT} 次中最快）")
+    print(f"JSON冷启动:   {min(cold):8.3f} s  ({json_mb:.1f} MB JSON)")
+    print(f"延迟加载报价: {min(first_window):8.3f} s（创建 DataManager，未访问报价）")
+    print(f"快照热启动:   {min(warm):8.3f} s  ({snapshot_mb:.1f} MB 快照, {min(cold) / min(warm):.1f}x)")
+    print(f"快照延迟加载: {min(warm_window):8.3f} s（创建 DataManager，未访问报价）")
+    print(f"写入快照:     {save_s:8.3f} s（退出时执行一次）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+橡胶接头价格管理与报价小工具
+批量导出命令行入口 - 不启动界面，将存档中的报价单并行导出为PDF/Excel文件
+
+用法示例:
+    python export_cli.py --output exports --all --format pdf xlsx
+    python export_cli.py --output exports --customer 甲公司 --status sent
+    python export_cli.py --output exports --ids 12 15 18 --workers 4
+"""
+
+import sys
+import os
+import argparse
+import multiprocessing
+
+# 将当前目录添加到路径，确保可以导入模块
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from src.models.data_manager import DataManager
+
+# 分页读取报价单抬头时每页的条数
+PAGE_SIZE = 500
+
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="将存档中的报价单批量导出为PDF/Excel文件")
+    parser.add_argument("--output", required=True, help="输出目录")
+    parser.add_argument("--data-dir", default="data", help="数据目录（默认为程序目录下的 data）")
+    selection = parser.add_mutually_exclusive_group(required=True)
+    selection.add_argument("--ids", type=int, nargs="+", help="要导出的报价单编号")
+    selection.add_argument("--all", action="store_true", help="导出符合筛选条件的全部报价单")
+    parser.add_argument("--customer", help="只导出该客户的报价单（与 --all 一起使用）")
+    parser.add_argument("--status", help="只导出该状态的报价单（与 --all 一起使用）")
+    parser.add_argument("--format", nargs="+", choices=["pdf", "xlsx"], default=["pdf"], help="导出格式")
+    parser.add_argument("--show-cost", action="store_true", help="显示成本价和利润率")
+    parser.add_argument("--workers", type=int, help="工作进程数（默认为CPU核数）")
+    return parser.parse_args(argv)
+
+
+def select_documents(data_manager, customer=None, status=None):
+    """
+    分页读取符合条件的报价单编号（只读取抬头）
+
+    Args:
+        data_manager (DataManager): 数据管理器
+        customer (str, optional): 客户名称
+        status (str, optional): 报价单状态
+
+    Returns:
+        list: 报价单编号列表
+    """
+    document_ids = []
+    page = 1
+    while True:
+        documents, total = data_manager.list_quotation_documents(page, PAGE_SIZE, customer, status)
+        document_ids.extend(document.id for document in documents)
+        if not documents or len(document_ids) >= total:
+            return document_ids
+        page += 1
+
+
+def main(argv=None):
+    """命令行入口，全部导出成功时返回0"""
+    args = parse_args(argv)
+    data_manager = DataManager(args.data_dir)
+
+    document_ids = args.ids or select_documents(data_manager, args.customer, args.status)
+    if not document_ids:
+        print("没有符合条件的报价单")
+        return 0
+
+    def report_progress(done, total):
+        print(f"\r已完成 {done}/{total}", end="", flush=True)
+
+    success, message, results = data_manager.export_quotation_documents(
+        document_ids, args.output, args.format, args.show_cost, args.workers, report_progress
+    )
+    print()
+    for result in results:
+        status = f"失败: {result['error']}" if result["error"] else "成功"
+        print(f"{result['seconds']:7.2f} s  {result['lines']:6d} 行  {result['filepath']}  {status}")
+    print(message)
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    # 打包后的程序使用进程池时需要
+    multiprocessing.freeze_support()
+    sys.exit(main())
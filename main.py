@@ -8,6 +8,7 @@
 
 import sys
 import os
+import multiprocessing
 
 # 将当前目录添加到路径，确保可以导入模块
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -18,4 +19,6 @@ if current_dir not in sys.path:
 from src.main import main
 
 if __name__ == "__main__":
+    # 打包后的程序使用进程池并行导入时需要
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+配套索引模块
+按公称通径（DN）匹配球体与法兰，预先分组并缓存可组成的配套（球体 + 两个法兰）
+"""
+
+import re
+from itertools import combinations_with_replacement
+
+from src.models.data_models import cost_edit_count
+from src.models.quotation_index import KIND_SPHERE, KIND_FLANGE
+
+# 型号中的公称通径：优先匹配 "DN100"，否则取型号末尾的数字（如 "JZ-100"、"KQR-100"）
+_DN_PATTERN = re.compile(r"DN\s*(\d+)", re.IGNORECASE)
+_TRAILING_NUMBER_PATTERN = re.compile(r"(\d+)\s*$")
+
+
+def parse_nominal_size(model):
+    """
+    从型号中解析公称通径
+
+    Args:
+        model (str): 型号规格，如 "DN100"、"JZ-100"
+
+    Returns:
+        int: 公称通径，无法解析时返回None
+    """
+    match = _DN_PATTERN.search(model) or _TRAILING_NUMBER_PATTERN.search(model)
+    return int(match.group(1)) if match else None
+
+
+class AssemblyIndex:
+    """
+    配套索引类
+
+    球体和法兰按公称通径分组，目录增删时只更新相关通径的分组并使该通径的配套缓存失效。
+    配套按 (通径, 球体类型) 缓存；查询结果（含单件成本价）按查询条件缓存，
+    目录增删或任何配件改价后失效。
+    """
+
+    def __init__(self, spheres=None, flanges=None):
+        """
+        初始化配套索引
+
+        Args:
+            spheres (list, optional): 球体列表
+            flanges (list, optional): 法兰列表
+        """
+        # 种类 -> {通径: {(类型, 型号): 数据项}}
+        self._by_size = {KIND_SPHERE: {}, KIND_FLANGE: {}}
+        self._sizes_by_sphere_type = {}  # 球体类型 -> {通径: None}
+        self._assemblies = {}  # (通径, 是否允许两端法兰不同) -> {球体类型: [(球体, 法兰1, 法兰2)]}
+        self._results = {}  # (球体类型, 通径, 是否允许两端法兰不同) -> assemblies() 的结果
+        self._results_cost_edits = cost_edit_count()  # 缓存结果时的改价次数
+        self.unmatched = 0  # 型号中无法解析通径的数据项数量
+        self.rebuild(spheres or [], flanges or [])
+
+    def rebuild(self, spheres, flanges):
+        """
+        根据球体和法兰列表重建索引
+
+        Args:
+            spheres (list): 球体列表
+            flanges (list): 法兰列表
+        """
+        self._by_size = {KIND_SPHERE: {}, KIND_FLANGE: {}}
+        self._sizes_by_sphere_type = {}
+        self._assemblies = {}
+        self._results = {}
+        self.unmatched = 0
+        for sphere in spheres:
+            self.add(KIND_SPHERE, sphere)
+        for flange in flanges:
+            self.add(KIND_FLANGE, flange)
+
+    def add(self, kind, item):
+        """
+        将球体或法兰加入索引，已存在相同类型和型号时保留原有数据项
+
+        Args:
+            kind (str): KIND_SPHERE 或 KIND_FLANGE
+            item (SphereItem/FlangeItem): 数据项
+        """
+        size = parse_nominal_size(item.model)
+        if size is None:
+            self.unmatched += 1
+            return
+        group = self._by_size[kind].setdefault(size, {})
+        key = (item.type_name, item.model)
+        if key in group:
+            return
+        group[key] = item
+        if kind == KIND_SPHERE:
+            self._sizes_by_sphere_type.setdefault(item.type_name, {})[size] = None
+        self._invalidate(size)
+
+    def discard(self, kind, item, replacement=None):
+        """
+        将球体或法兰移出索引
+
+        Args:
+            kind (str): KIND_SPHERE 或 KIND_FLANGE
+            item (SphereItem/FlangeItem): 要移除的数据项
+            replacement (SphereItem/FlangeItem, optional): 目录中仍存在的相同类型和型号的数据项
+        """
+        size = parse_nominal_size(item.model)
+        if size is None:
+            self.unmatched = max(0, self.unmatched - 1)
+            return
+        groups = self._by_size[kind]
+        group = groups.get(size, {})
+        key = (item.type_name, item.model)
+        if group.get(key) is not item:
+            return
+        if replacement is not None:
+            group[key] = replacement
+        else:
+            del group[key]
+            if not group:
+                del groups[size]
+            if kind == KIND_SPHERE and not any(t == item.type_name for t, _ in group):
+                sizes = self._sizes_by_sphere_type[item.type_name]
+                del sizes[size]
+                if not sizes:
+                    del self._sizes_by_sphere_type[item.type_name]
+        self._invalidate(size)
+
+    def nominal_sizes(self):
+        """
+        获取同时有球体和法兰的公称通径
+
+        Returns:
+            list: 排序后的通径列表
+        """
+        return sorted(set(self._by_size[KIND_SPHERE]) & set(self._by_size[KIND_FLANGE]))
+
+    def flanges_for(self, sphere):
+        """
+        获取与球体通径相同的法兰
+
+        Args:
+            sphere (SphereItem): 球体对象
+
+        Returns:
+            list: 法兰列表
+        """
+        size = parse_nominal_size(sphere.model)
+        return list(self._by_size[KIND_FLANGE].get(size, {}).values())
+
+    def assemblies(self, sphere_type=None, size=None, mixed_flanges=False):
+        """
+        列出可组成的配套及其单件成本价
+
+        Args:
+            sphere_type (str, optional): 球体类型，为None时不限
+            size (int, optional): 公称通径，为None时不限
+            mixed_flanges (bool): 是否允许两端使用不同的法兰，默认两端相同
+
+        Returns:
+            tuple: (球体, 法兰1, 法兰2, 单件成本价(分)) 元组，相同条件再次查询时返回同一个缓存对象（只读）
+        """
+        edits = cost_edit_count()
+        if edits != self._results_cost_edits:
+            # 有配件改价，缓存的单件成本价已过期
+            self._results = {}
+            self._results_cost_edits = edits
+        cache_key = (sphere_type, size, mixed_flanges)
+        result = self._results.get(cache_key)
+        if result is not None:
+            return result
+
+        if size is not None:
+            sizes = [size]
+        elif sphere_type is not None:
+            sizes = list(self._sizes_by_sphere_type.get(sphere_type, {}))
+        else:
+            sizes = list(self._by_size[KIND_SPHERE])
+
+        result = []
+        for dn in sizes:
+            by_type = self._assemblies_for_size(dn, mixed_flanges)
+            groups = [by_type.get(sphere_type, [])] if sphere_type is not None else by_type.values()
+            for group in groups:
+                result.extend(
+                    (sphere, flange1, flange2, sphere.cost_cents + flange1.cost_cents + flange2.cost_cents)
+                    for sphere, flange1, flange2 in group
+                )
+        result = self._results[cache_key] = tuple(result)
+        return result
+
+    def _assemblies_for_size(self, size, mixed_flanges):
+        """获取（必要时生成并缓存）一个通径下按球体类型分组的配套"""
+        cache_key = (size, mixed_flanges)
+        by_type = self._assemblies.get(cache_key)
+        if by_type is None:
+            flanges = list(self._by_size[KIND_FLANGE].get(size, {}).values())
+            if mixed_flanges:
+                pairs = list(combinations_with_replacement(flanges, 2))
+            else:
+                pairs = [(flange, flange) for flange in flanges]
+            by_type = {}
+            for sphere in self._by_size[KIND_SPHERE].get(size, {}).values():
+                by_type.setdefault(sphere.type_name, []).extend(
+                    (sphere, flange1, flange2) for flange1, flange2 in pairs
+                )
+            self._assemblies[cache_key] = by_type
+        return by_type
+
+    def _invalidate(self, size):
+        """使一个通径的配套缓存以及涉及该通径的查询结果失效"""
+        self._assemblies.pop((size, False), None)
+        self._assemblies.pop((size, True), None)
+        # 未指定通径的查询包含所有通径，也一并失效
+        for cache_key in [key for key in self._results if key[1] is None or key[1] == size]:
+            del self._results[cache_key]
@@ -0,0 +1,424 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+目录导入模块
+将供应商提供的Excel/CSV价格表解析为 (类型, 型号, 成本价) 数据行
+"""
+
+import os
+import sys
+import csv
+import math
+import time
+
+# 目录文件必须包含的列
+REQUIRED_COLUMNS = ["type_name", "model", "cost_price"]
+
+# Excel表头占第1行，数据从第2行开始（DataFrame的第0行对应Excel第2行）
+EXCEL_FIRST_DATA_ROW = 2
+
+# openpyxl 不支持旧版 .xls 格式，这类文件需要可选的 pandas（及 xlrd）读取
+LEGACY_EXCEL_EXTENSIONS = (".xls",)
+
+# CSV流式导入每块的行数
+CSV_CHUNK_SIZE = 10000
+
+# 最多保留的行级错误数量，超出部分只计数
+MAX_REPORTED_ERRORS = 1000
+
+# 最多保留的价格变动明细数量，超出部分只计数
+MAX_REPORTED_DELTAS = 1000
+
+# 按扩展名识别的目录文件格式
+CSV_EXTENSIONS = (".csv",)
+EXCEL_EXTENSIONS = (".xlsx", ".xlsm", ".xls")
+
+# 导入方式
+IMPORT_MODE_REPLACE = "replace"  # 用文件内容整体替换现有目录
+IMPORT_MODE_MERGE = "merge"  # 只更新变动的价格并新增新的 (类型, 型号)
+
+
+def read_catalog_excel(file_path):
+    """
+    读取Excel目录文件
+
+    .xlsx/.xlsm 文件用 openpyxl 只读模式逐行读取，不需要 pandas；
+    .xls 文件只能在安装了 pandas 和 xlrd 时读取（打包版程序不包含 pandas，不能读取 .xls）。
+
+    Args:
+        file_path (str): Excel文件路径
+
+    Returns:
+        tuple: (rows, errors)，rows 为 (type_name, model, cost_price) 元组列表，
+            errors 为 (行号, 错误说明) 列表
+
+    Raises:
+        ValueError: 文件缺少必要的列，或读取 .xls 文件时未安装 pandas
+    """
+    if os.path.splitext(file_path)[1].lower() in LEGACY_EXCEL_EXTENSIONS:
+        pd = _import_pandas()
+        if pd is None:
+            if getattr(sys, "frozen", False):
+                # 打包时排除了 pandas，安装依赖也无济于事，只能提示转换格式
+                raise ValueError("本程序的打包版本不支持旧版 .xls 文件，请在Excel中将文件另存为 .xlsx 格式后再导入")
+            raise ValueError("读取 .xls 文件需要安装 pandas 和 xlrd，或将文件另存为 .xlsx 格式")
+        return catalog_rows_from_frame(pd.read_excel(file_path))
+
+    # openpyxl（连同其依赖的 numpy）导入较慢，只在实际读取Excel时导入，不影响程序启动
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        return catalog_rows_from_sheet(workbook.worksheets[0].iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+
+def catalog_rows_from_sheet(records):
+    """
+    逐行校验并转换工作表中的目录数据
+
+    规则与 catalog_rows_from_frame 相同：类型或型号为空、成本价无法转换为数字的行剔除并报告行号，
+    整数值的类型或型号不带小数部分。完全空白的行直接跳过。
+
+    Args:
+        records (iterable): 工作表的行（单元格值元组），第一行为表头
+
+    Returns:
+        tuple: (rows, errors)，rows 为 (type_name, model, cost_price) 元组列表，
+            errors 为 (行号, 错误说明) 列表
+
+    Raises:
+        ValueError: 工作表缺少必要的列
+    """
+    records = iter(records)
+    header = [name.strip() if isinstance(name, str) else name for name in next(records, ())]
+    if not all(col in header for col in REQUIRED_COLUMNS):
+        raise ValueError("Excel文件缺少必要的列：type_name, model, cost_price")
+    type_pos, model_pos, cost_pos = (header.index(col) for col in REQUIRED_COLUMNS)
+    width = max(type_pos, model_pos, cost_pos) + 1
+
+    rows = []
+    errors = []
+    for line_number, record in enumerate(records, EXCEL_FIRST_DATA_ROW):
+        if len(record) < width:
+            record = tuple(record) + (None,) * (width - len(record))
+        type_name = _cell_text(record[type_pos])
+        model = _cell_text(record[model_pos])
+        cost_price = _cell_number(record[cost_pos])
+        if not type_name or not model:
+            if any(value is not None for value in record):
+                errors.append((line_number, "类型或型号为空"))
+            continue
+        if cost_price is None:
+            errors.append((line_number, "成本价不是有效数字"))
+            continue
+        rows.append((type_name, model, cost_price))
+    return rows, errors
+
+
+def catalog_rows_from_frame(df):
+    """
+    按列批量校验并转换目录数据
+
+    成本价整列转换为数值，类型或型号为空、成本价无法转换的行整体剔除并报告行号，
+    其余行一次性生成数据行。
+
+    Args:
+        df (pandas.DataFrame): 包含 type_name、model、cost_price 列的数据表
+
+    Returns:
+        tuple: (rows, errors)，rows 为 (type_name, model, cost_price) 元组列表，
+            errors 为 (行号, 错误说明) 列表
+
+    Raises:
+        ValueError: 数据表缺少必要的列
+    """
+    if not all(col in df.columns for col in REQUIRED_COLUMNS):
+        raise ValueError("Excel文件缺少必要的列：type_name, model, cost_price")
+
+    pd = _import_pandas()
+    cost = pd.to_numeric(df["cost_price"], errors="coerce")
+    # 正负无穷无法换算为金额，与无法转换的值一样视为无效
+    cost = cost.mask(cost.abs() == math.inf)
+    missing_key = df["type_name"].isna() | df["model"].isna()
+    bad_cost = cost.isna() & ~missing_key
+    valid = ~(missing_key | bad_cost)
+
+    errors = []
+    if not valid.all():
+        line_numbers = df.index.to_numpy() + EXCEL_FIRST_DATA_ROW
+        errors.extend((int(n), "类型或型号为空") for n in line_numbers[missing_key.to_numpy()])
+        errors.extend((int(n), "成本价不是有效数字") for n in line_numbers[bad_cost.to_numpy()])
+        errors.sort()
+
+    types = _text_column(df["type_name"][valid])
+    models = _text_column(df["model"][valid])
+    costs = cost[valid].astype(float)
+
+    rows = list(zip(types.tolist(), models.tolist(), costs.tolist()))
+    return rows, errors
+
+
+def parse_catalog_file(file_path):
+    """
+    完整解析一个CSV或Excel目录文件（供进程池中的工作进程调用）
+
+    Args:
+        file_path (str): 目录文件路径，按扩展名识别格式
+
+    Returns:
+        dict: 包含 file_path、rows、errors、error_count、seconds 的解析结果，
+            解析失败时 error 为错误说明、rows 为空列表
+    """
+    start = time.perf_counter()
+    result = {"file_path": file_path, "rows": [], "errors": [], "error_count": 0, "error": None}
+    try:
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension in CSV_EXTENSIONS:
+            errors = ImportErrors()
+            for rows, _ in iter_catalog_csv(file_path, errors):
+                result["rows"].extend(rows)
+            result["errors"] = errors.items
+            result["error_count"] = errors.count
+        elif extension in EXCEL_EXTENSIONS:
+            rows, errors = read_catalog_excel(file_path)
+            result["rows"] = rows
+            result["errors"] = errors[:MAX_REPORTED_ERRORS]
+            result["error_count"] = len(errors)
+        else:
+            raise ValueError(f"不支持的文件格式: {extension}")
+    except Exception as e:
+        result["rows"] = []
+        result["error"] = str(e)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def _import_pandas():
+    """按需导入可选依赖 pandas（导入耗时较长，只在读取 .xls 或处理 DataFrame 时加载），未安装时返回None"""
+    try:
+        import pandas
+    except ImportError:
+        return None
+    return pandas
+
+
+def _cell_text(value):
+    """将单元格值转换为去除首尾空白的字符串，整数值不带小数部分；空单元格返回空字符串"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _cell_number(value):
+    """将单元格值转换为成本价，无法转换或为空时返回None"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        number = float(value)
+    elif isinstance(value, str):
+        try:
+            number = float(value.strip())
+        except ValueError:
+            return None
+    else:
+        return None
+    # NaN 和正负无穷无法换算为金额，视为无效
+    return number if math.isfinite(number) else None
+
+
+def _text_column(series):
+    """将一列转换为去除首尾空白的字符串，整数值不带小数部分（如型号 100 而非 100.0）"""
+    pd = _import_pandas()
+    if pd.api.types.is_float_dtype(series) and (series % 1 == 0).all():
+        series = series.astype("int64")
+    return series.astype(str).str.strip()
+
+
+def iter_catalog_csv(file_path, errors, chunk_size=CSV_CHUNK_SIZE):
+    """
+    按块流式读取CSV目录文件
+
+    每次最多产出 chunk_size 个数据行，内存占用与文件大小无关。
+    无法解析的行不会中断读取，而是以 (行号, 错误说明) 追加到 errors。
+
+    Args:
+        file_path (str): CSV文件路径
+        errors (ImportErrors): 收集行级错误的对象
+        chunk_size (int): 每块的数据行数
+
+    Yields:
+        tuple: (rows, fraction)，rows 为 (type_name, model, cost_price) 元组列表，
+            fraction 为已读取的文件比例（0~1）
+
+    Raises:
+        ValueError: 文件缺少必要的列
+    """
+    total_bytes = os.path.getsize(file_path) or 1
+    bytes_read = 0
+
+    with open(file_path, 'rb') as f:
+        def decoded_lines():
+            nonlocal bytes_read
+            encoding = 'utf-8-sig'  # 首行可能带BOM
+            for raw_line in f:
+                bytes_read += len(raw_line)
+                yield raw_line.decode(encoding)
+                encoding = 'utf-8'
+
+        reader = csv.reader(decoded_lines())
+        header = next(reader, None)
+        if header is None:
+            return
+        header = [name.strip() for name in header]
+        if not all(col in header for col in REQUIRED_COLUMNS):
+            raise ValueError("CSV文件缺少必要的列：type_name, model, cost_price")
+        type_pos, model_pos, cost_pos = (header.index(col) for col in REQUIRED_COLUMNS)
+        width = max(type_pos, model_pos, cost_pos) + 1
+
+        rows = []
+        for record in reader:
+            if not record:
+                continue  # 空行
+            if len(record) < width:
+                errors.add(reader.line_num, "列数不足")
+                continue
+            type_name = record[type_pos].strip()
+            model = record[model_pos].strip()
+            if not type_name or not model:
+                errors.add(reader.line_num, "类型或型号为空")
+                continue
+            try:
+                cost_price = float(record[cost_pos])
+                if not math.isfinite(cost_price):
+                    # float() 接受 "nan"、"inf"，但它们无法换算为金额
+                    raise ValueError(record[cost_pos])
+            except ValueError:
+                errors.add(reader.line_num, f"成本价不是有效数字: {record[cost_pos]!r}")
+                continue
+
+            rows.append((type_name, model, cost_price))
+            if len(rows) >= chunk_size:
+                yield rows, bytes_read / total_bytes
+                rows = []
+
+        yield rows, 1.0
+
+
+class ImportErrors:
+    """行级导入错误收集器，只保留前 MAX_REPORTED_ERRORS 条明细"""
+
+    def __init__(self, limit=MAX_REPORTED_ERRORS):
+        """
+        初始化错误收集器
+
+        Args:
+            limit (int): 最多保留的错误明细数量
+        """
+        self.limit = limit
+        self.count = 0
+        self.items = []  # (行号, 错误说明) 列表
+
+    def __len__(self):
+        return self.count
+
+    def add(self, line_number, message):
+        """
+        记录一条行级错误
+
+        Args:
+            line_number (int): 文件中的行号
+            message (str): 错误说明
+        """
+        self.count += 1
+        if len(self.items) < self.limit:
+            self.items.append((line_number, message))
+
+    def extend(self, errors, total=None, prefix=""):
+        """
+        批量记录行级错误
+
+        Args:
+            errors (list): (行号, 错误说明) 列表
+            total (int, optional): 错误总数（明细可能已被截断），默认为明细数量
+            prefix (str): 添加在错误说明前的文字，例如文件名
+        """
+        for line_number, message in errors:
+            self.add(line_number, prefix + message)
+        if total is not None and total > len(errors):
+            self.count += total - len(errors)
+
+
+class ImportDiff:
+    """导入差异摘要：新增、更新、未变和移除的数量，以及价格变动明细"""
+
+    def __init__(self, limit=MAX_REPORTED_DELTAS):
+        """
+        初始化差异摘要
+
+        Args:
+            limit (int): 最多保留的价格变动明细数量
+        """
+        self.limit = limit
+        self.added = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.removed = 0
+        self.duplicates = 0  # 文件中重复出现的行数（同一键以最后一行为准）
+        self.price_deltas = []  # (type_name, model, 原成本价, 新成本价) 列表
+
+    def record(self, type_name, model, old_price, new_price):
+        """
+        记录一个 (类型, 型号) 导入后相对原目录的变化
+
+        Args:
+            type_name (str): 类型名称
+            model (str): 型号规格
+            old_price (float): 原成本价，原目录中不存在时为None
+            new_price (float): 新成本价
+        """
+        if old_price is None:
+            self.added += 1
+        elif old_price == new_price:
+            self.unchanged += 1
+        else:
+            self.updated += 1
+            if len(self.price_deltas) < self.limit:
+                self.price_deltas.append((type_name, model, old_price, new_price))
+
+    def summary(self):
+        """
+        生成差异摘要文字
+
+        Returns:
+            str: 例如 "新增 3 条，更新 2 条，未变 10 条"
+        """
+        text = f"新增 {self.added} 条，更新 {self.updated} 条，未变 {self.unchanged} 条"
+        if self.removed:
+            text += f"，移除 {self.removed} 条"
+        if self.duplicates:
+            text += f"，合并重复行 {self.duplicates} 条"
+        return text
+
+    def to_dict(self):
+        """
+        将差异摘要转换为字典
+
+        Returns:
+            dict: 差异摘要的字典表示
+        """
+        return {
+            "added": self.added,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "removed": self.removed,
+            "duplicates": self.duplicates,
+            "price_deltas": [
+                {"type_name": t, "model": m, "old_price": old, "new_price": new}
+                for t, m, old, new in self.price_deltas
+            ]
+        }
@@ -0,0 +1,285 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+目录索引模块
+为球体和法兰目录维护哈希索引，避免查找和更新时遍历整个列表
+"""
+
+from bisect import bisect_left
+
+
+class CatalogIndex:
+    """目录索引类，维护 (类型, 型号) -> 数据项 的索引以及按类型分组的型号索引"""
+
+    def __init__(self, items=None):
+        """
+        初始化目录索引
+
+        Args:
+            items (list, optional): 初始数据项列表
+        """
+        self._by_key = {}  # (type_name, model) -> 数据项
+        self._by_type = {}  # type_name -> {model: 数据项}
+        self._model_counts = {}  # model -> 使用该型号的类型数量
+
+        # 下拉列表缓存（元组，直接返回给调用方），增删时换成修补后的新元组，重建时整体失效
+        self._sorted_types = None
+        self._sorted_models = {}  # type_name -> 排序后的型号元组
+        self._sorted_all_models = None
+
+        # 缓存命中统计
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        if items:
+            self.rebuild(items)
+
+    def __len__(self):
+        return len(self._by_key)
+
+    def __contains__(self, key):
+        return key in self._by_key
+
+    def rebuild(self, items):
+        """
+        根据数据项列表重建索引
+
+        列表中存在重复的 (类型, 型号) 时，保留第一次出现的数据项，
+        与原先线性查找返回第一个匹配项的行为一致。
+
+        Args:
+            items (list): 数据项列表
+        """
+        self._by_key = {}
+        self._by_type = {}
+        self._model_counts = {}
+        self.invalidate_caches()
+        for item in items:
+            self.add(item)
+
+    def get(self, type_name, model):
+        """
+        查找指定类型和型号的数据项
+
+        Args:
+            type_name (str): 类型名称
+            model (str): 型号规格
+
+        Returns:
+            object: 找到的数据项，未找到则返回None
+        """
+        return self._by_key.get((type_name, model))
+
+    def add(self, item):
+        """
+        将数据项加入索引，已存在相同键时保留原有数据项
+
+        Args:
+            item: 具有 type_name 和 model 属性的数据项
+
+        Returns:
+            bool: 是否新增了索引键
+        """
+        key = (item.type_name, item.model)
+        if key in self._by_key:
+            return False
+        self._by_key[key] = item
+
+        models = self._by_type.get(item.type_name)
+        if models is None:
+            models = self._by_type[item.type_name] = {}
+            self._sorted_types = _insert_sorted(self._sorted_types, item.type_name)
+        models[item.model] = item
+
+        cached_models = self._sorted_models.get(item.type_name)
+        if cached_models is not None:
+            self._sorted_models[item.type_name] = _insert_sorted(cached_models, item.model)
+
+        count = self._model_counts.get(item.model, 0)
+        self._model_counts[item.model] = count + 1
+        if count == 0:
+            self._sorted_all_models = _insert_sorted(self._sorted_all_models, item.model)
+        return True
+
+    def discard(self, item, items=None):
+        """
+        从索引中移除数据项
+
+        如果列表中还有相同类型和型号的重复项，索引会改为指向其中第一个。
+
+        Args:
+            item: 要移除的数据项
+            items (list, optional): 移除后的完整数据项列表，用于查找重复项
+
+        Returns:
+            bool: 索引键是否被移除
+        """
+        key = (item.type_name, item.model)
+        if self._by_key.get(key) is not item:
+            return False
+
+        replacement = None
+        if items:
+            for candidate in items:
+                if candidate.type_name == item.type_name and candidate.model == item.model:
+                    replacement = candidate
+                    break
+
+        if replacement is not None:
+            self._by_key[key] = replacement
+            self._by_type[item.type_name][item.model] = replacement
+            return False
+
+        del self._by_key[key]
+        models = self._by_type[item.type_name]
+        del models[item.model]
+        if models:
+            cached_models = self._sorted_models.get(item.type_name)
+            if cached_models is not None:
+                self._sorted_models[item.type_name] = _remove_sorted(cached_models, item.model)
+        else:
+            del self._by_type[item.type_name]
+            self._sorted_models.pop(item.type_name, None)
+            self._sorted_types = _remove_sorted(self._sorted_types, item.type_name)
+
+        count = self._model_counts[item.model] - 1
+        if count:
+            self._model_counts[item.model] = count
+        else:
+            del self._model_counts[item.model]
+            self._sorted_all_models = _remove_sorted(self._sorted_all_models, item.model)
+        return True
+
+    def keys(self):
+        """
+        获取索引中的所有 (类型, 型号) 键
+
+        Returns:
+            KeysView: 键视图
+        """
+        return self._by_key.keys()
+
+    def types(self):
+        """
+        获取索引中的所有类型
+
+        Returns:
+            list: 类型名称列表（未排序）
+        """
+        return list(self._by_type)
+
+    def sorted_types(self):
+        """
+        获取排序后的类型列表（带缓存）
+
+        返回的是缓存本身，不复制；元组不可修改，目录增删后再次调用会得到新的元组。
+
+        Returns:
+            tuple: 排序后的类型名称（只读）
+        """
+        if self._sorted_types is None:
+            self.cache_misses += 1
+            self._sorted_types = tuple(sorted(self._by_type))
+        else:
+            self.cache_hits += 1
+        return self._sorted_types
+
+    def sorted_models(self, type_name=None):
+        """
+        获取排序后的型号列表（带缓存）
+
+        与 sorted_types() 相同，返回的是缓存本身（只读元组）。
+
+        Args:
+            type_name (str, optional): 类型名称。如果为None，返回所有型号
+
+        Returns:
+            tuple: 排序后的型号（只读）
+        """
+        if type_name is None:
+            if self._sorted_all_models is None:
+                self.cache_misses += 1
+                self._sorted_all_models = tuple(sorted(self._model_counts))
+            else:
+                self.cache_hits += 1
+            return self._sorted_all_models
+
+        cached = self._sorted_models.get(type_name)
+        if cached is None:
+            self.cache_misses += 1
+            models = self._by_type.get(type_name)
+            if models is None:
+                return ()
+            cached = self._sorted_models[type_name] = tuple(sorted(models))
+        else:
+            self.cache_hits += 1
+        return cached
+
+    def get_cache_stats(self):
+        """
+        获取下拉列表缓存的命中统计
+
+        Returns:
+            dict: 包含 hits、misses 和 hit_rate 的字典
+        """
+        total = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": self.cache_hits / total if total else 0.0
+        }
+
+    def models_of(self, type_name):
+        """
+        获取指定类型下的型号索引
+
+        Args:
+            type_name (str): 类型名称
+
+        Returns:
+            dict: 型号 -> 数据项，类型不存在时返回空字典
+        """
+        return self._by_type.get(type_name, {})
+
+    def invalidate_caches(self):
+        """清空所有排序列表缓存；批量增删前调用，避免逐条修补缓存"""
+        self._sorted_types = None
+        self._sorted_models = {}
+        self._sorted_all_models = None
+
+
+def _insert_sorted(cached, value):
+    """
+    向已排序的缓存元组中插入一个值
+
+    Args:
+        cached (tuple): 缓存元组，未建立时为None
+        value: 要插入的值
+
+    Returns:
+        tuple: 插入后的新元组，缓存未建立时返回None
+    """
+    if cached is None:
+        return None
+    i = bisect_left(cached, value)
+    return cached[:i] + (value,) + cached[i:]
+
+
+def _remove_sorted(cached, value):
+    """
+    从已排序的缓存元组中移除一个值
+
+    Args:
+        cached (tuple): 缓存元组，未建立时为None
+        value: 要移除的值
+
+    Returns:
+        tuple: 移除后的新元组，缓存未建立时返回None
+    """
+    if cached is None:
+        return None
+    i = bisect_left(cached, value)
+    if i < len(cached) and cached[i] == value:
+        return cached[:i] + cached[i + 1:]
+    return cached
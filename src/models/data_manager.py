@@ -7,10 +7,36 @@
 """
 
 import os
+import sys
 import json
-import csv
-import pandas as pd
-from src.models.data_models import SphereItem, FlangeItem, QuotationItem
+import time
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from src.models.data_models import (
+    SphereItem, FlangeItem, QuotationItem, QuotationDocument, ComponentPool, QUOTATION_STATUS_DRAFT
+)
+from src.models.catalog_index import CatalogIndex
+from src.models.money import to_cents, cents_to_yuan, format_cents
+from src.models.catalog_import import (
+    read_catalog_excel, iter_catalog_csv, parse_catalog_file, ImportErrors, ImportDiff,
+    CSV_CHUNK_SIZE, IMPORT_MODE_REPLACE, IMPORT_MODE_MERGE
+)
+from src.models.assembly_index import AssemblyIndex
+from src.models.snapshot_cache import SnapshotCache, SNAPSHOT_FILENAME, pack_section, load_section
+from src.models.pricing_rules import PricingRules, DEFAULT_PROFIT_PERCENTAGE
+from src.models.quotation_index import QuotationComponentIndex, QUOTATION_PART_KINDS, KIND_SPHERE, KIND_FLANGE
+from src.models.quotation_archive import QuotationArchive, ARCHIVE_FILENAME, DEFAULT_PAGE_SIZE
+from src.models.quotation_journal import QuotationJournal, OP_ADD, OP_REMOVE, OP_CLEAR
+from src.models.sqlite_storage import (
+    SqliteStorage, migrate_json_to_sqlite, STORAGE_JSON, STORAGE_SQLITE, DATABASE_FILENAME
+)
+from src.utils.file_utils import atomic_write_json
+
+# 报价存储方式（settings.json 中的 quotation_storage）
+QUOTATION_STORAGE_JSON = "json"  # 每次整体重写 quotations.json
+QUOTATION_STORAGE_JOURNAL = "journal"  # quotations.json 快照 + 追加日志
 
 class DataManager:
     """数据管理器类，处理数据的加载、保存和操作"""
@@ -23,7 +49,7 @@ class DataManager:
             data_dir (str): 数据目录路径
         """
         # 获取基础路径
-        if getattr(import sys; sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
+        if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
             base_path = sys._MEIPASS
         else:
             base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -38,11 +64,32 @@ class DataManager:
         self.flanges_file = os.path.join(self.data_dir, "flanges.json")
         self.quotations_file = os.path.join(self.data_dir, "quotations.json")
         self.settings_file = os.path.join(self.data_dir, "settings.json")
+        self.quotations_journal_file = os.path.join(self.data_dir, "quotations.journal")
+        self.database_file = os.path.join(self.data_dir, DATABASE_FILENAME)
+        self.snapshot_file = os.path.join(self.data_dir, SNAPSHOT_FILENAME)
+        self.archive_file = os.path.join(self.data_dir, ARCHIVE_FILENAME)
         
         # 初始化数据容器
         self.spheres = []  # 球体列表
         self.flanges = []  # 法兰列表
-        self.quotations = []  # 报价项目列表
+        self._quotations = []  # 报价项目列表，通过 quotations 属性访问
+        self._quotations_loaded = False  # 报价数据是否已加载
+        self._quotations_lock = threading.RLock()  # 保护报价数据的加载和替换
+        self._quotations_loader = None  # 后台加载报价数据的线程
+        self._snapshot_quotations = None  # 快照中尚未反序列化的报价数据段
+        self._snapshot_has_quotations = False  # 当前快照文件是否包含报价数据段
+        self._component_pool = ComponentPool()  # 报价行之间共享的配件对象
+        self._sphere_index = CatalogIndex()  # 球体 (类型, 型号) 索引
+        self._flange_index = CatalogIndex()  # 法兰 (类型, 型号) 索引
+        self._quotation_index = None  # 配件 -> 报价行 反向索引，首次使用时建立
+        self._assembly_index = None  # 球体与法兰的配套索引，首次使用时建立
+        self._quotation_journal = None  # 报价日志存储，按设置延迟创建
+        self._sqlite = None  # SQLite存储，设置中选择 sqlite 时打开
+        self._sqlite_rewrite = set()  # SQLite存储中下次保存时需整表重写的集合（批量修改过）
+        self._archive = None  # 报价单存档，首次使用时打开
+        self.current_document = None  # 当前报价对应的存档报价单，新报价为None
+        self.last_import_errors = []  # 最近一次导入的行级错误 (行号, 错误说明)
+        self.last_import_diff = None  # 最近一次导入的差异摘要 ImportDiff
         self.settings = {
             "company_name": "橡胶接头有限公司",
             "contact_info": "电话: 010-12345678",
@@ -50,22 +97,308 @@ class DataManager:
             "show_cost_price": False
         }
         
+        # 延迟保存状态：开启后修改只标记脏集合，由定时器、flush() 或程序退出时统一写盘
+        self._deferred_save = False
+        self._batch_depth = 0
+        self._flush_interval = None
+        self._flush_timer = None
+        self._dirty = set()
+        self._save_lock = threading.RLock()  # 所有修改操作和写盘都持有该锁，定时器线程写盘时不会看到改到一半的数据
+        self._atexit_registered = False
+        self._snapshot_atexit_registered = False
+        
         # 加载数据
         self.load_all()
+        
+        if self.settings.get("deferred_save"):
+            self.set_deferred_save(True, self.settings.get("flush_interval"))
     
     def load_all(self):
-        """加载所有数据"""
-        self.load_spheres()
-        self.load_flanges()
-        self.load_quotations()
+        """加载所有数据（报价数据在首次访问 quotations 时加载）"""
+        # 先加载设置，存储方式由设置决定
         self.load_settings()
+        if self._open_storage():
+            # 数据库中的设置优先于 settings.json
+            self.load_settings()
+        with self._quotations_lock:
+            # 报价历史可能很大，目录编辑等界面用不到，推迟到首次访问时加载
+            self._quotations_loaded = False
+        if not self._load_snapshot():
+            self.load_spheres()
+            self.load_flanges()
+        if self.settings.get("background_load"):
+            self.preload_quotations()
     
     def save_all(self):
         """保存所有数据"""
-        self.save_spheres()
-        self.save_flanges()
-        self.save_quotations()
-        self.save_settings()
+        with self._save_lock:
+            if self._sqlite is not None:
+                # 显式整体保存时重写全部表，不依赖逐行修改
+                self._sqlite_rewrite.update(("spheres", "flanges", "quotations"))
+            self.save_spheres()
+            self.save_flanges()
+            self.save_quotations()
+            self.save_settings()
+
+    def get_catalog_cache_stats(self):
+        """
+        获取类型/型号下拉列表缓存的命中统计
+
+        Returns:
+            dict: {"spheres": {...}, "flanges": {...}}，每项包含 hits、misses 和 hit_rate
+        """
+        return {
+            "spheres": self._sphere_index.get_cache_stats(),
+            "flanges": self._flange_index.get_cache_stats()
+        }
+
+    def migrate_to_sqlite(self):
+        """
+        将当前JSON数据一次性迁移到SQLite，之后改用SQLite存储
+
+        Returns:
+            tuple: (success, message)
+        """
+        if self._sqlite is not None:
+            return False, "已在使用SQLite存储"
+        self.flush()
+        success, message = migrate_json_to_sqlite(self.data_dir, self.database_file)
+        if success:
+            self.settings["storage_backend"] = STORAGE_SQLITE
+            self._open_storage()
+        return success, message
+
+    def _open_storage(self):
+        """
+        按设置打开SQLite存储
+        
+        Returns:
+            bool: 是否新打开了SQLite存储
+        """
+        if self._sqlite is not None:
+            return False
+        if self.settings.get("storage_backend", STORAGE_JSON) != STORAGE_SQLITE:
+            return False
+        self._sqlite = SqliteStorage(self.database_file)
+        return True
+
+    # =========== 延迟保存 ===========
+
+    def set_deferred_save(self, enabled=True, flush_interval=None):
+        """
+        开启或关闭延迟保存模式
+
+        开启后 add_*、remove_*、clear_quotations、update_setting 等修改操作
+        只把对应集合标记为待保存，多次修改合并为一次写盘。
+
+        Args:
+            enabled (bool): 是否开启延迟保存
+            flush_interval (float, optional): 自动写盘间隔（秒），为None时只在
+                调用 flush() 或程序退出时写盘
+
+        Returns:
+            bool: 关闭时写盘是否成功，开启时总是返回True
+        """
+        with self._save_lock:
+            self._deferred_save = enabled
+            self._flush_interval = flush_interval if enabled else None
+            if enabled:
+                self._register_atexit()
+                return True
+            self._cancel_flush_timer()
+        return self.flush()
+
+    @contextmanager
+    def batch_update(self):
+        """
+        批量修改上下文，块内的所有修改在退出时合并写盘一次
+
+        示例:
+            with data_manager.batch_update():
+                for quotation in quotations:
+                    data_manager.add_quotation(quotation)
+        """
+        with self._save_lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._save_lock:
+                self._batch_depth -= 1
+                outermost = self._batch_depth == 0
+            if outermost and not self._deferred_save:
+                self.flush()
+
+    def flush(self):
+        """
+        将所有待保存的集合写入文件
+
+        Returns:
+            bool: 写盘是否全部成功
+        """
+        with self._save_lock:
+            self._cancel_flush_timer()
+            dirty = self._dirty
+            self._dirty = set()
+            success = True
+            for name in ("spheres", "flanges", "quotations", "settings"):
+                if name in dirty and not getattr(self, f"save_{name}")():
+                    # 写盘失败的集合保留脏标记，等待下次重试
+                    self._dirty.add(name)
+                    success = False
+            return success
+
+    def has_unsaved_changes(self):
+        """
+        检查是否存在尚未写盘的修改
+
+        Returns:
+            bool: 是否有待保存的集合
+        """
+        return bool(self._dirty)
+
+    def _mark_dirty(self, name):
+        """
+        标记集合已修改；未开启延迟保存时立即写盘
+
+        Args:
+            name (str): 集合名称，spheres/flanges/quotations/settings 之一
+
+        Returns:
+            bool: 立即写盘时返回写盘结果，延迟时返回True
+        """
+        with self._save_lock:
+            if not self._deferred_save and self._batch_depth == 0:
+                return getattr(self, f"save_{name}")()
+            self._dirty.add(name)
+            if self._deferred_save and self._flush_interval and self._flush_timer is None:
+                self._flush_timer = threading.Timer(self._flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+            return True
+
+    def _cancel_flush_timer(self):
+        """取消尚未触发的自动写盘定时器"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def _register_atexit(self):
+        """注册程序退出时的写盘回调（只注册一次）"""
+        if not self._atexit_registered:
+            atexit.register(self.flush)
+            self._atexit_registered = True
+
+    def _write_json(self, filepath, data):
+        """
+        以原子方式写入JSON数据文件，按设置保留轮换备份
+
+        Args:
+            filepath (str): 目标文件路径
+            data: 可JSON序列化的数据
+        """
+        atomic_write_json(filepath, data, backup_count=int(self.settings.get("backup_count", 0)))
+
+    # =========== 快照缓存 ===========
+    
+    def save_snapshot(self):
+        """
+        将当前数据写入二进制快照，供下次启动时快速加载（需在设置中开启 snapshot_cache）
+        
+        只有内存中的数据都已写盘时才写入，快照仍然有效时不重复写入。
+        
+        Returns:
+            bool: 快照是否为最新
+        """
+        cache = self._get_snapshot_cache()
+        if cache is None or self._dirty:
+            return False
+        try:
+            # 报价只在本次运行中已加载时写入快照，不为写快照而加载报价历史
+            include_quotations = self._get_quotation_journal() is None and self._quotations_loaded
+            if cache.is_fresh() and (self._snapshot_has_quotations or not include_quotations):
+                return True
+            state = {
+                "spheres": self.spheres,
+                "flanges": self.flanges,
+                "sphere_index": self._sphere_index,
+                "flange_index": self._flange_index
+            }
+            if include_quotations:
+                state["quotations"] = pack_section((self._quotations, self._component_pool))
+            cache.save(state)
+            self._snapshot_has_quotations = include_quotations
+            return True
+        except Exception as e:
+            print(f"保存快照失败: {e}")
+            return False
+    
+    def _get_snapshot_cache(self):
+        """
+        获取快照缓存
+        
+        Returns:
+            SnapshotCache: 设置中开启快照且使用JSON存储时返回快照缓存，否则返回None
+        """
+        if self._sqlite is not None or not self.settings.get("snapshot_cache"):
+            return None
+        sources = [self.spheres_file, self.flanges_file]
+        if self._get_quotation_journal() is None:
+            sources.append(self.quotations_file)
+        return SnapshotCache(self.snapshot_file, sources)
+    
+    def _load_snapshot(self):
+        """
+        从快照恢复目录数据，报价数据段留到首次访问 quotations 时再反序列化
+        
+        日志存储方式下快照只包含目录，报价仍在首次访问时从快照文件和日志读取。
+        
+        Returns:
+            bool: 是否从快照加载成功；失败时应按原方式读取JSON文件
+        """
+        self._snapshot_quotations = None
+        self._snapshot_has_quotations = False
+        cache = self._get_snapshot_cache()
+        if cache is None:
+            return False
+        if not self._snapshot_atexit_registered:
+            # 退出时若源文件已变化则重写快照
+            atexit.register(self.save_snapshot)
+            self._snapshot_atexit_registered = True
+        
+        state = cache.load()
+        if state is None:
+            return False
+        self.spheres = state["spheres"]
+        self.flanges = state["flanges"]
+        self._sphere_index = state["sphere_index"]
+        self._flange_index = state["flange_index"]
+        self._assembly_index = None
+        if "quotations" in state:
+            self._snapshot_quotations = state["quotations"]
+            self._snapshot_has_quotations = True
+        return True
+    
+    def _load_snapshot_quotations(self):
+        """
+        从快照的报价数据段恢复报价数据（只在首次访问 quotations 时调用一次）
+        
+        Returns:
+            bool: 是否恢复成功；失败时应按原方式读取报价文件
+        """
+        section = self._snapshot_quotations
+        if section is None:
+            return False
+        self._snapshot_quotations = None
+        try:
+            quotations, component_pool = load_section(section)
+        except Exception as e:
+            print(f"读取快照中的报价数据失败: {e}")
+            return False
+        self._component_pool = component_pool
+        self._quotation_index = None
+        self.quotations = quotations
+        return True
     
     # =========== 球体数据处理 ===========
     
@@ -77,10 +410,19 @@ class DataManager:
             bool: 加载是否成功
         """
         try:
+            # 配套索引在下次使用时按新加载的目录重建
+            self._assembly_index = None
+            if self._sqlite is not None:
+                self._sqlite_rewrite.discard("spheres")
+                self.spheres = _build_items(self._sqlite.load_catalog("spheres"), SphereItem.from_dict, "球体")
+                self._sphere_index.rebuild(self.spheres)
+                return True
+            
             if os.path.exists(self.spheres_file):
                 with open(self.spheres_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                self.spheres = [SphereItem.from_dict(item) for item in data]
+                self.spheres = _build_items(data, SphereItem.from_dict, "球体")
+                self._sphere_index.rebuild(self.spheres)
                 return True
             return False
         except Exception as e:
@@ -95,8 +437,12 @@ class DataManager:
             bool: 保存是否成功
         """
         try:
-            with open(self.spheres_file, 'w', encoding='utf-8') as f:
-                json.dump([sphere.to_dict() for sphere in self.spheres], f, ensure_ascii=False, indent=2)
+            if self._sqlite is not None:
+                self._commit_sqlite("spheres", lambda: self._sqlite.save_catalog(
+                    "spheres", [sphere.to_dict() for sphere in self.spheres]
+                ))
+            else:
+                self._write_json(self.spheres_file, [sphere.to_dict() for sphere in self.spheres])
             return True
         except Exception as e:
             print(f"保存球体数据失败: {e}")
@@ -113,18 +459,24 @@ class DataManager:
             bool: 添加是否成功
         """
         try:
-            # 检查是否已存在相同类型和型号的球体
-            for i, existing in enumerate(self.spheres):
-                if existing.type_name == sphere.type_name and existing.model == sphere.model:
+            with self._save_lock:
+                # 检查是否已存在相同类型和型号的球体
+                existing = self._sphere_index.get(sphere.type_name, sphere.model)
+                if existing is not None:
                     # 更新成本价
-                    self.spheres[i].cost_price = sphere.cost_price
-                    self.save_spheres()
+                    existing.cost_cents = sphere.cost_cents
+                    self._sqlite_row_op("upsert_catalog_items", "spheres", [existing.to_dict()])
+                    self._mark_dirty("spheres")
                     return True
-            
-            # 不存在则添加新的
-            self.spheres.append(sphere)
-            self.save_spheres()
-            return True
+                
+                # 不存在则添加新的
+                self.spheres.append(sphere)
+                self._sphere_index.add(sphere)
+                self._sqlite_row_op("upsert_catalog_items", "spheres", [sphere.to_dict()])
+                if self._assembly_index is not None:
+                    self._assembly_index.add(KIND_SPHERE, sphere)
+                self._mark_dirty("spheres")
+                return True
         except Exception as e:
             print(f"添加球体数据失败: {e}")
             return False
@@ -140,11 +492,18 @@ class DataManager:
             bool: 移除是否成功
         """
         try:
-            if 0 <= index < len(self.spheres):
-                del self.spheres[index]
-                self.save_spheres()
-                return True
-            return False
+            with self._save_lock:
+                if 0 <= index < len(self.spheres):
+                    occurrence = _key_occurrence(self.spheres, index, self._sphere_index)
+                    removed = self.spheres.pop(index)
+                    self._sqlite_row_op("delete_catalog_item", "spheres", removed.type_name, removed.model, occurrence)
+                    self._sphere_index.discard(removed, self.spheres)
+                    if self._assembly_index is not None:
+                        self._assembly_index.discard(KIND_SPHERE, removed,
+                                                     self._sphere_index.get(removed.type_name, removed.model))
+                    self._mark_dirty("spheres")
+                    return True
+                return False
         except Exception as e:
             print(f"移除球体数据失败: {e}")
             return False
@@ -154,12 +513,9 @@ class DataManager:
         获取所有球体类型列表
         
         Returns:
-            list: 不重复的球体类型列表
+            tuple: 排序后不重复的球体类型（只读，不要修改）
         """
-        types = set()
-        for sphere in self.spheres:
-            types.add(sphere.type_name)
-        return sorted(list(types))
+        return self._sphere_index.sorted_types()
     
     def get_sphere_models(self, type_name=None):
         """
@@ -169,13 +525,9 @@ class DataManager:
             type_name (str, optional): 球体类型名称。如果为None，返回所有型号
             
         Returns:
-            list: 球体型号列表
+            tuple: 排序后的球体型号（只读，不要修改）
         """
-        models = set()
-        for sphere in self.spheres:
-            if type_name is None or sphere.type_name == type_name:
-                models.add(sphere.model)
-        return sorted(list(models))
+        return self._sphere_index.sorted_models(type_name)
     
     def find_sphere(self, type_name, model):
         """
@@ -188,80 +540,156 @@ class DataManager:
         Returns:
             SphereItem: 找到的球体对象，未找到则返回None
         """
-        for sphere in self.spheres:
-            if sphere.type_name == type_name and sphere.model == model:
-                return sphere
-        return None
+        return self._sphere_index.get(type_name, model)
     
-    def import_spheres_from_csv(self, file_path):
+    def import_spheres_from_csv(self, file_path, progress_callback=None, chunk_size=CSV_CHUNK_SIZE,
+                               mode=IMPORT_MODE_MERGE):
         """
-        从CSV文件导入球体数据
+        从CSV文件流式导入球体数据
+        
+        文件按块读取，默认逐块合并到现有数据中：相同类型和型号的更新成本价，
+        其余新增。无效行不会中断导入，行号和原因保存在 last_import_errors 中，
+        差异摘要保存在 last_import_diff 中。
         
         Args:
             file_path (str): CSV文件路径
+            progress_callback (callable, optional): 进度回调，参数为 (已处理行数, 已读取比例0~1)
+            chunk_size (int): 每块读取的行数
+            mode (str): 导入方式，IMPORT_MODE_MERGE（合并）或 IMPORT_MODE_REPLACE（整体替换）
         
         Returns:
             tuple: (success, message)
         """
-        try:
-            spheres = []
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if "type_name" in row and "model" in row and "cost_price" in row:
-                        sphere = SphereItem(
-                            type_name=row["type_name"],
-                            model=row["model"],
-                            cost_price=float(row["cost_price"])
-                        )
-                        spheres.append(sphere)
-            
-            if spheres:
-                self.spheres = spheres
-                self.save_spheres()
-                return True, f"成功导入 {len(spheres)} 条球体数据"
-            else:
-                return False, "没有有效的数据"
-                
-        except Exception as e:
-            return False, f"导入失败: {e}"
+        errors = ImportErrors()
+        chunks = iter_catalog_csv(file_path, errors, chunk_size)
+        return self._import_catalog("spheres", SphereItem, self._sphere_index, "球体", chunks, errors, mode,
+                                    progress_callback)
     
-    def import_spheres_from_excel(self, file_path):
+    def import_spheres_from_excel(self, file_path, mode=IMPORT_MODE_REPLACE):
         """
         从Excel文件导入球体数据
         
         Args:
             file_path (str): Excel文件路径
+            mode (str): 导入方式，IMPORT_MODE_REPLACE（整体替换）或 IMPORT_MODE_MERGE（合并）
         
         Returns:
             tuple: (success, message)
         """
-        try:
-            df = pd.read_excel(file_path)
-            required_columns = ["type_name", "model", "cost_price"]
-            
-            # 检查必要的列是否存在
-            if not all(col in df.columns for col in required_columns):
-                return False, "Excel文件缺少必要的列：type_name, model, cost_price"
-            
-            spheres = []
-            for _, row in df.iterrows():
-                sphere = SphereItem(
-                    type_name=row["type_name"],
-                    model=row["model"],
-                    cost_price=float(row["cost_price"])
-                )
-                spheres.append(sphere)
-            
-            if spheres:
-                self.spheres = spheres
-                self.save_spheres()
-                return True, f"成功导入 {len(spheres)} 条球体数据"
-            else:
-                return False, "没有有效的数据"
+        errors = ImportErrors()
+        
+        def chunks():
+            # 按列校验和转换，无效行整体剔除并报告
+            rows, row_errors = read_catalog_excel(file_path)
+            errors.extend(row_errors)
+            yield rows, 1.0
+        
+        return self._import_catalog("spheres", SphereItem, self._sphere_index, "球体", chunks(), errors, mode)
+    
+    def _import_catalog(self, name, item_cls, index, label, chunks, errors, mode, progress_callback=None):
+        """
+        将导入的数据块写入目录并统计差异
+        
+        合并方式直接在现有目录上更新；替换方式先构建新目录，全部成功后再替换，
+        并与原目录比较得出差异。每行只做一次哈希查找，整体为线性时间。
+        
+        Args:
+            name (str): 目录集合名称，spheres 或 flanges
+            item_cls (type): 数据项类型
+            index (CatalogIndex): 目录索引
+            label (str): 提示信息中的数据名称
+            chunks (iterable): 产出 (rows, fraction) 的数据块迭代器
+            errors (ImportErrors): 行级错误收集器
+            mode (str): 导入方式，IMPORT_MODE_MERGE 或 IMPORT_MODE_REPLACE
+            progress_callback (callable, optional): 进度回调，参数为 (已处理行数, 已读取比例0~1)
+        
+        Returns:
+            tuple: (success, message)
+        """
+        # 导入期间持有保存锁，定时器线程的 flush() 不会写出导入到一半的目录
+        with self._save_lock:
+            diff = ImportDiff()
+            self.last_import_errors = errors.items
+            self.last_import_diff = diff
+            processed = 0
+            merged = {}  # 合并方式下本块新增或更新的数据项，逐块写入SQLite
+            original = {}  # (类型, 型号) -> 导入前的成本价（分），原目录中不存在时为None
+            try:
+                if mode not in (IMPORT_MODE_MERGE, IMPORT_MODE_REPLACE):
+                    raise ValueError(f"未知的导入方式: {mode}")
                 
-        except Exception as e:
-            return False, f"导入失败: {e}"
+                if mode == IMPORT_MODE_MERGE:
+                    items = getattr(self, name)
+                    target = index
+                    # 批量新增时不逐条修补下拉列表缓存，导入后按需重建
+                    index.invalidate_caches()
+                else:
+                    items = []
+                    target = CatalogIndex()
+                
+                for rows, fraction in chunks:
+                    for type_name, model, cost_price in rows:
+                        cost_cents = to_cents(cost_price)
+                        key = (type_name, model)
+                        if key not in original:
+                            # 只在某个键第一次出现时记录原成本价，文件中重复的键按最后一行计入差异
+                            old = index.get(type_name, model)
+                            original[key] = None if old is None else old.cost_cents
+                        existing = target.get(type_name, model)
+                        if existing is not None:
+                            existing.cost_cents = cost_cents
+                        else:
+                            existing = item_cls(type_name, model, cost_price)
+                            items.append(existing)
+                            target.add(existing)
+                            if mode == IMPORT_MODE_MERGE and self._assembly_index is not None:
+                                self._assembly_index.add(KIND_SPHERE if item_cls is SphereItem else KIND_FLANGE,
+                                                         existing)
+                        if mode == IMPORT_MODE_MERGE:
+                            merged[key] = existing
+                    pending, merged = merged, {}
+                    self._write_merged_rows(name, pending)
+                    processed += len(rows)
+                    if progress_callback:
+                        progress_callback(processed, fraction)
+                
+                if not processed:
+                    return False, "没有有效的数据" + _format_skipped_rows(errors.count, errors.items)
+                
+                # 按保存精度（分）比较，只差分位以下的价格视为未变
+                for (type_name, model), old_cents in original.items():
+                    diff.record(type_name, model, None if old_cents is None else cents_to_yuan(old_cents),
+                                target.get(type_name, model).cost_price)
+                diff.duplicates = processed - len(original)
+                
+                if mode == IMPORT_MODE_REPLACE:
+                    diff.removed = sum(1 for key in index.keys() if key not in target)
+                    setattr(self, name, items)
+                    index.rebuild(items)
+                    self._assembly_index = None
+                    if self._sqlite is not None:
+                        self._sqlite_rewrite.add(name)
+                self._mark_dirty(name)
+                return True, (f"成功导入 {processed} 条{label}数据（{diff.summary()}）"
+                              + _format_skipped_rows(errors.count, errors.items))
+            
+            except Exception as e:
+                if mode == IMPORT_MODE_MERGE and (processed or merged):
+                    # 合并方式中途失败时，已合并的部分仍需保存
+                    self._write_merged_rows(name, merged)
+                    self._mark_dirty(name)
+                return False, f"导入失败: {e}"
+    
+    def _write_merged_rows(self, name, merged):
+        """
+        将合并导入中新增或更新的数据项逐条写入SQLite
+        
+        Args:
+            name (str): 目录集合名称，spheres 或 flanges
+            merged (dict): (类型, 型号) -> 数据项
+        """
+        if merged:
+            self._sqlite_row_op("upsert_catalog_items", name, [item.to_dict() for item in merged.values()])
     
     # =========== 法兰数据处理 ===========
     
@@ -273,10 +701,19 @@ class DataManager:
             bool: 加载是否成功
         """
         try:
+            # 配套索引在下次使用时按新加载的目录重建
+            self._assembly_index = None
+            if self._sqlite is not None:
+                self._sqlite_rewrite.discard("flanges")
+                self.flanges = _build_items(self._sqlite.load_catalog("flanges"), FlangeItem.from_dict, "法兰")
+                self._flange_index.rebuild(self.flanges)
+                return True
+            
             if os.path.exists(self.flanges_file):
                 with open(self.flanges_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                self.flanges = [FlangeItem.from_dict(item) for item in data]
+                self.flanges = _build_items(data, FlangeItem.from_dict, "法兰")
+                self._flange_index.rebuild(self.flanges)
                 return True
             return False
         except Exception as e:
@@ -291,8 +728,12 @@ class DataManager:
             bool: 保存是否成功
         """
         try:
-            with open(self.flanges_file, 'w', encoding='utf-8') as f:
-                json.dump([flange.to_dict() for flange in self.flanges], f, ensure_ascii=False, indent=2)
+            if self._sqlite is not None:
+                self._commit_sqlite("flanges", lambda: self._sqlite.save_catalog(
+                    "flanges", [flange.to_dict() for flange in self.flanges]
+                ))
+            else:
+                self._write_json(self.flanges_file, [flange.to_dict() for flange in self.flanges])
             return True
         except Exception as e:
             print(f"保存法兰数据失败: {e}")
@@ -309,18 +750,24 @@ class DataManager:
             bool: 添加是否成功
         """
         try:
-            # 检查是否已存在相同类型和型号的法兰
-            for i, existing in enumerate(self.flanges):
-                if existing.type_name == flange.type_name and existing.model == flange.model:
+            with self._save_lock:
+                # 检查是否已存在相同类型和型号的法兰
+                existing = self._flange_index.get(flange.type_name, flange.model)
+                if existing is not None:
                     # 更新成本价
-                    self.flanges[i].cost_price = flange.cost_price
-                    self.save_flanges()
+                    existing.cost_cents = flange.cost_cents
+                    self._sqlite_row_op("upsert_catalog_items", "flanges", [existing.to_dict()])
+                    self._mark_dirty("flanges")
                     return True
-            
-            # 不存在则添加新的
-            self.flanges.append(flange)
-            self.save_flanges()
-            return True
+                
+                # 不存在则添加新的
+                self.flanges.append(flange)
+                self._flange_index.add(flange)
+                self._sqlite_row_op("upsert_catalog_items", "flanges", [flange.to_dict()])
+                if self._assembly_index is not None:
+                    self._assembly_index.add(KIND_FLANGE, flange)
+                self._mark_dirty("flanges")
+                return True
         except Exception as e:
             print(f"添加法兰数据失败: {e}")
             return False
@@ -336,11 +783,18 @@ class DataManager:
             bool: 移除是否成功
         """
         try:
-            if 0 <= index < len(self.flanges):
-                del self.flanges[index]
-                self.save_flanges()
-                return True
-            return False
+            with self._save_lock:
+                if 0 <= index < len(self.flanges):
+                    occurrence = _key_occurrence(self.flanges, index, self._flange_index)
+                    removed = self.flanges.pop(index)
+                    self._sqlite_row_op("delete_catalog_item", "flanges", removed.type_name, removed.model, occurrence)
+                    self._flange_index.discard(removed, self.flanges)
+                    if self._assembly_index is not None:
+                        self._assembly_index.discard(KIND_FLANGE, removed,
+                                                     self._flange_index.get(removed.type_name, removed.model))
+                    self._mark_dirty("flanges")
+                    return True
+                return False
         except Exception as e:
             print(f"移除法兰数据失败: {e}")
             return False
@@ -350,12 +804,9 @@ class DataManager:
         获取所有法兰类型列表
         
         Returns:
-            list: 不重复的法兰类型列表
+            tuple: 排序后不重复的法兰类型（只读，不要修改）
         """
-        types = set()
-        for flange in self.flanges:
-            types.add(flange.type_name)
-        return sorted(list(types))
+        return self._flange_index.sorted_types()
     
     def get_flange_models(self, type_name=None):
         """
@@ -365,13 +816,9 @@ class DataManager:
             type_name (str, optional): 法兰类型名称。如果为None，返回所有型号
             
         Returns:
-            list: 法兰型号列表
+            tuple: 排序后的法兰型号（只读，不要修改）
         """
-        models = set()
-        for flange in self.flanges:
-            if type_name is None or flange.type_name == type_name:
-                models.add(flange.model)
-        return sorted(list(models))
+        return self._flange_index.sorted_models(type_name)
     
     def find_flange(self, type_name, model):
         """
@@ -384,83 +831,229 @@ class DataManager:
         Returns:
             FlangeItem: 找到的法兰对象，未找到则返回None
         """
-        for flange in self.flanges:
-            if flange.type_name == type_name and flange.model == model:
-                return flange
-        return None
+        return self._flange_index.get(type_name, model)
     
-    def import_flanges_from_csv(self, file_path):
+    def import_flanges_from_csv(self, file_path, progress_callback=None, chunk_size=CSV_CHUNK_SIZE,
+                               mode=IMPORT_MODE_MERGE):
         """
-        从CSV文件导入法兰数据
+        从CSV文件流式导入法兰数据
+        
+        文件按块读取，默认逐块合并到现有数据中：相同类型和型号的更新成本价，
+        其余新增。无效行不会中断导入，行号和原因保存在 last_import_errors 中，
+        差异摘要保存在 last_import_diff 中。
         
         Args:
             file_path (str): CSV文件路径
+            progress_callback (callable, optional): 进度回调，参数为 (已处理行数, 已读取比例0~1)
+            chunk_size (int): 每块读取的行数
+            mode (str): 导入方式，IMPORT_MODE_MERGE（合并）或 IMPORT_MODE_REPLACE（整体替换）
         
         Returns:
             tuple: (success, message)
         """
-        try:
-            flanges = []
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if "type_name" in row and "model" in row and "cost_price" in row:
-                        flange = FlangeItem(
-                            type_name=row["type_name"],
-                            model=row["model"],
-                            cost_price=float(row["cost_price"])
-                        )
-                        flanges.append(flange)
-            
-            if flanges:
-                self.flanges = flanges
-                self.save_flanges()
-                return True, f"成功导入 {len(flanges)} 条法兰数据"
-            else:
-                return False, "没有有效的数据"
-                
-        except Exception as e:
-            return False, f"导入失败: {e}"
+        errors = ImportErrors()
+        chunks = iter_catalog_csv(file_path, errors, chunk_size)
+        return self._import_catalog("flanges", FlangeItem, self._flange_index, "法兰", chunks, errors, mode,
+                                    progress_callback)
     
-    def import_flanges_from_excel(self, file_path):
+    def import_flanges_from_excel(self, file_path, mode=IMPORT_MODE_REPLACE):
         """
         从Excel文件导入法兰数据
         
         Args:
             file_path (str): Excel文件路径
+            mode (str): 导入方式，IMPORT_MODE_REPLACE（整体替换）或 IMPORT_MODE_MERGE（合并）
         
         Returns:
             tuple: (success, message)
         """
+        errors = ImportErrors()
+        
+        def chunks():
+            # 按列校验和转换，无效行整体剔除并报告
+            rows, row_errors = read_catalog_excel(file_path)
+            errors.extend(row_errors)
+            yield rows, 1.0
+        
+        return self._import_catalog("flanges", FlangeItem, self._flange_index, "法兰", chunks(), errors, mode)
+    
+    # =========== 批量导入 ===========
+    
+    def import_catalog_files(self, files, mode=IMPORT_MODE_MERGE, max_workers=None):
+        """
+        在进程池中并行解析多个供应商价格表，再按给定顺序合并到球体和法兰目录
+        
+        解析（尤其是读取Excel）在工作进程中进行；合并在当前进程中按 files 的顺序
+        依次执行，同一 (类型, 型号) 出现在多个文件中时以靠后的文件为准，结果与并行度无关。
+        替换方式下某类数据只要有文件解析失败，该类目录就保持不变。
+        
+        Args:
+            files (list): (kind, file_path) 列表，kind 为 "spheres" 或 "flanges"，
+                文件格式按扩展名识别（.csv/.xlsx/.xls）
+            mode (str): 导入方式，IMPORT_MODE_MERGE（合并）或 IMPORT_MODE_REPLACE（整体替换）
+            max_workers (int, optional): 工作进程数，默认为CPU核数；只有1个进程时在当前进程中解析
+        
+        Returns:
+            tuple: (success, message, file_results)，file_results 与 files 顺序相同，
+                每项为包含 kind、file_path、rows、error_count、seconds、error 的字典
+        """
+        start = time.perf_counter()
+        catalogs = (
+            ("spheres", SphereItem, self._sphere_index, "球体"),
+            ("flanges", FlangeItem, self._flange_index, "法兰"),
+        )
+        kinds = [kind for kind, _ in files]
+        unknown = [kind for kind in kinds if kind not in ("spheres", "flanges")]
+        if unknown:
+            return False, f"未知的数据类型: {unknown[0]}", []
+        
+        paths = [file_path for _, file_path in files]
+        workers = min(max_workers or os.cpu_count() or 1, len(paths))
         try:
-            df = pd.read_excel(file_path)
-            required_columns = ["type_name", "model", "cost_price"]
-            
-            # 检查必要的列是否存在
-            if not all(col in df.columns for col in required_columns):
-                return False, "Excel文件缺少必要的列：type_name, model, cost_price"
-            
-            flanges = []
-            for _, row in df.iterrows():
-                flange = FlangeItem(
-                    type_name=row["type_name"],
-                    model=row["model"],
-                    cost_price=float(row["cost_price"])
-                )
-                flanges.append(flange)
-            
-            if flanges:
-                self.flanges = flanges
-                self.save_flanges()
-                return True, f"成功导入 {len(flanges)} 条法兰数据"
+            if workers <= 1:
+                # 单核或单个文件时启动进程池得不偿失，直接在当前进程解析
+                results = [parse_catalog_file(file_path) for file_path in paths]
             else:
-                return False, "没有有效的数据"
-                
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(parse_catalog_file, paths))
         except Exception as e:
-            return False, f"导入失败: {e}"
+            return False, f"导入失败: {e}", []
+        
+        file_results = [
+            {
+                "kind": kind,
+                "file_path": result["file_path"],
+                "rows": len(result["rows"]),
+                "error_count": result["error_count"],
+                "seconds": result["seconds"],
+                "error": result["error"]
+            }
+            for kind, result in zip(kinds, results)
+        ]
+        
+        success = False
+        messages = []
+        for name, item_cls, index, label in catalogs:
+            kind_results = [result for kind, result in zip(kinds, results) if kind == name]
+            if not kind_results:
+                continue
+            failed = [result for result in kind_results if result["error"]]
+            if failed and mode == IMPORT_MODE_REPLACE:
+                messages.append(f"{label}数据未替换：{os.path.basename(failed[0]['file_path'])} "
+                                f"解析失败（{failed[0]['error']}）")
+                continue
+            
+            errors = ImportErrors()
+            for result in kind_results:
+                errors.extend(result["errors"], result["error_count"],
+                              prefix=f"{os.path.basename(result['file_path'])}: ")
+            chunks = ((result["rows"], 1.0) for result in kind_results if not result["error"])
+            kind_success, message = self._import_catalog(name, item_cls, index, label, chunks, errors, mode)
+            success = success or kind_success
+            messages.append(message)
+            messages.extend(f"{os.path.basename(result['file_path'])} 解析失败: {result['error']}"
+                            for result in failed)
+        
+        messages.append(f"共 {len(files)} 个文件，用时 {time.perf_counter() - start:.2f} 秒")
+        return success, "；".join(messages), file_results
+    
+    # =========== 配套查询 ===========
+    
+    def get_nominal_sizes(self):
+        """
+        获取同时有球体和法兰的公称通径列表
+        
+        Returns:
+            list: 排序后的通径列表
+        """
+        return self._get_assembly_index().nominal_sizes()
+    
+    def get_compatible_flanges(self, sphere):
+        """
+        获取与球体通径相同的法兰
+        
+        Args:
+            sphere (SphereItem): 球体对象
+        
+        Returns:
+            list: 法兰列表
+        """
+        return self._get_assembly_index().flanges_for(sphere)
+    
+    def get_assemblies(self, sphere_type=None, nominal_size=None, mixed_flanges=False):
+        """
+        列出通径匹配的配套（球体 + 两个法兰）及其单件成本价
+        
+        Args:
+            sphere_type (str, optional): 球体类型，为None时不限
+            nominal_size (int, optional): 公称通径，为None时不限
+            mixed_flanges (bool): 是否允许两端使用不同的法兰
+        
+        Returns:
+            tuple: (球体, 法兰1, 法兰2, 单件成本价(分)) 元组（缓存结果，只读，不要修改）
+        """
+        return self._get_assembly_index().assemblies(sphere_type, nominal_size, mixed_flanges)
+    
+    def _get_assembly_index(self):
+        """
+        获取配套索引，未建立时按当前目录建立
+        
+        Returns:
+            AssemblyIndex: 配套索引
+        """
+        if self._assembly_index is None:
+            self._assembly_index = AssemblyIndex(self.spheres, self.flanges)
+        return self._assembly_index
     
     # =========== 报价数据处理 ===========
     
+    @property
+    def quotations(self):
+        """报价项目列表，首次访问时加载；后台加载尚未完成时等待加载完成"""
+        if not self._quotations_loaded:
+            self._ensure_quotations_loaded()
+        return self._quotations
+    
+    @quotations.setter
+    def quotations(self, value):
+        with self._quotations_lock:
+            self._quotations = value
+            self._quotations_loaded = True
+    
+    def is_quotations_loaded(self):
+        """
+        检查报价数据是否已加载
+        
+        Returns:
+            bool: 报价数据是否已在内存中
+        """
+        return self._quotations_loaded
+    
+    def preload_quotations(self):
+        """
+        在后台线程中加载报价数据，启动界面时无需等待报价历史读取完成
+        
+        Returns:
+            threading.Thread: 加载线程；报价数据已加载时返回None
+        """
+        with self._quotations_lock:
+            if self._quotations_loaded:
+                return None
+            if self._quotations_loader is None or not self._quotations_loader.is_alive():
+                self._quotations_loader = threading.Thread(
+                    target=self._ensure_quotations_loaded, name="QuotationLoader", daemon=True
+                )
+                self._quotations_loader.start()
+            return self._quotations_loader
+    
+    def _ensure_quotations_loaded(self):
+        """报价数据尚未加载时加载（加载失败时视为空列表）"""
+        with self._quotations_lock:
+            if self._quotations_loaded:
+                return
+            if not self._load_snapshot_quotations() and not self.load_quotations():
+                self.quotations = []
+    
     def load_quotations(self):
         """
         从JSON文件加载报价数据
@@ -469,16 +1062,39 @@ class DataManager:
             bool: 加载是否成功
         """
         try:
+            # 反向索引在下次使用时按新加载的报价重建
+            self._quotation_index = None
+            self._snapshot_quotations = None
+            if self._sqlite is not None:
+                self._sqlite_rewrite.discard("quotations")
+                self._component_pool.clear()
+                self.quotations = _build_items(self._sqlite.load_quotations(), self._quotation_from_dict, "报价")
+                return True
+            
+            journal = self._get_quotation_journal()
+            if journal is not None:
+                data = journal.load()
+                self._component_pool.clear()
+                self.quotations = _build_items(data, self._quotation_from_dict, "报价")
+                if journal.needs_compaction():
+                    journal.compact(data)
+                return True
+            
             if os.path.exists(self.quotations_file):
                 with open(self.quotations_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                self.quotations = [QuotationItem.from_dict(item) for item in data]
+                self._component_pool.clear()
+                self.quotations = _build_items(data, self._quotation_from_dict, "报价")
                 return True
             return False
         except Exception as e:
             print(f"加载报价数据失败: {e}")
             return False
     
+    def _quotation_from_dict(self, data):
+        """从字典创建报价行，配件取自共享池"""
+        return QuotationItem.from_dict(data, self._component_pool)
+    
     def save_quotations(self):
         """
         保存报价数据到JSON文件
@@ -487,8 +1103,19 @@ class DataManager:
             bool: 保存是否成功
         """
         try:
-            with open(self.quotations_file, 'w', encoding='utf-8') as f:
-                json.dump([quotation.to_dict() for quotation in self.quotations], f, ensure_ascii=False, indent=2)
+            if self._sqlite is not None:
+                self._commit_sqlite("quotations", lambda: self._sqlite.save_quotations(
+                    [quotation.to_dict() for quotation in self.quotations]
+                ))
+                return True
+            
+            journal = self._get_quotation_journal()
+            if journal is None:
+                self._write_json(self.quotations_file, [quotation.to_dict() for quotation in self.quotations])
+            elif journal.needs_compaction():
+                journal.compact([quotation.to_dict() for quotation in self.quotations])
+            else:
+                journal.flush()
             return True
         except Exception as e:
             print(f"保存报价数据失败: {e}")
@@ -505,9 +1132,19 @@ class DataManager:
             bool: 添加是否成功
         """
         try:
-            self.quotations.append(quotation)
-            self.save_quotations()
-            return True
+            # 修改列表和记录日志在同一把锁内完成，定时器线程的 flush() 不会在两者之间写盘
+            with self._save_lock:
+                # 配件换成共享池中的等值对象，避免与目录对象或其他报价行重复
+                quotation.sphere = self._component_pool.intern_item(quotation.sphere)
+                quotation.flange1 = self._component_pool.intern_item(quotation.flange1)
+                quotation.flange2 = self._component_pool.intern_item(quotation.flange2)
+                self.quotations.append(quotation)
+                if self._quotation_index is not None:
+                    self._quotation_index.add(quotation)
+                self._journal_quotation_op({"op": OP_ADD, "item": quotation.to_dict()})
+                self._sqlite_row_op("insert_quotation", quotation.to_dict())
+                self._mark_dirty("quotations")
+                return True
         except Exception as e:
             print(f"添加报价数据失败: {e}")
             return False
@@ -523,11 +1160,16 @@ class DataManager:
             bool: 移除是否成功
         """
         try:
-            if 0 <= index < len(self.quotations):
-                del self.quotations[index]
-                self.save_quotations()
-                return True
-            return False
+            with self._save_lock:
+                if 0 <= index < len(self.quotations):
+                    removed = self.quotations.pop(index)
+                    if self._quotation_index is not None:
+                        self._quotation_index.discard(removed)
+                    self._journal_quotation_op({"op": OP_REMOVE, "index": index})
+                    self._sqlite_row_op("delete_quotation", index)
+                    self._mark_dirty("quotations")
+                    return True
+                return False
         except Exception as e:
             print(f"移除报价数据失败: {e}")
             return False
@@ -540,13 +1182,433 @@ class DataManager:
             bool: 清空是否成功
         """
         try:
-            self.quotations = []
-            self.save_quotations()
-            return True
+            with self._save_lock:
+                self.quotations = []
+                self._component_pool = ComponentPool()
+                self.current_document = None
+                if self._quotation_index is not None:
+                    self._quotation_index.clear()
+                self._journal_quotation_op({"op": OP_CLEAR})
+                self._sqlite_row_op("clear_quotations")
+                self._mark_dirty("quotations")
+                return True
         except Exception as e:
             print(f"清空报价数据失败: {e}")
             return False
     
+    def compact_quotations(self):
+        """
+        将报价数据整体写成快照并清空日志（仅日志存储方式下有效）
+        
+        Returns:
+            bool: 压缩是否成功
+        """
+        journal = self._get_quotation_journal()
+        if journal is None:
+            return self.save_quotations()
+        try:
+            with self._save_lock:
+                journal.compact([quotation.to_dict() for quotation in self.quotations])
+            return True
+        except Exception as e:
+            print(f"压缩报价日志失败: {e}")
+            return False
+    
+    def find_quotations_using(self, kind, type_name, model):
+        """
+        查找使用指定配件的报价行
+        
+        Args:
+            kind (str): 配件种类，"sphere" 或 "flange"
+            type_name (str): 类型名称
+            model (str): 型号规格
+        
+        Returns:
+            list: 报价行列表
+        """
+        return self._get_quotation_index().lines_for(kind, type_name, model)
+    
+    def reprice_quotations(self):
+        """
+        按当前目录成本价更新报价行中的配件，只处理成本价已变化的报价行
+        
+        Returns:
+            tuple: (success, message, changes)，changes 为
+                (报价行, 原总销售价(分), 新总销售价(分)) 列表，只包含总价变化的行
+        """
+        changes = []
+        try:
+            with self._save_lock:
+                index = self._get_quotation_index()
+                catalogs = {KIND_SPHERE: self._sphere_index, KIND_FLANGE: self._flange_index}
+                
+                # 通过反向索引找出配件成本价与目录不同的报价行
+                affected = {}
+                for kind, type_name, model in index.keys():
+                    item = catalogs[kind].get(type_name, model)
+                    if item is not None:
+                        affected.update(dict.fromkeys(index.stale_lines(kind, type_name, model, item.cost_cents)))
+                
+                if not affected:
+                    return True, "报价价格均为最新，无需更新", changes
+                
+                for line in affected:
+                    old_total = line.total_price_cents
+                    index.discard(line)
+                    for attr, kind in QUOTATION_PART_KINDS:
+                        component = getattr(line, attr)
+                        item = catalogs[kind].get(component.type_name, component.model)
+                        if item is not None and item.cost_cents != component.cost_cents:
+                            setattr(line, attr, self._component_pool.intern_item(item))
+                    index.add(line)
+                    new_total = line.total_price_cents
+                    if new_total != old_total:
+                        changes.append((line, old_total, new_total))
+                
+                self._save_modified_quotations()
+                
+                delta = sum(new - old for _, old, new in changes)
+                return True, (f"已更新 {len(affected)} 条报价行的配件成本价，"
+                              f"{len(changes)} 条总价变化，合计变化 {format_cents(delta)} 元"), changes
+        except Exception as e:
+            return False, f"更新报价价格失败: {e}", changes
+    
+    def apply_pricing_rules(self, customer=None, rules=None):
+        """
+        按定价规则批量重新设置所有报价行的利润率
+        
+        Args:
+            customer (str, optional): 客户名称，用于客户折扣规则
+            rules (list, optional): 规则字典列表，默认使用设置中的 pricing_rules
+        
+        Returns:
+            tuple: (success, message)
+        """
+        try:
+            with self._save_lock:
+                if rules is None:
+                    rules = self.settings.get("pricing_rules", [])
+                pricing_rules = PricingRules(
+                    rules, self.settings.get("default_profit_percentage", DEFAULT_PROFIT_PERCENTAGE)
+                )
+                changed = pricing_rules.apply(self.quotations, customer)
+                if changed:
+                    self._save_modified_quotations()
+                return True, f"已按 {pricing_rules.rule_count} 条定价规则更新 {changed} 条报价行的利润率"
+        except Exception as e:
+            return False, f"应用定价规则失败: {e}"
+    
+    def _save_modified_quotations(self):
+        """原地修改报价行后保存报价数据"""
+        if self._get_quotation_journal() is not None:
+            # 日志只记录增删，原地修改后直接写成新的快照
+            self.compact_quotations()
+        else:
+            if self._sqlite is not None:
+                self._sqlite_rewrite.add("quotations")
+            self._mark_dirty("quotations")
+    
+    def _get_quotation_index(self):
+        """
+        获取配件 -> 报价行 反向索引，未建立时按当前报价建立
+        
+        Returns:
+            QuotationComponentIndex: 反向索引
+        """
+        if self._quotation_index is None:
+            self._quotation_index = QuotationComponentIndex(self.quotations)
+        return self._quotation_index
+    
+    def _get_quotation_journal(self):
+        """
+        获取报价日志存储
+        
+        Returns:
+            QuotationJournal: 设置选择日志方式时返回日志对象，否则返回None
+        """
+        if self._sqlite is not None:
+            return None
+        if self.settings.get("quotation_storage", QUOTATION_STORAGE_JSON) != QUOTATION_STORAGE_JOURNAL:
+            return None
+        if self._quotation_journal is None:
+            self._quotation_journal = QuotationJournal(
+                self.quotations_file,
+                self.quotations_journal_file,
+                compact_threshold=int(self.settings.get("journal_compact_threshold", 500))
+            )
+        return self._quotation_journal
+    
+    def _journal_quotation_op(self, record):
+        """日志存储方式下记录一次报价增删操作"""
+        journal = self._get_quotation_journal()
+        if journal is not None:
+            journal.append(record)
+    
+    def _sqlite_row_op(self, method, *args):
+        """
+        SQLite存储方式下把一次单条修改排入写入队列（随下次保存在一个短事务中提交，期间不锁数据库）
+        
+        Args:
+            method (str): SqliteStorage 的写入方法名
+            *args: 写入方法的参数
+        """
+        if self._sqlite is not None:
+            getattr(self._sqlite, method)(*args)
+    
+    def _commit_sqlite(self, name, rewrite):
+        """
+        提交SQLite中排队的逐行修改；批量修改过的集合先整表重写
+        
+        Args:
+            name (str): 集合名称
+            rewrite (callable): 整表重写该集合的函数
+        """
+        if name in self._sqlite_rewrite:
+            rewrite()
+            self._sqlite_rewrite.discard(name)
+        self._sqlite.commit()
+    
+    # =========== 报价单存档 ===========
+    
+    def save_quotation_document(self, name=None, customer=None, status=None, note=None, as_new=False):
+        """
+        将当前报价保存为存档中的命名报价单
+        
+        当前报价是从存档打开或已保存过的报价单时覆盖该报价单，未提供的抬头信息保持不变。
+        
+        Args:
+            name (str, optional): 报价单名称
+            customer (str, optional): 客户名称
+            status (str, optional): 状态，QUOTATION_STATUSES 之一
+            note (str, optional): 备注
+            as_new (bool): 是否另存为新的报价单
+        
+        Returns:
+            tuple: (success, message)
+        """
+        try:
+            with self._save_lock:
+                document = self.current_document
+                if document is None or as_new:
+                    document = QuotationDocument(status=QUOTATION_STATUS_DRAFT)
+                    if self.current_document is not None:
+                        # 另存为时沿用原报价单的客户和备注
+                        document.customer = self.current_document.customer
+                        document.note = self.current_document.note
+                document = QuotationDocument.from_dict(document.to_dict())
+                for attr, value in (("name", name), ("customer", customer), ("status", status), ("note", note)):
+                    if value is not None:
+                        setattr(document, attr, value)
+                if not document.name:
+                    return False, "报价单名称不能为空"
+            
+                self._get_archive().save_document(document, self.quotations)
+                self.current_document = document
+                return True, f"报价单“{document.name}”已保存，共 {document.line_count} 行"
+        except Exception as e:
+            return False, f"保存报价单失败: {e}"
+    
+    def open_quotation_document(self, document_id):
+        """
+        打开存档中的报价单，替换当前报价
+        
+        Args:
+            document_id (int): 报价单编号
+        
+        Returns:
+            tuple: (success, message)
+        """
+        try:
+            with self._save_lock:
+                archive = self._get_archive()
+                document = archive.get_document(document_id)
+                if document is None:
+                    return False, f"报价单不存在: {document_id}"
+                # 每次打开报价单都换用新的共享池，池中只保留当前报价用到的配件
+                component_pool = ComponentPool()
+                lines = archive.load_lines(document_id, component_pool)
+                
+                self._component_pool = component_pool
+                self.quotations = lines
+                self._quotation_index = None
+                self.current_document = document
+                self._save_modified_quotations()
+                return True, f"已打开报价单“{document.name}”，共 {len(lines)} 行"
+        except Exception as e:
+            return False, f"打开报价单失败: {e}"
+    
+    def list_quotation_documents(self, page=1, page_size=DEFAULT_PAGE_SIZE, customer=None, status=None,
+                                 keyword=None):
+        """
+        分页查询存档中的报价单（只读取抬头），按修改时间从新到旧排列
+        
+        Args:
+            page (int): 页码，从1开始
+            page_size (int): 每页条数
+            customer (str, optional): 客户名称
+            status (str, optional): 报价单状态
+            keyword (str, optional): 名称、客户或备注中包含的关键字
+        
+        Returns:
+            tuple: (documents, total)，documents 为 QuotationDocument 列表，total 为符合条件的总数
+        """
+        try:
+            return self._get_archive().list_documents(page, page_size, customer, status, keyword)
+        except Exception as e:
+            print(f"查询报价单失败: {e}")
+            return [], 0
+    
+    def update_quotation_document(self, document_id, name=None, customer=None, status=None, note=None):
+        """
+        修改存档中报价单的抬头信息（不改动报价行）
+        
+        Args:
+            document_id (int): 报价单编号
+            name (str, optional): 报价单名称
+            customer (str, optional): 客户名称
+            status (str, optional): 状态，QUOTATION_STATUSES 之一
+            note (str, optional): 备注
+        
+        Returns:
+            tuple: (success, message)
+        """
+        try:
+            with self._save_lock:
+                archive = self._get_archive()
+                document = archive.get_document(document_id)
+                if document is None:
+                    return False, f"报价单不存在: {document_id}"
+                for attr, value in (("name", name), ("customer", customer), ("status", status), ("note", note)):
+                    if value is not None:
+                        setattr(document, attr, value)
+                archive.update_document(document)
+                if self.current_document is not None and self.current_document.id == document_id:
+                    self.current_document = document
+                return True, f"报价单“{document.name}”已更新"
+        except Exception as e:
+            return False, f"更新报价单失败: {e}"
+    
+    def delete_quotation_document(self, document_id):
+        """
+        从存档中删除报价单（当前报价不受影响）
+        
+        Args:
+            document_id (int): 报价单编号
+        
+        Returns:
+            bool: 删除是否成功
+        """
+        try:
+            with self._save_lock:
+                if not self._get_archive().delete_document(document_id):
+                    return False
+                if self.current_document is not None and self.current_document.id == document_id:
+                    self.current_document = None
+                return True
+        except Exception as e:
+            print(f"删除报价单失败: {e}")
+            return False
+    
+    def get_archive_customers(self):
+        """
+        获取存档中出现过的客户名称，用于历史报价的客户筛选
+        
+        Returns:
+            list: 排序后的客户名称列表
+        """
+        try:
+            return self._get_archive().get_customers()
+        except Exception as e:
+            print(f"读取客户列表失败: {e}")
+            return []
+    
+    def start_quotation_export(self, export_format, filepath, show_cost_price=None):
+        """
+        在后台线程中导出当前报价单，界面用返回任务的 poll() 显示进度，用 cancel() 取消
+        
+        Args:
+            export_format (str): 导出格式，"pdf" 或 "xlsx"
+            filepath (str): 输出文件路径
+            show_cost_price (bool, optional): 是否显示成本价和利润，默认使用设置中的 show_cost_price
+        
+        Returns:
+            BackgroundExport: 已开始的导出任务
+        """
+        # 导出模块依赖 reportlab 和 openpyxl，导入较慢，只在导出时导入
+        from src.utils.background_export import BackgroundExport
+        
+        if show_cost_price is None:
+            show_cost_price = self.settings.get("show_cost_price", False)
+        task = BackgroundExport(export_format, self.quotations, filepath, self.settings, show_cost_price)
+        task.start()
+        return task
+    
+    def export_quotation_documents(self, document_ids, output_dir, formats=("pdf",), show_cost_price=None,
+                                   max_workers=None, progress_callback=None):
+        """
+        将存档中的多个报价单在进程池中并行导出为文件
+        
+        文件名为 "报价单名称_编号.扩展名"。当前进程只读取抬头，报价行由工作进程在导出时各自从存档读取。
+        
+        Args:
+            document_ids (list): 报价单编号列表
+            output_dir (str): 输出目录
+            formats (tuple): 导出格式，"pdf" 和/或 "xlsx"
+            show_cost_price (bool, optional): 是否显示成本价和利润，默认使用设置中的 show_cost_price
+            max_workers (int, optional): 工作进程数，默认为CPU核数
+            progress_callback (callable, optional): 每完成一个文件调用 progress_callback(完成数, 总数)
+        
+        Returns:
+            tuple: (success, message, results)，results 每项为包含 document_id、name、filepath、
+                lines、seconds、error 的字典
+        """
+        # 导出模块依赖 reportlab 和 openpyxl，导入较慢，只在批量导出时导入
+        from src.utils.batch_export import export_batch, safe_filename, ArchivedLines
+        
+        if show_cost_price is None:
+            show_cost_price = self.settings.get("show_cost_price", False)
+        try:
+            archive = self._get_archive()
+            jobs = []
+            documents = []
+            missing = []
+            for document_id in document_ids:
+                document = archive.get_document(document_id)
+                if document is None:
+                    missing.append(document_id)
+                    continue
+                lines = ArchivedLines(archive.db_path, document.id, document.line_count)
+                for extension in formats:
+                    filename = f"{safe_filename(document.name)}_{document.id}.{extension.lstrip('.')}"
+                    jobs.append((lines, os.path.join(output_dir, filename)))
+                    documents.append(document)
+        except Exception as e:
+            return False, f"读取报价单失败: {e}", []
+        
+        success, message, results = export_batch(
+            jobs, self.settings, show_cost_price, max_workers, progress_callback
+        )
+        # results 与 jobs 按下标一一对应，失败的导出也有对应的结果
+        for i, result in enumerate(results):
+            document = documents[i]
+            result["document_id"] = document.id
+            result["name"] = document.name
+        if missing:
+            success = False
+            message += f"；{len(missing)} 个报价单不存在: {', '.join(str(i) for i in missing)}"
+        return success, message, results
+    
+    def _get_archive(self):
+        """
+        获取报价单存档，首次使用时打开数据库
+        
+        Returns:
+            QuotationArchive: 报价单存档
+        """
+        if self._archive is None:
+            self._archive = QuotationArchive(self.archive_file)
+        return self._archive
+    
     # =========== 设置处理 ===========
     
     def load_settings(self):
@@ -557,6 +1619,12 @@ class DataManager:
             bool: 加载是否成功
         """
         try:
+            if self._sqlite is not None:
+                settings = self._sqlite.load_settings()
+                if settings:
+                    self.settings = settings
+                    return True
+            
             if os.path.exists(self.settings_file):
                 with open(self.settings_file, 'r', encoding='utf-8') as f:
                     self.settings = json.load(f)
@@ -574,8 +1642,11 @@ class DataManager:
             bool: 保存是否成功
         """
         try:
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, ensure_ascii=False, indent=2)
+            # settings.json 始终保留，启动时据此选择存储方式
+            self._write_json(self.settings_file, self.settings)
+            if self._sqlite is not None:
+                self._sqlite.save_settings(self.settings)
+                self._sqlite.commit()
             return True
         except Exception as e:
             print(f"保存设置失败: {e}")
@@ -593,9 +1664,75 @@ class DataManager:
             bool: 更新是否成功
         """
         try:
-            self.settings[key] = value
-            self.save_settings()
-            return True
+            with self._save_lock:
+                self.settings[key] = value
+                self._mark_dirty("settings")
+                return True
         except Exception as e:
             print(f"更新设置失败: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+def _build_items(data, factory, label, limit=10):
+    """
+    逐条从字典创建数据对象，无法转换的条目（如成本价为 NaN 或无穷大）跳过并提示，不影响其余条目
+    
+    Args:
+        data (list): 数据字典列表
+        factory (callable): 从字典创建对象的函数
+        label (str): 提示信息中的数据名称
+        limit (int): 最多逐条提示的条目数量
+    
+    Returns:
+        list: 创建的对象列表
+    """
+    items = []
+    skipped = 0
+    for position, item in enumerate(data, 1):
+        try:
+            items.append(factory(item))
+        except (ValueError, TypeError) as e:
+            skipped += 1
+            if skipped <= limit:
+                print(f"跳过第 {position} 条无效的{label}数据: {e}")
+    if skipped > limit:
+        print(f"共跳过 {skipped} 条无效的{label}数据")
+    return items
+
+
+def _format_skipped_rows(count, errors, limit=10):
+    """
+    生成跳过无效行的提示文字
+    
+    Args:
+        count (int): 无效行总数
+        errors (list): (行号, 错误说明) 列表
+        limit (int): 最多列出的行号数量
+    
+    Returns:
+        str: 提示文字，没有无效行时返回空字符串
+    """
+    if not count:
+        return ""
+    line_numbers = "、".join(str(line) for line, _ in errors[:limit])
+    more = " 等" if count > limit else ""
+    return f"，跳过 {count} 行无效数据（第 {line_numbers} 行{more}）"
+
+
+def _key_occurrence(items, position, index):
+    """
+    列表中指定位置的数据项是相同 (类型, 型号) 中的第几项（从0开始），用于定位SQLite中对应的行
+    
+    Args:
+        items (list): 目录数据项列表
+        position (int): 数据项位置
+        index (CatalogIndex): 目录索引（总是指向相同键的第一项）
+    
+    Returns:
+        int: 相同键中的序号
+    """
+    item = items[position]
+    if index.get(item.type_name, item.model) is item:
+        return 0
+    key = (item.type_name, item.model)
+    return sum(1 for other in items[:position] if (other.type_name, other.model) == key)
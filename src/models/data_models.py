@@ -6,9 +6,38 @@
 定义橡胶接头报价系统中使用的数据实体类
 """
 
+import sys
+
+from src.models.money import to_cents, percent_to_basis_points, cents_to_yuan, apply_markup
+
+
+# 所有配件累计的改价次数，按成本价缓存的结果（如配套列表）据此判断是否过期
+_cost_edits = 0
+
+
+def _intern(value):
+    """驻留字符串，使大量重复的类型名称、型号共用同一个字符串对象"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def cost_edit_count():
+    """
+    获取所有球体和法兰累计的改价次数
+
+    Returns:
+        int: 改价次数，任何配件改价后都会增加
+    """
+    return _cost_edits
+
+
 class SphereItem:
     """球体（接头）数据类"""
     
+    # 使用 __slots__ 去掉每个实例的 __dict__，大目录和大量报价行可显著节省内存
+    # 成本价以整数分保存，cost_cents 属性按分、cost_price 属性按元读写；
+    # _version 在每次改价时加1，引用该配件的报价行据此判断价格缓存是否过期
+    __slots__ = ("type_name", "model", "_cost_cents", "_version")
+    
     def __init__(self, type_name="", model="", cost_price=0.0):
         """
         初始化球体数据对象
@@ -20,7 +49,30 @@ class SphereItem:
         """
         self.type_name = type_name
         self.model = model
-        self.cost_price = float(cost_price)
+        self._cost_cents = to_cents(cost_price)
+        self._version = 0
+    
+    @property
+    def cost_cents(self):
+        """成本价（分）"""
+        return self._cost_cents
+    
+    @cost_cents.setter
+    def cost_cents(self, value):
+        global _cost_edits
+        if value != self._cost_cents:
+            self._cost_cents = value
+            self._version += 1
+            _cost_edits += 1
+    
+    @property
+    def cost_price(self):
+        """成本价（元）"""
+        return cents_to_yuan(self._cost_cents)
+    
+    @cost_price.setter
+    def cost_price(self, value):
+        self.cost_cents = to_cents(value)
     
     def to_dict(self):
         """
@@ -47,9 +99,9 @@ class SphereItem:
             SphereItem: 创建的球体对象
         """
         return cls(
-            type_name=data.get("type_name", ""),
+            type_name=_intern(data.get("type_name", "")),
             model=data.get("model", ""),
-            cost_price=float(data.get("cost_price", 0.0))
+            cost_price=data.get("cost_price", 0.0)
         )
     
     def __str__(self):
@@ -59,6 +111,8 @@ class SphereItem:
 class FlangeItem:
     """法兰数据类"""
     
+    __slots__ = ("type_name", "model", "_cost_cents", "_version")
+    
     def __init__(self, type_name="", model="", cost_price=0.0):
         """
         初始化法兰数据对象
@@ -70,7 +124,30 @@ class FlangeItem:
         """
         self.type_name = type_name
         self.model = model
-        self.cost_price = float(cost_price)
+        self._cost_cents = to_cents(cost_price)
+        self._version = 0
+    
+    @property
+    def cost_cents(self):
+        """成本价（分）"""
+        return self._cost_cents
+    
+    @cost_cents.setter
+    def cost_cents(self, value):
+        global _cost_edits
+        if value != self._cost_cents:
+            self._cost_cents = value
+            self._version += 1
+            _cost_edits += 1
+    
+    @property
+    def cost_price(self):
+        """成本价（元）"""
+        return cents_to_yuan(self._cost_cents)
+    
+    @cost_price.setter
+    def cost_price(self, value):
+        self.cost_cents = to_cents(value)
     
     def to_dict(self):
         """
@@ -97,18 +174,111 @@ class FlangeItem:
             FlangeItem: 创建的法兰对象
         """
         return cls(
-            type_name=data.get("type_name", ""),
+            type_name=_intern(data.get("type_name", "")),
             model=data.get("model", ""),
-            cost_price=float(data.get("cost_price", 0.0))
+            cost_price=data.get("cost_price", 0.0)
         )
     
     def __str__(self):
         return f"{self.type_name} {self.model} (成本: ¥{self.cost_price:.2f})"
 
 
+class ComponentPool:
+    """
+    配件共享池
+    
+    相同类型、型号和成本价的配件在报价行之间共享同一个对象，而不是每行各复制一份。
+    原地修改共享配件的成本价会同时改变所有引用它的报价行的价格（报价行按配件版本号自动重新计价）；
+    只想改变某一行时，给该行赋值新的配件对象。
+    """
+    
+    __slots__ = ("_items",)
+    
+    def __init__(self):
+        """初始化空的配件共享池"""
+        self._items = {}  # (类, 类型, 型号, 成本价(分)) -> 配件对象
+    
+    def __len__(self):
+        return len(self._items)
+    
+    def intern(self, item_cls, type_name, model, cost_price):
+        """
+        获取共享的配件对象，不存在时创建
+        
+        Args:
+            item_cls (type): 配件类型，SphereItem 或 FlangeItem
+            type_name (str): 类型名称
+            model (str): 型号规格
+            cost_price (float): 成本价
+        
+        Returns:
+            SphereItem/FlangeItem: 共享的配件对象
+        """
+        return self.intern_cents(item_cls, type_name, model, to_cents(cost_price))
+    
+    def intern_item(self, item):
+        """
+        将已有配件对象替换为共享池中的等值对象
+        
+        Args:
+            item (SphereItem/FlangeItem): 配件对象
+        
+        Returns:
+            SphereItem/FlangeItem: 共享的配件对象
+        """
+        return self.intern_cents(type(item), item.type_name, item.model, item.cost_cents)
+    
+    def intern_dict(self, item_cls, data):
+        """
+        从字典获取共享的配件对象
+        
+        Args:
+            item_cls (type): 配件类型，SphereItem 或 FlangeItem
+            data (dict): 配件数据字典
+        
+        Returns:
+            SphereItem/FlangeItem: 共享的配件对象
+        """
+        return self.intern(item_cls, data.get("type_name", ""), data.get("model", ""),
+                           data.get("cost_price", 0.0))
+    
+    def clear(self):
+        """清空共享池"""
+        self._items.clear()
+    
+    def intern_cents(self, item_cls, type_name, model, cost_cents):
+        """
+        按整数分成本价获取共享的配件对象，不存在时创建（不经过元与分之间的换算）
+        
+        Args:
+            item_cls (type): 配件类型，SphereItem 或 FlangeItem
+            type_name (str): 类型名称
+            model (str): 型号规格
+            cost_cents (int): 成本价（分）
+        
+        Returns:
+            SphereItem/FlangeItem: 共享的配件对象
+        """
+        key = (item_cls, type_name, model, cost_cents)
+        item = self._items.get(key)
+        # 池中对象被原地改价后不再与键对应，换成新对象
+        if item is None or item._cost_cents != cost_cents:
+            item = item_cls(_intern(type_name), _intern(model))
+            item._cost_cents = cost_cents
+            self._items[key] = item
+        return item
+
+
 class QuotationItem:
     """报价项目类"""
     
+    # 利润率以整数 0.01% 保存，profit_percentage 属性按百分比读写。
+    # 单件成本价和销售价（分）缓存在 _unit_cost_cents、_unit_price_cents 中，为 None 表示缓存已失效。
+    # _priced_at 为缓存时三个配件 _version 之和；配件在报价行之间共享（见 ComponentPool），
+    # 原地修改配件成本价后其 _version 增加，引用它的所有报价行在下次读取价格时重新计算。
+    __slots__ = ("_sphere", "_flange1", "_flange2", "_quantity", "_profit_bp",
+                 "_unit_cost_cents", "_unit_price_cents", "_priced_at")
+    
     def __init__(self, sphere=None, flange1=None, flange2=None, quantity=1, profit_percentage=30.0):
         """
         初始化报价项目对象
@@ -120,36 +290,122 @@ class QuotationItem:
             quantity (int): 数量
             profit_percentage (float): 利润百分比
         """
-        self.sphere = sphere if sphere else SphereItem()
-        self.flange1 = flange1 if flange1 else FlangeItem()
-        self.flange2 = flange2 if flange2 else FlangeItem()
-        self.quantity = int(quantity)
-        self.profit_percentage = float(profit_percentage)
+        self._sphere = sphere if sphere else SphereItem()
+        self._flange1 = flange1 if flange1 else FlangeItem()
+        self._flange2 = flange2 if flange2 else FlangeItem()
+        self._quantity = int(quantity)
+        self._profit_bp = percent_to_basis_points(profit_percentage)
+        self._unit_price_cents = None
+    
+    # 修改下列属性时使价格缓存失效
+    
+    @property
+    def sphere(self):
+        """球体对象"""
+        return self._sphere
+    
+    @sphere.setter
+    def sphere(self, value):
+        self._sphere = value
+        self._unit_price_cents = None
+    
+    @property
+    def flange1(self):
+        """第一个法兰对象"""
+        return self._flange1
+    
+    @flange1.setter
+    def flange1(self, value):
+        self._flange1 = value
+        self._unit_price_cents = None
+    
+    @property
+    def flange2(self):
+        """第二个法兰对象"""
+        return self._flange2
+    
+    @flange2.setter
+    def flange2(self, value):
+        self._flange2 = value
+        self._unit_price_cents = None
+    
+    @property
+    def quantity(self):
+        """数量"""
+        return self._quantity
+    
+    @quantity.setter
+    def quantity(self, value):
+        # 合计由单价乘以数量得到，单价缓存不受影响
+        self._quantity = int(value)
+    
+    @property
+    def profit_bp(self):
+        """利润率（0.01%）"""
+        return self._profit_bp
+    
+    @profit_bp.setter
+    def profit_bp(self, value):
+        self._profit_bp = value
+        self._unit_price_cents = None
+    
+    @property
+    def profit_percentage(self):
+        """利润百分比"""
+        return self._profit_bp / 100
+    
+    @profit_percentage.setter
+    def profit_percentage(self, value):
+        self.profit_bp = percent_to_basis_points(value)
     
     @property
     def description(self):
         """获取产品描述"""
-        return f"{self.sphere.type_name} {self.sphere.model} + {self.flange1.type_name} + {self.flange2.type_name}"
+        return f"{self._sphere.type_name} {self._sphere.model} + {self._flange1.type_name} + {self._flange2.type_name}"
+    
+    @property
+    def unit_cost_cents(self):
+        """单件成本价（分）"""
+        if self._prices_stale():
+            self._refresh_prices()
+        return self._unit_cost_cents
+    
+    @property
+    def total_cost_cents(self):
+        """总成本价（分）"""
+        return self.unit_cost_cents * self._quantity
+    
+    @property
+    def unit_price_cents(self):
+        """单件销售价（分），加价后四舍五入到分"""
+        if self._prices_stale():
+            self._refresh_prices()
+        return self._unit_price_cents
+    
+    @property
+    def total_price_cents(self):
+        """总销售价（分），等于单件销售价乘以数量"""
+        return self.unit_price_cents * self._quantity
     
     @property
     def unit_cost_price(self):
-        """计算单件成本价"""
-        return self.sphere.cost_price + self.flange1.cost_price + self.flange2.cost_price
+        """计算单件成本价（元）"""
+        return cents_to_yuan(self.unit_cost_cents)
     
     @property
     def total_cost_price(self):
-        """计算总成本价"""
-        return self.unit_cost_price * self.quantity
+        """计算总成本价（元）"""
+        return cents_to_yuan(self.total_cost_cents)
     
     @property
     def unit_price(self):
-        """计算单件销售价"""
-        return self.unit_cost_price * (1 + self.profit_percentage / 100)
+        """计算单件销售价（元）"""
+        return cents_to_yuan(self.unit_price_cents)
     
     @property
     def total_price(self):
-        """计算总销售价"""
-        return self.unit_price * self.quantity
+        """计算总销售价（元）"""
+        return cents_to_yuan(self.total_price_cents)
     
     def to_dict(self):
         """
@@ -167,25 +423,130 @@ class QuotationItem:
         }
     
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, pool=None):
         """
         从字典创建对象
         
         Args:
             data (dict): 数据字典
+            pool (ComponentPool, optional): 配件共享池。提供时相同的配件在各行之间共享
             
         Returns:
             QuotationItem: 创建的报价项目对象
         """
+        if pool is not None:
+            return cls(
+                sphere=pool.intern_dict(SphereItem, data.get("sphere", {})),
+                flange1=pool.intern_dict(FlangeItem, data.get("flange1", {})),
+                flange2=pool.intern_dict(FlangeItem, data.get("flange2", {})),
+                quantity=int(data.get("quantity", 1)),
+                profit_percentage=data.get("profit_percentage", 30.0)
+            )
         return cls(
             sphere=SphereItem.from_dict(data.get("sphere", {})),
             flange1=FlangeItem.from_dict(data.get("flange1", {})),
             flange2=FlangeItem.from_dict(data.get("flange2", {})),
             quantity=int(data.get("quantity", 1)),
-            profit_percentage=float(data.get("profit_percentage", 30.0))
+            profit_percentage=data.get("profit_percentage", 30.0)
         )
     
+    def __getstate__(self):
+        # 序列化（快照缓存）时不保存价格缓存
+        return (self._sphere, self._flange1, self._flange2, self._quantity, self._profit_bp)
+    
+    def __setstate__(self, state):
+        self._sphere, self._flange1, self._flange2, self._quantity, self._profit_bp = state
+        self._unit_price_cents = None
+    
+    def invalidate_prices(self):
+        """使价格缓存失效，下次读取价格时重新计算"""
+        self._unit_price_cents = None
+    
+    def _prices_stale(self):
+        """价格缓存是否已失效：缓存被清除，或任一配件在缓存后改过价（版本号只增不减，和变化即说明有改价）"""
+        return (self._unit_price_cents is None
+                or self._priced_at != self._sphere._version + self._flange1._version + self._flange2._version)
+    
+    def _refresh_prices(self):
+        """缓存失效后重新计算单件价格"""
+        sphere, flange1, flange2 = self._sphere, self._flange1, self._flange2
+        unit_cost = sphere._cost_cents + flange1._cost_cents + flange2._cost_cents
+        self._unit_cost_cents = unit_cost
+        self._unit_price_cents = apply_markup(unit_cost, self._profit_bp)
+        self._priced_at = sphere._version + flange1._version + flange2._version
+    
     def __str__(self):
         return (f"{self.description} x {self.quantity}件, "
                 f"单价: ¥{self.unit_price:.2f}, "
-                f"总价: ¥{self.total_price:.2f}")
\ No newline at end of file
+                f"总价: ¥{self.total_price:.2f}")
+
+# 报价单状态
+QUOTATION_STATUS_DRAFT = "draft"  # 草稿
+QUOTATION_STATUS_SENT = "sent"  # 已发送
+QUOTATION_STATUS_ACCEPTED = "accepted"  # 已成交
+QUOTATION_STATUS_REJECTED = "rejected"  # 未成交
+QUOTATION_STATUSES = (QUOTATION_STATUS_DRAFT, QUOTATION_STATUS_SENT,
+                      QUOTATION_STATUS_ACCEPTED, QUOTATION_STATUS_REJECTED)
+
+
+class QuotationDocument:
+    """报价单类（只包含抬头信息，报价行单独存储）"""
+    
+    __slots__ = ("id", "name", "customer", "status", "note", "created_at", "updated_at",
+                 "line_count", "total_cents")
+    
+    def __init__(self, name="", customer="", status=QUOTATION_STATUS_DRAFT, note="",
+                 created_at="", updated_at="", line_count=0, total_cents=0, id=None):
+        """
+        初始化报价单对象
+        
+        Args:
+            name (str): 报价单名称
+            customer (str): 客户名称
+            status (str): 状态，QUOTATION_STATUSES 之一
+            note (str): 备注
+            created_at (str): 创建时间，格式 "YYYY-MM-DD HH:MM:SS"
+            updated_at (str): 最后修改时间，格式同上
+            line_count (int): 报价行数
+            total_cents (int): 保存时的报价总金额（分）
+            id (int, optional): 存档中的编号，尚未保存时为None
+        """
+        self.id = id
+        self.name = name
+        self.customer = customer
+        self.status = status
+        self.note = note
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.line_count = line_count
+        self.total_cents = total_cents
+    
+    @property
+    def total_price(self):
+        """保存时的报价总金额（元）"""
+        return cents_to_yuan(self.total_cents)
+    
+    def to_dict(self):
+        """
+        将对象转换为字典用于JSON序列化
+        
+        Returns:
+            dict: 对象的字典表示
+        """
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        从字典创建对象
+        
+        Args:
+            data (dict): 数据字典
+            
+        Returns:
+            QuotationDocument: 创建的报价单对象
+        """
+        return cls(**{slot: data[slot] for slot in cls.__slots__ if slot in data})
+    
+    def __str__(self):
+        return f"{self.name} ({self.customer}) {self.updated_at}, 共{self.line_count}行, 总价: ¥{self.total_price:.2f}"
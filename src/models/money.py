@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+金额计算模块
+金额以整数"分"保存和计算，利润率以整数"万分之一"（0.01%）保存，
+避免二进制浮点数在行合计与总计之间产生分位误差
+"""
+
+import math
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# 1元 = 100分
+CENTS_PER_YUAN = 100
+
+# 利润率 100% = 10000 个 0.01%
+BASIS_POINTS_PER_UNIT = 10000
+
+_HUNDREDTH = Decimal("0.01")
+
+
+def to_cents(value):
+    """
+    将以元为单位的金额转换为整数分（四舍五入）
+
+    Args:
+        value (float/int/str/Decimal): 以元为单位的金额
+
+    Returns:
+        int: 金额（分）
+
+    Raises:
+        ValueError: 金额不是有限的数值（如 NaN、无穷大或无法解析的文本）
+    """
+    return _to_hundredths(value)
+
+
+def percent_to_basis_points(value):
+    """
+    将利润百分比转换为整数万分比（四舍五入到 0.01%）
+
+    Args:
+        value (float/int/str/Decimal): 利润百分比，如 30.0 表示 30%
+
+    Returns:
+        int: 利润率（0.01%），如 3000
+    """
+    return _to_hundredths(value)
+
+
+def cents_to_yuan(cents):
+    """
+    将整数分转换为以元为单位的浮点数（用于显示或写入Excel数值单元格）
+
+    Args:
+        cents (int): 金额（分）
+
+    Returns:
+        float: 以元为单位的金额
+    """
+    return cents / CENTS_PER_YUAN
+
+
+def format_cents(cents):
+    """
+    将整数分格式化为两位小数的文本
+
+    Args:
+        cents (int): 金额（分）
+
+    Returns:
+        str: 例如 "1234.50"
+    """
+    # 分数除以100后最接近的浮点数按两位小数格式化，结果与十进制值完全一致
+    return f"{cents / CENTS_PER_YUAN:.2f}"
+
+
+def apply_markup(cost_cents, profit_bp):
+    """
+    在成本价上加价并四舍五入到分
+
+    Args:
+        cost_cents (int): 成本价（分）
+        profit_bp (int): 利润率（0.01%）
+
+    Returns:
+        int: 销售价（分）
+    """
+    # 与 round_div 相同，直接展开以减少函数调用
+    return (cost_cents * (BASIS_POINTS_PER_UNIT + profit_bp) + BASIS_POINTS_PER_UNIT // 2) // BASIS_POINTS_PER_UNIT
+
+
+def round_div(numerator, denominator):
+    """
+    整数除法并四舍五入（.5 向上取整）
+
+    Args:
+        numerator (int): 被除数
+        denominator (int): 除数，必须为正数
+
+    Returns:
+        int: 四舍五入后的商
+    """
+    return (numerator + denominator // 2) // denominator
+
+
+def _to_hundredths(value):
+    """将数值四舍五入为百分之一的整数倍，返回该整数；NaN 和无穷大抛出 ValueError"""
+    if isinstance(value, int):
+        return int(value) * 100
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError(f"不是有效的数值: {value}")
+        scaled = value * 100
+        rounded = round(scaled)
+        # 常见的两位小数金额乘以100后只差一点浮点误差，直接取整
+        if abs(scaled - rounded) < 1e-6:
+            return int(rounded)
+        # 其余情况（如 0.285、更多位小数）按十进制文本精确地四舍五入
+        value = repr(float(value))
+    try:
+        value = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"不是有效的数值: {value!r}") from None
+    if not value.is_finite():
+        raise ValueError(f"不是有效的数值: {value}")
+    return int(value.quantize(_HUNDREDTH, rounding=ROUND_HALF_UP) * 100)
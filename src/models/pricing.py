@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+批量计价模块
+以并列数组保存一份报价的单件价格和数量，一次性计算所有行的合计和总计
+"""
+
+from src.models.money import cents_to_yuan
+
+
+class QuotationPricing:
+    """报价批量计价类，各派生列（整数分）与 QuotationItem 对应属性的值完全相同"""
+
+    def __init__(self, quotations):
+        """
+        读取报价行并计算所有派生列
+
+        Args:
+            quotations (list): QuotationItem 列表
+        """
+        self.count = len(quotations)
+        # 单件价格取自报价行的价格缓存，只有缓存失效的行会重新计算
+        unit_cost = [q.unit_cost_cents for q in quotations]
+        unit_price = [q.unit_price_cents for q in quotations]
+        quantity = [q.quantity for q in quotations]
+
+        self.unit_cost_cents = unit_cost
+        self.unit_price_cents = unit_price
+        self.total_cost_cents = [c * n for c, n in zip(unit_cost, quantity)]
+        self.total_price_cents = [u * n for u, n in zip(unit_price, quantity)]
+        # 整数求和没有舍入误差，总计恰好等于各行合计之和
+        self.grand_total_cost_cents = sum(self.total_cost_cents)
+        self.grand_total_cents = sum(self.total_price_cents)
+
+    @property
+    def grand_total_cost(self):
+        """成本总计（元）"""
+        return cents_to_yuan(self.grand_total_cost_cents)
+
+    @property
+    def grand_total(self):
+        """销售总计（元）"""
+        return cents_to_yuan(self.grand_total_cents)
+
+    def iter_rows(self):
+        """
+        逐行返回派生列
+
+        Yields:
+            tuple: (unit_cost_cents, total_cost_cents, unit_price_cents, total_price_cents)
+        """
+        return zip(self.unit_cost_cents, self.total_cost_cents, self.unit_price_cents, self.total_price_cents)
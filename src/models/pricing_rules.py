@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+定价规则模块
+将按类型加价、数量阶梯折扣和客户折扣规则编译为查找表，对整份报价一次性批量计算利润率
+"""
+
+from bisect import bisect_right
+
+from src.models.money import BASIS_POINTS_PER_UNIT, percent_to_basis_points, round_div
+from src.models.quotation_index import KIND_SPHERE, KIND_FLANGE
+
+# 规则种类（规则字典中的 "rule"）
+RULE_MARKUP = "markup"  # 按配件类型的利润率: part, type_name, profit_percentage
+RULE_QUANTITY_BREAK = "quantity_break"  # 数量阶梯折扣: min_quantity, discount_percentage, 可选 type_name（球体类型）
+RULE_CUSTOMER_DISCOUNT = "customer_discount"  # 客户折扣: customer, discount_percentage
+
+# 未匹配任何加价规则时使用的利润百分比
+DEFAULT_PROFIT_PERCENTAGE = 30.0
+
+
+class PricingRules:
+    """
+    编译后的定价规则
+
+    每行的利润率 = 匹配的加价规则中最高的利润率（球体类型、两个法兰类型），无匹配时为默认利润率；
+    再按数量阶梯折扣和客户折扣依次打折，最终折算为一个利润率写回报价行。
+    同一对象重复出现的规则以后出现的为准。
+    """
+
+    def __init__(self, rules, default_profit_percentage=DEFAULT_PROFIT_PERCENTAGE):
+        """
+        编译规则集
+
+        Args:
+            rules (list): 规则字典列表
+            default_profit_percentage (float): 未匹配加价规则时的利润百分比
+
+        Raises:
+            ValueError: 规则格式不正确
+        """
+        self.default_bp = percent_to_basis_points(default_profit_percentage)
+        self._markups = {KIND_SPHERE: {}, KIND_FLANGE: {}}  # 种类 -> {类型: 利润率(0.01%)}
+        self._customer_discounts = {}  # 客户 -> 折扣(0.01%)
+        breaks = {}  # 球体类型（None 表示全部） -> {起订数量: 折扣(0.01%)}
+
+        for number, rule in enumerate(rules, 1):
+            try:
+                kind = rule["rule"]
+                if kind == RULE_MARKUP:
+                    part = rule["part"]
+                    if part not in self._markups:
+                        raise ValueError(f"未知的配件种类: {part}")
+                    self._markups[part][rule["type_name"]] = percent_to_basis_points(rule["profit_percentage"])
+                elif kind == RULE_QUANTITY_BREAK:
+                    min_quantity = int(rule["min_quantity"])
+                    breaks.setdefault(rule.get("type_name"), {})[min_quantity] = \
+                        _discount_bp(rule["discount_percentage"])
+                elif kind == RULE_CUSTOMER_DISCOUNT:
+                    self._customer_discounts[rule["customer"]] = _discount_bp(rule["discount_percentage"])
+                else:
+                    raise ValueError(f"未知的规则种类: {kind}")
+            except KeyError as e:
+                raise ValueError(f"第 {number} 条规则缺少字段: {e}")
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"第 {number} 条规则无效: {e}")
+
+        # 阶梯表：按起订数量排序的阈值列表和对应折扣，查找时二分
+        self._breaks = {}
+        for scope, table in breaks.items():
+            thresholds = sorted(table)
+            self._breaks[scope] = (thresholds, [table[t] for t in thresholds])
+
+        self.rule_count = len(rules)
+
+    def profit_bp_for(self, line, customer=None):
+        """
+        计算单个报价行按规则应有的利润率
+
+        Args:
+            line (QuotationItem): 报价行
+            customer (str, optional): 客户名称
+
+        Returns:
+            int: 利润率（0.01%）
+        """
+        factor, table = self._type_terms(line.sphere.type_name, line.flange1.type_name, line.flange2.type_name)
+        return self._finish(factor, table, line.quantity, self._customer_discounts.get(customer, 0))
+
+    def apply(self, quotations, customer=None):
+        """
+        按规则批量设置报价行的利润率
+
+        与类型有关的部分按 (球体类型, 法兰1类型, 法兰2类型) 只查找一次，
+        结果与逐行调用 profit_bp_for 相同。
+
+        Args:
+            quotations (list): QuotationItem 列表
+            customer (str, optional): 客户名称，用于客户折扣
+
+        Returns:
+            int: 利润率发生变化的报价行数量
+        """
+        customer_discount = self._customer_discounts.get(customer, 0)
+        type_terms = {}  # (球体类型, 法兰1类型, 法兰2类型) -> (售价系数, 阶梯表)
+        finish = self._finish
+        changed = 0
+        for line in quotations:
+            key = (line.sphere.type_name, line.flange1.type_name, line.flange2.type_name)
+            terms = type_terms.get(key)
+            if terms is None:
+                terms = type_terms[key] = self._type_terms(*key)
+            profit_bp = finish(terms[0], terms[1], line.quantity, customer_discount)
+            if line.profit_bp != profit_bp:
+                line.profit_bp = profit_bp
+                changed += 1
+        return changed
+
+    def _type_terms(self, sphere_type, flange1_type, flange2_type):
+        """
+        查找与配件类型有关的部分
+
+        Returns:
+            tuple: (售价系数(0.01%)，即 1 + 利润率, 适用的数量阶梯表或None)
+        """
+        sphere_markups = self._markups[KIND_SPHERE]
+        flange_markups = self._markups[KIND_FLANGE]
+        candidates = [markup for markup in (sphere_markups.get(sphere_type),
+                                            flange_markups.get(flange1_type),
+                                            flange_markups.get(flange2_type))
+                      if markup is not None]
+        profit_bp = max(candidates) if candidates else self.default_bp
+        table = self._breaks.get(sphere_type) or self._breaks.get(None)
+        return BASIS_POINTS_PER_UNIT + profit_bp, table
+
+    @staticmethod
+    def _finish(factor, table, quantity, customer_discount):
+        """依次乘以数量阶梯折扣和客户折扣，返回最终的利润率（0.01%）"""
+        # 售价系数：(1 + 利润率) × (1 - 阶梯折扣) × (1 - 客户折扣)
+        if table is not None:
+            position = bisect_right(table[0], quantity)
+            if position:
+                factor = round_div(factor * (BASIS_POINTS_PER_UNIT - table[1][position - 1]),
+                                   BASIS_POINTS_PER_UNIT)
+        if customer_discount:
+            factor = round_div(factor * (BASIS_POINTS_PER_UNIT - customer_discount), BASIS_POINTS_PER_UNIT)
+        return factor - BASIS_POINTS_PER_UNIT
+
+
+def _discount_bp(discount_percentage):
+    """将折扣百分比转换为 0.01% 并检查范围"""
+    discount = percent_to_basis_points(discount_percentage)
+    if not 0 <= discount <= BASIS_POINTS_PER_UNIT:
+        raise ValueError(f"折扣百分比应在 0~100 之间: {discount_percentage}")
+    return discount
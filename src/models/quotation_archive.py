@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+报价单存档模块
+使用 sqlite3 保存多个命名报价单：抬头信息（客户、日期、状态、行数、总金额）与报价行分表存储，
+列表和分页查询只读取抬头，打开报价单时才按编号读取该单的报价行
+"""
+
+import time
+import sqlite3
+import threading
+
+from src.models.data_models import (
+    SphereItem, FlangeItem, QuotationItem, QuotationDocument, ComponentPool,
+    QUOTATION_STATUSES
+)
+
+# 存档数据库文件名
+ARCHIVE_FILENAME = "quotation_archive.db"
+
+# 分页查询的默认每页条数
+DEFAULT_PAGE_SIZE = 50
+
+# 抬头表的列，与 QuotationDocument 的属性同名
+_HEADER_COLUMNS = ("id", "name", "customer", "status", "note", "created_at", "updated_at",
+                   "line_count", "total_cents")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    customer TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL,
+    note TEXT NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    line_count INTEGER NOT NULL,
+    total_cents INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documents_updated ON documents (updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_documents_customer ON documents (customer, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_documents_status ON documents (status, updated_at, id);
+
+CREATE TABLE IF NOT EXISTS document_lines (
+    document_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    sphere_type TEXT NOT NULL,
+    sphere_model TEXT NOT NULL,
+    sphere_cost_cents INTEGER NOT NULL,
+    flange1_type TEXT NOT NULL,
+    flange1_model TEXT NOT NULL,
+    flange1_cost_cents INTEGER NOT NULL,
+    flange2_type TEXT NOT NULL,
+    flange2_model TEXT NOT NULL,
+    flange2_cost_cents INTEGER NOT NULL,
+    quantity INTEGER NOT NULL,
+    profit_bp INTEGER NOT NULL,
+    PRIMARY KEY (document_id, position)
+) WITHOUT ROWID;
+"""
+
+_INSERT_LINE = (
+    "INSERT INTO document_lines (document_id, position, "
+    "sphere_type, sphere_model, sphere_cost_cents, "
+    "flange1_type, flange1_model, flange1_cost_cents, "
+    "flange2_type, flange2_model, flange2_cost_cents, "
+    "quantity, profit_bp) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+class QuotationArchive:
+    """
+    报价单存档类
+
+    报价行以 (报价单编号, 行号) 为主键聚簇存储，打开一个报价单只读取连续的一段数据；
+    抬头表按修改时间、客户和状态建立索引，分页列表不随存档中的报价行总数变慢。
+    """
+
+    def __init__(self, db_path):
+        """
+        打开（必要时创建）存档数据库
+
+        Args:
+            db_path (str): 数据库文件路径
+        """
+        self.db_path = db_path
+        # 后台线程（自动保存、后台加载）也可能访问存档，由内部锁串行化
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.RLock()
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+    def save_document(self, document, lines):
+        """
+        保存报价单抬头和全部报价行；报价单已有编号时整体替换原有报价行
+
+        保存后 document 的编号、时间、行数和总金额被更新。
+
+        Args:
+            document (QuotationDocument): 报价单抬头
+            lines (list): QuotationItem 列表
+
+        Returns:
+            int: 报价单编号
+        """
+        _check_status(document.status)
+        now = _now()
+        document.updated_at = now
+        if not document.created_at:
+            document.created_at = now
+        document.line_count = len(lines)
+        document.total_cents = sum(line.total_price_cents for line in lines)
+
+        with self._lock, self._conn:
+            if document.id is None:
+                cursor = self._conn.execute(
+                    "INSERT INTO documents (name, customer, status, note, created_at, updated_at, "
+                    "line_count, total_cents) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    _header_row(document)
+                )
+                document.id = cursor.lastrowid
+            else:
+                cursor = self._conn.execute(
+                    "UPDATE documents SET name = ?, customer = ?, status = ?, note = ?, created_at = ?, "
+                    "updated_at = ?, line_count = ?, total_cents = ? WHERE id = ?",
+                    _header_row(document) + (document.id,)
+                )
+                if cursor.rowcount == 0:
+                    raise KeyError(f"报价单不存在: {document.id}")
+                self._conn.execute("DELETE FROM document_lines WHERE document_id = ?", (document.id,))
+            self._conn.executemany(
+                _INSERT_LINE,
+                (_line_row(document.id, position, line) for position, line in enumerate(lines))
+            )
+        return document.id
+
+    def update_document(self, document):
+        """
+        只更新报价单抬头（名称、客户、状态、备注），不改动报价行
+
+        Args:
+            document (QuotationDocument): 报价单抬头，必须已有编号
+
+        Returns:
+            bool: 报价单是否存在
+        """
+        _check_status(document.status)
+        document.updated_at = _now()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE documents SET name = ?, customer = ?, status = ?, note = ?, updated_at = ? "
+                "WHERE id = ?",
+                (document.name, document.customer, document.status, document.note,
+                 document.updated_at, document.id)
+            )
+        return cursor.rowcount > 0
+
+    def delete_document(self, document_id):
+        """
+        删除报价单及其报价行
+
+        Args:
+            document_id (int): 报价单编号
+
+        Returns:
+            bool: 报价单是否存在
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM document_lines WHERE document_id = ?", (document_id,))
+            cursor = self._conn.execute("DELETE FROM documents WHERE id = ?", (document_id,))
+        return cursor.rowcount > 0
+
+    def get_document(self, document_id):
+        """
+        读取报价单抬头
+
+        Args:
+            document_id (int): 报价单编号
+
+        Returns:
+            QuotationDocument: 报价单抬头，不存在时返回None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_HEADER_COLUMNS)} FROM documents WHERE id = ?", (document_id,)
+            ).fetchone()
+        return _document_from_row(row) if row is not None else None
+
+    def load_lines(self, document_id, pool=None):
+        """
+        读取一个报价单的报价行
+
+        Args:
+            document_id (int): 报价单编号
+            pool (ComponentPool, optional): 配件共享池，默认新建
+
+        Returns:
+            list: QuotationItem 列表，按保存时的顺序排列
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT sphere_type, sphere_model, sphere_cost_cents, "
+                "flange1_type, flange1_model, flange1_cost_cents, "
+                "flange2_type, flange2_model, flange2_cost_cents, "
+                "quantity, profit_bp FROM document_lines WHERE document_id = ? ORDER BY position",
+                (document_id,)
+            ).fetchall()
+        pool = pool if pool is not None else ComponentPool()
+        return [_line_from_row(row, pool) for row in rows]
+
+    def list_documents(self, page=1, page_size=DEFAULT_PAGE_SIZE, customer=None, status=None, keyword=None):
+        """
+        分页列出报价单抬头，按修改时间从新到旧排列
+
+        Args:
+            page (int): 页码，从1开始
+            page_size (int): 每页条数
+            customer (str, optional): 只列出该客户的报价单
+            status (str, optional): 只列出该状态的报价单
+            keyword (str, optional): 名称、客户或备注中包含的关键字
+
+        Returns:
+            tuple: (documents, total)，documents 为本页的 QuotationDocument 列表，
+                total 为符合条件的报价单总数
+        """
+        page = max(1, int(page))
+        page_size = max(1, int(page_size))
+        where, params = _filters(customer, status, keyword)
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM documents{where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_HEADER_COLUMNS)} FROM documents{where} "
+                f"ORDER BY updated_at DESC, id DESC LIMIT ? OFFSET ?",
+                params + [page_size, (page - 1) * page_size]
+            ).fetchall()
+        return [_document_from_row(row) for row in rows], total
+
+    def get_customers(self):
+        """
+        获取存档中出现过的客户名称
+
+        Returns:
+            list: 排序后的客户名称列表（不含空名称）
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT customer FROM documents WHERE customer != '' ORDER BY customer"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+
+def _now():
+    """当前时间，格式 "YYYY-MM-DD HH:MM:SS"，字符串顺序即时间顺序"""
+    return time.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _check_status(status):
+    """校验报价单状态"""
+    if status not in QUOTATION_STATUSES:
+        raise ValueError(f"未知的报价单状态: {status}")
+
+
+def _filters(customer, status, keyword):
+    """生成列表查询的 WHERE 子句和参数"""
+    clauses = []
+    params = []
+    if customer is not None:
+        clauses.append("customer = ?")
+        params.append(customer)
+    if status is not None:
+        clauses.append("status = ?")
+        params.append(status)
+    if keyword:
+        pattern = "%" + keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        clauses.append("(name LIKE ? ESCAPE '\\' OR customer LIKE ? ESCAPE '\\' OR note LIKE ? ESCAPE '\\')")
+        params.extend((pattern, pattern, pattern))
+    if not clauses:
+        return "", params
+    return " WHERE " + " AND ".join(clauses), params
+
+
+def _header_row(document):
+    """报价单抬头（不含编号）对应的数据库列值"""
+    return (document.name, document.customer, document.status, document.note, document.created_at,
+            document.updated_at, document.line_count, document.total_cents)
+
+
+def _document_from_row(row):
+    """将抬头表的一行还原为报价单对象"""
+    return QuotationDocument(**dict(zip(_HEADER_COLUMNS, row)))
+
+
+def _line_row(document_id, position, line):
+    """将报价行展开为数据库行，价格以整数分和 0.01% 保存"""
+    return (
+        document_id, position,
+        line.sphere.type_name, line.sphere.model, line.sphere.cost_cents,
+        line.flange1.type_name, line.flange1.model, line.flange1.cost_cents,
+        line.flange2.type_name, line.flange2.model, line.flange2.cost_cents,
+        line.quantity, line.profit_bp
+    )
+
+
+def _line_from_row(row, pool):
+    """将数据库行还原为报价行，配件从共享池中获取"""
+    line = QuotationItem(
+        sphere=pool.intern_cents(SphereItem, row[0], row[1], row[2]),
+        flange1=pool.intern_cents(FlangeItem, row[3], row[4], row[5]),
+        flange2=pool.intern_cents(FlangeItem, row[6], row[7], row[8]),
+        quantity=row[9]
+    )
+    line.profit_bp = row[10]
+    return line
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+报价反向索引模块
+维护 (配件种类, 类型, 型号) -> 报价行 的索引，目录价格变化时无需遍历全部报价即可找到受影响的行
+"""
+
+# 配件种类
+KIND_SPHERE = "sphere"
+KIND_FLANGE = "flange"
+
+# 报价行中的配件属性及其种类
+QUOTATION_PART_KINDS = (("sphere", KIND_SPHERE), ("flange1", KIND_FLANGE), ("flange2", KIND_FLANGE))
+
+
+class QuotationComponentIndex:
+    """
+    报价反向索引类
+
+    每个 (种类, 类型, 型号) 下按报价行中配件的成本价（分）分组，
+    目录价格变化时只需取出成本价与目录不同的分组，即受影响的报价行。
+    报价行的配件只应通过先 discard、修改、再 add 的方式更换，否则索引会失效。
+    """
+
+    def __init__(self, quotations=None):
+        """
+        初始化反向索引
+
+        Args:
+            quotations (list, optional): 初始报价行列表
+        """
+        # (kind, type_name, model) -> {成本价(分): {报价行: None}}，内层字典用作保持插入顺序的集合
+        self._lines = {}
+        if quotations:
+            self.rebuild(quotations)
+
+    def __len__(self):
+        return len(self._lines)
+
+    def rebuild(self, quotations):
+        """
+        根据报价行列表重建索引
+
+        Args:
+            quotations (list): QuotationItem 列表
+        """
+        self._lines = {}
+        for line in quotations:
+            self.add(line)
+
+    def clear(self):
+        """清空索引"""
+        self._lines = {}
+
+    def add(self, line):
+        """
+        将报价行加入索引
+
+        Args:
+            line (QuotationItem): 报价行
+        """
+        for attr, kind in QUOTATION_PART_KINDS:
+            component = getattr(line, attr)
+            key = (kind, component.type_name, component.model)
+            buckets = self._lines.get(key)
+            if buckets is None:
+                buckets = self._lines[key] = {}
+            bucket = buckets.get(component.cost_cents)
+            if bucket is None:
+                bucket = buckets[component.cost_cents] = {}
+            bucket[line] = None
+
+    def discard(self, line):
+        """
+        将报价行移出索引，不在索引中时忽略
+
+        Args:
+            line (QuotationItem): 报价行
+        """
+        for attr, kind in QUOTATION_PART_KINDS:
+            component = getattr(line, attr)
+            key = (kind, component.type_name, component.model)
+            buckets = self._lines.get(key)
+            if buckets is None:
+                continue
+            bucket = buckets.get(component.cost_cents)
+            if bucket is None:
+                continue
+            bucket.pop(line, None)
+            if not bucket:
+                del buckets[component.cost_cents]
+                if not buckets:
+                    del self._lines[key]
+
+    def keys(self):
+        """
+        获取索引中的所有配件键
+
+        Returns:
+            list: (kind, type_name, model) 元组列表
+        """
+        return list(self._lines)
+
+    def lines_for(self, kind, type_name, model):
+        """
+        获取使用指定配件的报价行
+
+        Args:
+            kind (str): 配件种类，KIND_SPHERE 或 KIND_FLANGE
+            type_name (str): 类型名称
+            model (str): 型号规格
+
+        Returns:
+            list: 报价行列表，按加入索引的顺序，每行只出现一次
+        """
+        lines = {}
+        for bucket in self._lines.get((kind, type_name, model), {}).values():
+            lines.update(bucket)
+        return list(lines)
+
+    def stale_lines(self, kind, type_name, model, cost_cents):
+        """
+        获取使用指定配件但成本价与给定价格不同的报价行
+
+        Args:
+            kind (str): 配件种类，KIND_SPHERE 或 KIND_FLANGE
+            type_name (str): 类型名称
+            model (str): 型号规格
+            cost_cents (int): 当前目录成本价（分）
+
+        Returns:
+            list: 报价行列表，每行只出现一次
+        """
+        lines = {}
+        for price, bucket in self._lines.get((kind, type_name, model), {}).items():
+            if price != cost_cents:
+                lines.update(bucket)
+        return list(lines)
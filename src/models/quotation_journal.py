@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+报价日志存储模块
+以"快照 + 追加日志"的方式保存报价数据，单条增删只追加一行日志而不重写整个文件
+"""
+
+import os
+import json
+import zlib
+import threading
+
+from src.utils.file_utils import atomic_write_json
+
+# 日志记录类型
+OP_BASE = "base"  # 日志头，记录对应快照的校验值
+OP_ADD = "add"
+OP_REMOVE = "remove"
+OP_CLEAR = "clear"
+
+
+class QuotationJournal:
+    """报价日志类，管理报价快照文件和追加日志文件"""
+
+    def __init__(self, snapshot_file, journal_file, compact_threshold=500):
+        """
+        初始化报价日志
+
+        Args:
+            snapshot_file (str): 快照文件路径（即 quotations.json）
+            journal_file (str): 追加日志文件路径
+            compact_threshold (int): 日志记录数达到该值时自动压缩
+        """
+        self.snapshot_file = snapshot_file
+        self.journal_file = journal_file
+        self.compact_threshold = compact_threshold
+        self.record_count = 0  # 已写入日志文件的记录数（不含日志头）
+        self._pending = []  # 尚未写入日志文件的记录
+        self._snapshot_crc = None
+        self._base_ok = False  # 日志文件是否以指向当前快照的日志头开始
+        self._truncated = False  # 日志末尾是否有写了一半的记录
+        # 保护 _pending 和日志文件，append() 可能与定时器线程中的 flush() 同时执行
+        self._lock = threading.RLock()
+
+    def load(self):
+        """
+        读取快照并重放日志
+
+        日志头中的快照校验值与当前快照不一致时（例如压缩过程中崩溃，
+        或曾以JSON方式整体保存过），说明日志已合并进快照，直接丢弃。
+
+        Returns:
+            list: 报价数据字典列表
+        """
+        with self._lock:
+            items = []
+            self._snapshot_crc = 0
+            if os.path.exists(self.snapshot_file):
+                with open(self.snapshot_file, 'rb') as f:
+                    raw = f.read()
+                self._snapshot_crc = zlib.crc32(raw)
+                items = json.loads(raw.decode('utf-8'))
+
+            self.record_count = 0
+            self._pending = []
+            self._base_ok = False
+            self._truncated = False
+            if not os.path.exists(self.journal_file):
+                return items
+
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+            if not lines or not self._is_valid_base(lines[0]):
+                return items
+            self._base_ok = True
+
+            for line in lines[1:]:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 最后一行可能因崩溃而写了一半，忽略并要求压缩，避免后续记录接在半行之后
+                    self._truncated = True
+                    break
+                _apply_record(items, record)
+                self.record_count += 1
+            return items
+
+    def append(self, record):
+        """
+        追加一条日志记录（先缓存，调用 flush() 时写入文件）
+
+        Args:
+            record (dict): 日志记录，包含 op 字段
+        """
+        with self._lock:
+            self._pending.append(record)
+
+    def flush(self):
+        """
+        将缓存的日志记录一次性追加到日志文件并同步到磁盘
+
+        Returns:
+            bool: 是否写入了新记录
+        """
+        with self._lock:
+            if not self._pending:
+                return False
+            # 先换成新列表再序列化，写入的正是取出的这批记录
+            pending, self._pending = self._pending, []
+            try:
+                if not self._base_ok:
+                    # 日志文件不存在或已过期时先重写日志头
+                    self._write_base()
+
+                text = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in pending)
+                with open(self.journal_file, 'a', encoding='utf-8') as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except Exception:
+                # 写入失败时把记录放回队首，下次 flush() 重试
+                self._pending[:0] = pending
+                raise
+            self.record_count += len(pending)
+            return True
+
+    def needs_compaction(self):
+        """
+        检查日志是否需要压缩
+
+        Returns:
+            bool: 日志记录数是否达到压缩阈值，或日志末尾需要修复
+        """
+        with self._lock:
+            return self._truncated or self.record_count + len(self._pending) >= self.compact_threshold
+
+    def compact(self, items):
+        """
+        将当前完整数据写成新快照并清空日志
+
+        Args:
+            items (list): 报价数据字典列表
+        """
+        with self._lock:
+            atomic_write_json(self.snapshot_file, items)
+            with open(self.snapshot_file, 'rb') as f:
+                self._snapshot_crc = zlib.crc32(f.read())
+            self._pending = []
+            self.record_count = 0
+            self._truncated = False
+            self._write_base()
+
+    def _write_base(self):
+        """以原子方式重写日志文件，只保留指向当前快照的日志头"""
+        if self._snapshot_crc is None:
+            self._snapshot_crc = 0
+            if os.path.exists(self.snapshot_file):
+                with open(self.snapshot_file, 'rb') as f:
+                    self._snapshot_crc = zlib.crc32(f.read())
+        temp_path = self.journal_file + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"op": OP_BASE, "snapshot_crc": self._snapshot_crc}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.journal_file)
+        self._base_ok = True
+
+    def _is_valid_base(self, line):
+        """检查日志头是否对应当前快照"""
+        try:
+            base = json.loads(line)
+        except ValueError:
+            return False
+        return base.get("op") == OP_BASE and base.get("snapshot_crc") == self._snapshot_crc
+
+
+def _apply_record(items, record):
+    """将一条日志记录应用到报价数据字典列表"""
+    op = record.get("op")
+    if op == OP_ADD:
+        items.append(record["item"])
+    elif op == OP_REMOVE:
+        index = record["index"]
+        if 0 <= index < len(items):
+            del items[index]
+    elif op == OP_CLEAR:
+        items.clear()
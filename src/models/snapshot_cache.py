@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+快照缓存模块
+将加载后的数据对象保存为二进制快照，下次启动时按源文件的修改时间和大小校验后直接读取，
+跳过JSON解析和逐个构建对象
+"""
+
+import os
+import gc
+import mmap
+import pickle
+import struct
+
+from src.models.data_models import SphereItem, FlangeItem, QuotationItem
+from src.utils.file_utils import atomic_write_bytes
+
+# 快照文件名
+SNAPSHOT_FILENAME = "snapshot.bin"
+
+# 快照格式版本，格式变化时递增
+SNAPSHOT_FORMAT = 2
+
+# 文件头标识
+_MAGIC = b"RJQSNAP\n"
+
+# 文件头长度字段（8字节无符号整数）
+_LENGTH = struct.Struct("<Q")
+
+
+def _schema():
+    """数据类的字段布局，类的 __slots__ 变化后旧快照自动失效"""
+    return tuple((cls.__name__, cls.__slots__) for cls in (SphereItem, FlangeItem, QuotationItem))
+
+
+def pack_section(value):
+    """
+    将一段数据单独序列化，作为快照中按需读取的数据段
+
+    读取快照时该段只是一个 bytes 对象，调用 load_section() 后才创建其中的对象。
+
+    Args:
+        value: 要保存的数据
+
+    Returns:
+        bytes: 序列化后的数据段
+    """
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_section(section):
+    """
+    反序列化 pack_section() 生成的数据段
+
+    Args:
+        section (bytes): 数据段
+
+    Returns:
+        数据段中保存的数据
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return pickle.loads(section)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+class SnapshotCache:
+    """
+    二进制快照缓存类
+
+    文件内容为标识 + 文件头长度 + 文件头（格式版本、字段布局、各源文件的修改时间和大小）+ 数据，
+    文件头和数据分别使用 pickle 保存。读取时整个文件做内存映射，先只解析文件头，
+    与源文件不一致时不再读取数据部分。快照只用于本机缓存，不应从外部拷贝。
+    """
+
+    def __init__(self, snapshot_file, source_files):
+        """
+        初始化快照缓存
+
+        Args:
+            snapshot_file (str): 快照文件路径
+            source_files (list): 快照对应的源文件路径，任一文件变化后快照失效
+        """
+        self.snapshot_file = snapshot_file
+        self.source_files = list(source_files)
+
+    def load(self):
+        """
+        读取快照
+
+        Returns:
+            dict: 快照中保存的数据；快照不存在、已过期或损坏时返回None
+        """
+        try:
+            with open(self.snapshot_file, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        body_start = self._check_header(view)
+                        if body_start is None:
+                            return None
+                        # 反序列化创建的大量对象都会保留，期间暂停循环垃圾回收，避免反复扫描新对象
+                        gc_enabled = gc.isenabled()
+                        gc.disable()
+                        try:
+                            return pickle.loads(view[body_start:])
+                        finally:
+                            if gc_enabled:
+                                gc.enable()
+                    finally:
+                        view.release()
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError, AttributeError, TypeError, struct.error):
+            # 文件不存在、为空或内容损坏时退回读取源文件
+            return None
+
+    def save(self, state):
+        """
+        以原子方式写入快照，文件头记录当前源文件的状态
+
+        Args:
+            state (dict): 要保存的数据
+        """
+        header = pickle.dumps(self._header(), protocol=pickle.HIGHEST_PROTOCOL)
+        body = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        atomic_write_bytes(self.snapshot_file, _MAGIC + _LENGTH.pack(len(header)) + header + body)
+
+    def is_fresh(self):
+        """
+        检查快照是否与源文件一致（只读取文件头）
+
+        Returns:
+            bool: 快照存在且未过期
+        """
+        try:
+            with open(self.snapshot_file, 'rb') as f:
+                prefix = f.read(len(_MAGIC) + _LENGTH.size)
+                if len(prefix) < len(_MAGIC) + _LENGTH.size:
+                    return False
+                header_size = _LENGTH.unpack_from(prefix, len(_MAGIC))[0]
+                return self._check_header(prefix + f.read(header_size)) is not None
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError, struct.error):
+            return False
+
+    def remove(self):
+        """删除快照文件"""
+        try:
+            os.remove(self.snapshot_file)
+        except OSError:
+            pass
+
+    def _check_header(self, data):
+        """
+        校验快照开头的标识和文件头
+
+        Args:
+            data (bytes/memoryview): 快照文件内容（至少包含文件头）
+
+        Returns:
+            int: 文件头与当前源文件一致时返回数据部分的起始位置，否则返回None
+        """
+        if bytes(data[:len(_MAGIC)]) != _MAGIC:
+            return None
+        header_start = len(_MAGIC) + _LENGTH.size
+        header_size = _LENGTH.unpack_from(data, len(_MAGIC))[0]
+        header = pickle.loads(data[header_start:header_start + header_size])
+        if header != self._header():
+            return None
+        return header_start + header_size
+
+    def _header(self):
+        """生成与当前源文件状态对应的文件头"""
+        return {
+            "format": SNAPSHOT_FORMAT,
+            "schema": _schema(),
+            "sources": [_file_stamp(path) for path in self.source_files]
+        }
+
+
+def _file_stamp(path):
+    """源文件的 (文件名, 修改时间ns, 大小)，文件不存在时后两项为None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (os.path.basename(path), None, None)
+    return (os.path.basename(path), stat.st_mtime_ns, stat.st_size)
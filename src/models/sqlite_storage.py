@@ -0,0 +1,400 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+SQLite存储模块
+使用标准库 sqlite3 保存球体、法兰、报价和设置数据，单条增删只写对应的行
+"""
+
+import os
+import json
+import sqlite3
+import threading
+
+from src.models.quotation_journal import QuotationJournal
+from src.utils.file_utils import atomic_write_json
+
+# 存储方式（settings.json 中的 storage_backend）
+STORAGE_JSON = "json"
+STORAGE_SQLITE = "sqlite"
+
+# 数据库文件名
+DATABASE_FILENAME = "data.db"
+
+# 报价表中三个配件的列前缀
+QUOTATION_PARTS = ("sphere", "flange1", "flange2")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS spheres (
+    id INTEGER PRIMARY KEY,
+    type_name TEXT NOT NULL,
+    model TEXT NOT NULL,
+    cost_price REAL NOT NULL
+);
+-- 单条更新和删除按 (类型, 型号) 定位行
+CREATE INDEX IF NOT EXISTS idx_spheres_type_model ON spheres (type_name, model);
+
+CREATE TABLE IF NOT EXISTS flanges (
+    id INTEGER PRIMARY KEY,
+    type_name TEXT NOT NULL,
+    model TEXT NOT NULL,
+    cost_price REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_flanges_type_model ON flanges (type_name, model);
+
+CREATE TABLE IF NOT EXISTS quotations (
+    id INTEGER PRIMARY KEY,
+    sphere_type TEXT NOT NULL,
+    sphere_model TEXT NOT NULL,
+    sphere_cost REAL NOT NULL,
+    flange1_type TEXT NOT NULL,
+    flange1_model TEXT NOT NULL,
+    flange1_cost REAL NOT NULL,
+    flange2_type TEXT NOT NULL,
+    flange2_model TEXT NOT NULL,
+    flange2_cost REAL NOT NULL,
+    quantity INTEGER NOT NULL,
+    profit_percentage REAL NOT NULL
+);
+-- 报价按配件查找由内存中的反向索引完成，这些索引没有查询使用，只拖慢写入
+DROP INDEX IF EXISTS idx_quotations_sphere;
+DROP INDEX IF EXISTS idx_quotations_flange1;
+DROP INDEX IF EXISTS idx_quotations_flange2;
+
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_CATALOG_TABLES = ("spheres", "flanges")
+
+_QUOTATION_COLUMNS = (
+    "sphere_type, sphere_model, sphere_cost, "
+    "flange1_type, flange1_model, flange1_cost, "
+    "flange2_type, flange2_model, flange2_cost, "
+    "quantity, profit_percentage"
+)
+
+
+class SqliteStorage:
+    """
+    SQLite存储类，每个集合对应一张表
+
+    写入方法只把修改排入队列，调用 commit() 时才在一个短事务中依次执行并提交，
+    多次修改可以合并为一次写盘。两次提交之间不持有数据库锁，其他进程可以正常读写同一数据库。
+    提交失败时整个事务回滚，排队的修改保留到下次 commit() 重试。
+    """
+
+    def __init__(self, db_path):
+        """
+        打开（必要时创建）SQLite数据库
+
+        Args:
+            db_path (str): 数据库文件路径
+        """
+        self.db_path = db_path
+        # 自动保存定时器可能在其他线程写盘，由内部锁串行化访问；事务由本类自行开始和提交
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.RLock()
+        self._pending = []  # 尚未提交的写入函数，参数为数据库连接
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        """关闭数据库连接（尚未提交的修改被丢弃）"""
+        with self._lock:
+            self._pending = []
+            self._conn.close()
+
+    def commit(self):
+        """
+        在一个事务中执行所有排队的修改并提交
+
+        Raises:
+            sqlite3.Error: 写入失败（如数据库被其他进程长时间锁定），排队的修改保留
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            try:
+                # 直接取得写锁，避免读到一半才发现需要等待其他写入者
+                self._conn.execute("BEGIN IMMEDIATE")
+                for write in pending:
+                    write(self._conn)
+                self._conn.execute("COMMIT")
+            except Exception:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                self._pending[:0] = pending
+                raise
+
+    def _queue(self, write):
+        """
+        排入一组写入语句，commit() 时执行
+
+        Args:
+            write (callable): 写入函数，参数为数据库连接
+        """
+        with self._lock:
+            self._pending.append(write)
+
+    # =========== 目录数据 ===========
+
+    def load_catalog(self, table):
+        """
+        读取球体或法兰目录
+
+        Args:
+            table (str): 表名，spheres 或 flanges
+
+        Returns:
+            list: 数据字典列表，按写入顺序排列
+        """
+        table = _check_catalog_table(table)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT type_name, model, cost_price FROM {table} ORDER BY id"
+            ).fetchall()
+        return [{"type_name": t, "model": m, "cost_price": c} for t, m, c in rows]
+
+    def save_catalog(self, table, items):
+        """
+        整体替换球体或法兰目录（用于整体替换导入等批量修改）
+
+        Args:
+            table (str): 表名，spheres 或 flanges
+            items (list): 数据字典列表
+        """
+        table = _check_catalog_table(table)
+        rows = [(item["type_name"], item["model"], item["cost_price"]) for item in items]
+
+        def write(conn):
+            conn.execute(f"DELETE FROM {table}")
+            conn.executemany(
+                f"INSERT INTO {table} (type_name, model, cost_price) VALUES (?, ?, ?)", rows
+            )
+        self._queue(write)
+
+    def upsert_catalog_items(self, table, items):
+        """
+        逐条写入目录数据：已有相同 (类型, 型号) 时更新第一条的成本价，否则新增
+
+        Args:
+            table (str): 表名，spheres 或 flanges
+            items (list): 数据字典列表
+        """
+        table = _check_catalog_table(table)
+        rows = [(item["type_name"], item["model"], item["cost_price"]) for item in items]
+
+        def write(conn):
+            for type_name, model, cost_price in rows:
+                cursor = conn.execute(
+                    f"UPDATE {table} SET cost_price = ? WHERE id = "
+                    f"(SELECT MIN(id) FROM {table} WHERE type_name = ? AND model = ?)",
+                    (cost_price, type_name, model)
+                )
+                if cursor.rowcount == 0:
+                    conn.execute(
+                        f"INSERT INTO {table} (type_name, model, cost_price) VALUES (?, ?, ?)",
+                        (type_name, model, cost_price)
+                    )
+        self._queue(write)
+
+    def delete_catalog_item(self, table, type_name, model, occurrence=0):
+        """
+        删除一条目录数据
+
+        Args:
+            table (str): 表名，spheres 或 flanges
+            type_name (str): 类型名称
+            model (str): 型号规格
+            occurrence (int): 存在重复的 (类型, 型号) 时，删除按写入顺序的第几条（从0开始）
+        """
+        table = _check_catalog_table(table)
+        self._queue(lambda conn: conn.execute(
+            f"DELETE FROM {table} WHERE id = (SELECT id FROM {table} "
+            f"WHERE type_name = ? AND model = ? ORDER BY id LIMIT 1 OFFSET ?)",
+            (type_name, model, occurrence)
+        ))
+
+    # =========== 报价数据 ===========
+
+    def load_quotations(self):
+        """
+        读取报价数据
+
+        Returns:
+            list: 与 QuotationItem.to_dict() 格式相同的字典列表
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_QUOTATION_COLUMNS} FROM quotations ORDER BY id"
+            ).fetchall()
+        return [_quotation_from_row(row) for row in rows]
+
+    def save_quotations(self, items):
+        """
+        整体替换报价数据（用于批量重新定价、打开存档报价单等批量修改）
+
+        Args:
+            items (list): 与 QuotationItem.to_dict() 格式相同的字典列表
+        """
+        rows = [_quotation_to_row(item) for item in items]
+
+        def write(conn):
+            conn.execute("DELETE FROM quotations")
+            conn.executemany(
+                f"INSERT INTO quotations ({_QUOTATION_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        self._queue(write)
+
+    def insert_quotation(self, item):
+        """
+        在末尾追加一条报价
+
+        Args:
+            item (dict): 与 QuotationItem.to_dict() 格式相同的字典
+        """
+        row = _quotation_to_row(item)
+        self._queue(lambda conn: conn.execute(
+            f"INSERT INTO quotations ({_QUOTATION_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row
+        ))
+
+    def delete_quotation(self, position):
+        """
+        删除指定位置的报价
+
+        Args:
+            position (int): 报价按写入顺序的位置（从0开始）
+        """
+        self._queue(lambda conn: conn.execute(
+            "DELETE FROM quotations WHERE id = (SELECT id FROM quotations ORDER BY id LIMIT 1 OFFSET ?)",
+            (position,)
+        ))
+
+    def clear_quotations(self):
+        """删除全部报价"""
+        self._queue(lambda conn: conn.execute("DELETE FROM quotations"))
+
+    # =========== 设置 ===========
+
+    def load_settings(self):
+        """
+        读取设置
+
+        Returns:
+            dict: 设置字典，数据库中没有设置时返回空字典
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM settings").fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def save_settings(self, settings):
+        """
+        整体替换设置
+
+        Args:
+            settings (dict): 设置字典
+        """
+        rows = [(key, json.dumps(value, ensure_ascii=False)) for key, value in settings.items()]
+
+        def write(conn):
+            conn.execute("DELETE FROM settings")
+            conn.executemany("INSERT INTO settings (key, value) VALUES (?, ?)", rows)
+        self._queue(write)
+
+
+def migrate_json_to_sqlite(data_dir, db_path=None):
+    """
+    一次性将JSON数据文件迁移到SQLite数据库
+
+    迁移完成后 settings.json 中的 storage_backend 被设为 sqlite，
+    原JSON文件保留不动，可作为备份。
+
+    Args:
+        data_dir (str): JSON数据文件所在目录
+        db_path (str, optional): 数据库文件路径，默认为数据目录下的 data.db
+
+    Returns:
+        tuple: (success, message)
+    """
+    try:
+        db_path = db_path or os.path.join(data_dir, DATABASE_FILENAME)
+        settings_file = os.path.join(data_dir, "settings.json")
+
+        settings = _read_json(settings_file, {})
+        spheres = _read_json(os.path.join(data_dir, "spheres.json"), [])
+        flanges = _read_json(os.path.join(data_dir, "flanges.json"), [])
+
+        # 日志存储方式下需要重放日志才能得到完整报价
+        quotations_file = os.path.join(data_dir, "quotations.json")
+        journal_file = os.path.join(data_dir, "quotations.journal")
+        if os.path.exists(journal_file):
+            quotations = QuotationJournal(quotations_file, journal_file).load()
+        else:
+            quotations = _read_json(quotations_file, [])
+
+        settings["storage_backend"] = STORAGE_SQLITE
+
+        storage = SqliteStorage(db_path)
+        try:
+            storage.save_catalog("spheres", spheres)
+            storage.save_catalog("flanges", flanges)
+            storage.save_quotations(quotations)
+            storage.save_settings(settings)
+            storage.commit()
+        finally:
+            storage.close()
+
+        atomic_write_json(settings_file, settings)
+        return True, (f"成功迁移 {len(spheres)} 条球体数据、{len(flanges)} 条法兰数据、"
+                      f"{len(quotations)} 条报价数据")
+    except Exception as e:
+        return False, f"迁移失败: {e}"
+
+
+def _read_json(filepath, default):
+    """读取JSON文件，文件不存在时返回默认值"""
+    if not os.path.exists(filepath):
+        return default
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _check_catalog_table(table):
+    """校验目录表名，防止拼接任意SQL"""
+    if table not in _CATALOG_TABLES:
+        raise ValueError(f"未知的目录表: {table}")
+    return table
+
+
+def _quotation_to_row(item):
+    """将报价字典展开为数据库行"""
+    row = []
+    for part in QUOTATION_PARTS:
+        component = item.get(part, {})
+        row.extend((
+            component.get("type_name", ""),
+            component.get("model", ""),
+            float(component.get("cost_price", 0.0))
+        ))
+    row.append(int(item.get("quantity", 1)))
+    row.append(float(item.get("profit_percentage", 30.0)))
+    return row
+
+
+def _quotation_from_row(row):
+    """将数据库行还原为报价字典"""
+    item = {}
+    for i, part in enumerate(QUOTATION_PARTS):
+        item[part] = {
+            "type_name": row[i * 3],
+            "model": row[i * 3 + 1],
+            "cost_price": row[i * 3 + 2]
+        }
+    item["quantity"] = row[9]
+    item["profit_percentage"] = row[10]
+    return item
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+后台导出模块
+在工作线程中分批导出报价单，界面线程通过 after() 轮询进度，支持中途取消
+"""
+
+import threading
+
+from src.utils.export_utils import iter_write_pdf, iter_write_excel
+
+# 按导出格式选择分批写入函数
+EXPORT_GENERATORS = {
+    "pdf": iter_write_pdf,
+    "xlsx": iter_write_excel,
+}
+
+# 界面轮询进度的默认间隔（毫秒）
+DEFAULT_POLL_INTERVAL = 100
+
+
+class BackgroundExport:
+    """
+    在工作线程中执行的一次报价单导出
+
+    工作线程每写完一批报价行更新一次进度，并检查是否已请求取消；取消时放弃导出，不会生成或覆盖文件。
+    进度和结果回调都由 poll() 在界面线程中调用，回调中可以直接更新 Tk 控件。
+
+    用法:
+        task = BackgroundExport("pdf", data_manager.quotations, filepath, settings)
+        task.start()
+        task.poll(root, on_progress=update_progressbar, on_done=show_result)
+        # 点击“取消”按钮时
+        task.cancel()
+    """
+
+    def __init__(self, export_format, quotations, filepath, settings, show_cost_price=False):
+        """
+        初始化导出任务
+
+        Args:
+            export_format (str): 导出格式，"pdf" 或 "xlsx"
+            quotations (list): 报价项目列表
+            filepath (str): 输出文件路径
+            settings (dict): 公司信息等设置
+            show_cost_price (bool): 是否显示成本价和利润
+
+        Raises:
+            ValueError: 不支持的导出格式
+        """
+        if export_format not in EXPORT_GENERATORS:
+            raise ValueError(f"不支持的导出格式: {export_format}")
+        self.export_format = export_format
+        # 复制报价行列表，导出期间界面增删报价行不影响本次导出
+        self.quotations = list(quotations)
+        self.filepath = filepath
+        self.settings = dict(settings)
+        self.show_cost_price = show_cost_price
+
+        self._lock = threading.Lock()
+        self._progress = (0, 2 * len(self.quotations))
+        self._result = None
+        self._cancel_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        在工作线程中开始导出
+
+        Returns:
+            threading.Thread: 导出线程
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="QuotationExport", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def cancel(self):
+        """请求取消导出，工作线程写完当前一批报价行后停止"""
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        """
+        检查是否已请求取消
+
+        Returns:
+            bool: 是否已请求取消
+        """
+        return self._cancel_event.is_set()
+
+    def is_done(self):
+        """
+        检查导出是否已结束（成功、失败或已取消）
+
+        Returns:
+            bool: 导出是否已结束
+        """
+        return self.result is not None
+
+    @property
+    def progress(self):
+        """当前进度 (已完成步数, 总步数)"""
+        with self._lock:
+            return self._progress
+
+    @property
+    def result(self):
+        """导出结果 (success, message)，尚未结束时为None"""
+        with self._lock:
+            return self._result
+
+    def wait(self, timeout=None):
+        """
+        等待导出结束（命令行或测试中使用，界面中应使用 poll()）
+
+        Args:
+            timeout (float, optional): 最长等待秒数
+
+        Returns:
+            tuple: 导出结果 (success, message)，超时时为None
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.result
+
+    def poll(self, widget, on_progress=None, on_done=None, interval=DEFAULT_POLL_INTERVAL):
+        """
+        用 widget.after() 定时检查进度，回调在界面线程中执行
+
+        Args:
+            widget: 任意 Tk 控件，用于调度定时检查
+            on_progress (callable, optional): 进度变化时调用 on_progress(已完成步数, 总步数)
+            on_done (callable, optional): 导出结束时调用 on_done(success, message)，只调用一次
+            interval (int): 检查间隔（毫秒）
+        """
+        last_progress = [None]
+
+        def check():
+            progress = self.progress
+            result = self.result
+            if on_progress and progress != last_progress[0]:
+                last_progress[0] = progress
+                on_progress(*progress)
+            if result is not None:
+                if on_done:
+                    on_done(*result)
+                return
+            widget.after(interval, check)
+
+        widget.after(interval, check)
+
+    def _run(self):
+        """工作线程：逐批写入文件，每批之间检查是否已请求取消"""
+        steps = EXPORT_GENERATORS[self.export_format](
+            self.quotations, self.filepath, self.settings, self.show_cost_price
+        )
+        try:
+            for progress in steps:
+                with self._lock:
+                    self._progress = progress
+                if self._cancel_event.is_set():
+                    # 关闭生成器即放弃导出，文件只在最后一步保存，因此不会留下不完整的文件
+                    steps.close()
+                    self._finish(False, "导出已取消")
+                    return
+            total = 2 * len(self.quotations)
+            with self._lock:
+                self._progress = (total, total)
+            self._finish(True, f"已导出到 {self.filepath}")
+        except Exception as e:
+            self._finish(False, f"导出失败: {e}")
+
+    def _finish(self, success, message):
+        """记录导出结果"""
+        with self._lock:
+            self._result = (success, message)
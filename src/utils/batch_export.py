@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+批量导出模块
+在进程池中将多份报价单并行导出为PDF或Excel文件，并逐份报告耗时和失败原因
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.models.data_models import ComponentPool
+from src.models.quotation_archive import QuotationArchive
+from src.utils.export_utils import write_pdf, write_excel, get_pdf_styles
+
+# 按扩展名选择导出格式
+EXPORT_WRITERS = {
+    ".pdf": write_pdf,
+    ".xlsx": write_excel,
+}
+
+# 文件名中不允许出现的字符（Windows）
+_INVALID_FILENAME_CHARS = '\\/:*?"<>|'
+
+
+class ArchivedLines:
+    """
+    存档中一个报价单的报价行（只记录存档路径和编号）
+
+    作为 export_batch() 的 quotations 传给工作进程，由工作进程自己从存档读取报价行，
+    主进程不必预先读出所有报价单，也不必把报价行序列化后发送给工作进程。
+    """
+
+    def __init__(self, archive_path, document_id, line_count=0):
+        """
+        Args:
+            archive_path (str): 存档数据库文件路径
+            document_id (int): 报价单编号
+            line_count (int): 抬头记录的行数，读取失败时用于报告结果
+        """
+        self.archive_path = archive_path
+        self.document_id = document_id
+        self.line_count = line_count
+
+    def __len__(self):
+        return self.line_count
+
+    def load(self):
+        """
+        从存档读取报价行
+
+        Returns:
+            list: QuotationItem 列表
+        """
+        archive = QuotationArchive(self.archive_path)
+        try:
+            # 每份报价单使用自己的共享池，导出完即可释放
+            return archive.load_lines(self.document_id, ComponentPool())
+        finally:
+            archive.close()
+
+
+def export_batch(jobs, settings, show_cost_price=False, max_workers=None, progress_callback=None):
+    """
+    在进程池中并行导出多份报价单
+
+    每个工作进程启动时预先创建PDF样式，之后处理的各份报价单共用。
+
+    Args:
+        jobs (list): (quotations, filepath) 列表，quotations 为 QuotationItem 列表或 ArchivedLines
+            （在导出时才读取报价行），导出格式按 filepath 的扩展名识别（.pdf/.xlsx）
+        settings (dict): 公司信息等设置
+        show_cost_price (bool): 是否显示成本价和利润
+        max_workers (int, optional): 工作进程数，默认为CPU核数；只有1个进程时在当前进程中导出
+        progress_callback (callable, optional): 每完成一份调用 progress_callback(完成数, 总数)
+
+    Returns:
+        tuple: (success, message, results)，results 与 jobs 一一对应、顺序相同（出错时也是如此），
+            每项为包含 filepath、lines、seconds、error 的字典；全部成功时 success 为True
+    """
+    start = time.perf_counter()
+    tasks = [(quotations, filepath, settings, show_cost_price) for quotations, filepath in jobs]
+    results = [None] * len(tasks)
+    workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+    try:
+        if workers <= 1:
+            # 单核或单份报价单时启动进程池得不偿失，直接在当前进程导出
+            for i, task in enumerate(tasks):
+                results[i] = export_job(task)
+                if progress_callback:
+                    progress_callback(i + 1, len(tasks))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+                futures = {executor.submit(export_job, task): i for i, task in enumerate(tasks)}
+                for done, future in enumerate(as_completed(futures), 1):
+                    i = futures[future]
+                    try:
+                        results[i] = future.result()
+                    except Exception as e:
+                        # 工作进程异常退出等情况只记为该份失败，不影响其他报价单的结果
+                        results[i] = _failed_result(tasks[i], e)
+                    if progress_callback:
+                        progress_callback(done, len(tasks))
+    except Exception as e:
+        # 尚未得到结果的报价单都记为失败，保持 results 与 jobs 一一对应
+        results = [_failed_result(task, e) if result is None else result
+                   for task, result in zip(tasks, results)]
+        return False, f"批量导出失败: {e}", results
+
+    failed = [result for result in results if result["error"]]
+    message = (f"成功导出 {len(results) - len(failed)} 个文件，失败 {len(failed)} 个，"
+               f"用时 {time.perf_counter() - start:.2f} 秒")
+    return not failed, message, results
+
+
+def export_job(task):
+    """
+    导出一份报价单（供进程池中的工作进程调用）
+
+    Args:
+        task (tuple): (quotations, filepath, settings, show_cost_price)，quotations 可以是 ArchivedLines
+
+    Returns:
+        dict: 包含 filepath、lines、seconds、error 的导出结果，失败时 error 为错误说明
+    """
+    quotations, filepath, settings, show_cost_price = task
+    start = time.perf_counter()
+    result = {"filepath": filepath, "lines": len(quotations), "error": None}
+    try:
+        if isinstance(quotations, ArchivedLines):
+            quotations = quotations.load()
+            result["lines"] = len(quotations)
+        extension = os.path.splitext(filepath)[1].lower()
+        writer = EXPORT_WRITERS.get(extension)
+        if writer is None:
+            raise ValueError(f"不支持的导出格式: {extension}")
+        directory = os.path.dirname(os.path.abspath(filepath))
+        os.makedirs(directory, exist_ok=True)
+        writer(quotations, filepath, settings, show_cost_price)
+    except Exception as e:
+        result["error"] = str(e)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def _failed_result(task, error):
+    """
+    生成未能完成导出的报价单的结果
+
+    Args:
+        task (tuple): (quotations, filepath, settings, show_cost_price)
+        error (Exception): 失败原因
+
+    Returns:
+        dict: 与 export_job() 返回格式相同的导出结果
+    """
+    quotations, filepath = task[0], task[1]
+    return {"filepath": filepath, "lines": len(quotations), "error": str(error) or type(error).__name__,
+            "seconds": 0.0}
+
+
+def safe_filename(name):
+    """
+    将报价单名称等文字转换为可用作文件名的字符串
+
+    Args:
+        name (str): 原始名称
+
+    Returns:
+        str: 替换了非法字符的文件名（不含扩展名）
+    """
+    cleaned = "".join("_" if char in _INVALID_FILENAME_CHARS or ord(char) < 32 else char for char in name)
+    return cleaned.strip().rstrip(".") or "报价单"
+
+
+def _init_worker():
+    """工作进程初始化：预先创建PDF样式，同一进程导出的各份报价单共用"""
+    get_pdf_styles()
@@ -8,12 +8,48 @@
 
 import os
 import datetime
+from xml.sax.saxutils import escape
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-import pandas as pd
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.platypus.frames import Frame
+from reportlab.platypus.doctemplate import PageTemplate, BaseDocTemplate
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+from src.models.money import cents_to_yuan, format_cents
+from src.models.pricing import QuotationPricing
+
+# 报价表表头（PDF和Excel共用）
+TABLE_HEADER = ("产品描述", "数量", "单价(¥)", "金额合计(¥)")
+TABLE_HEADER_WITH_COST = ("产品描述", "数量", "单位成本(¥)", "成本合计(¥)", "利润率(%)", "单价(¥)", "金额合计(¥)")
+
+# PDF报价表的行高（磅）。行高和列宽预先给定后 reportlab 不再逐格测量，分页也可预先算出。
+# 产品描述超出列宽的行改用可换行的段落，行高按换行后的行数增加
+_PDF_HEADER_ROW_HEIGHT = 30
+_PDF_LEADING = 12  # 单元格文字行距
+_PDF_CELL_VERTICAL_PADDING = 3  # reportlab 表格单元格默认的上、下内边距
+_PDF_ROW_HEIGHT = _PDF_LEADING + 2 * _PDF_CELL_VERTICAL_PADDING
+_PDF_FONT = "Helvetica"
+_PDF_FONT_SIZE = 10
+_PDF_HEADER_FONT = "Helvetica-Bold"
+_PDF_HEADER_FONT_SIZE = 12
+_PDF_CELL_PADDING = 6
+_PDF_MIN_DESCRIPTION_WIDTH = 4*cm
+_PDF_FRAME_PADDING = 6  # SimpleDocTemplate 页面框架的内边距
+
+# 段落和表格样式，首次导出PDF时创建后复用
+_PDF_STYLES = None
+
+# 增量导出时每批处理的报价行数，每处理完一批报告一次进度
+EXPORT_BATCH_ROWS = 500
+
+# 逐个元素排版依赖 BaseDocTemplate.build() 内部使用的方法（按 requirements.txt 中固定的
+# reportlab 版本编写）；其他版本缺少这些方法时退回公开的 build()，只是排版期间不报告进度
+_INCREMENTAL_BUILD = all(hasattr(BaseDocTemplate, name)
+                         for name in ("_calc", "_startBuild", "_endBuild", "handle_flowable", "clean_hanging"))
 
 def export_to_pdf(quotations, filepath, settings, show_cost_price=False):
     """
@@ -29,128 +65,334 @@ def export_to_pdf(quotations, filepath, settings, show_cost_price=False):
         bool: 导出是否成功
     """
     try:
-        # 创建一个文档
-        doc = SimpleDocTemplate(
-            filepath,
-            pagesize=A4,
-            leftMargin=2*cm,
-            rightMargin=2*cm,
-            topMargin=2*cm,
-            bottomMargin=2*cm
-        )
-        
-        # 获取样式
-        styles = getSampleStyleSheet()
-        title_style = styles["Title"]
-        normal_style = styles["Normal"]
-        
-        # 自定义段落样式
-        header_style = ParagraphStyle(
-            'Header',
-            parent=styles['Heading1'],
-            fontSize=14,
-            spaceAfter=10
-        )
-        
-        # 初始化文档内容
-        elements = []
-        
-        # 添加标题
-        title = Paragraph("报价单", title_style)
-        elements.append(title)
-        elements.append(Spacer(1, 0.5*cm))
-        
-        # 添加公司信息
-        company_info = [
-            Paragraph(f"<b>公司名称:</b> {settings.get('company_name', '')}", normal_style),
-            Paragraph(f"<b>联系方式:</b> {settings.get('contact_info', '')}", normal_style),
-            Paragraph(f"<b>地址:</b> {settings.get('address', '')}", normal_style),
-            Paragraph(f"<b>日期:</b> {datetime.datetime.now().strftime('%Y-%m-%d')}", normal_style)
-        ]
-        
-        for info in company_info:
-            elements.append(info)
-            elements.append(Spacer(1, 0.2*cm))
-        
-        elements.append(Spacer(1, 0.5*cm))
-        
-        # 准备表格数据
+        write_pdf(quotations, filepath, settings, show_cost_price)
+        return True
+    except Exception as e:
+        print(f"导出PDF失败: {e}")
+        return False
+
+
+def write_pdf(quotations, filepath, settings, show_cost_price=False):
+    """
+    将报价单写入PDF文件，失败时抛出异常
+    
+    Args:
+        quotations (list): 报价项目列表
+        filepath (str): 输出文件路径
+        settings (dict): 公司信息等设置
+        show_cost_price (bool): 是否显示成本价和利润
+    
+    Raises:
+        Exception: 写入文件失败
+    """
+    for _ in iter_write_pdf(quotations, filepath, settings, show_cost_price):
+        pass
+
+
+def iter_write_pdf(quotations, filepath, settings, show_cost_price=False, batch_rows=EXPORT_BATCH_ROWS):
+    """
+    分批将报价单写入PDF文件的生成器，失败时抛出异常
+    
+    报价行按页拆分为多个表格，每页重复表头，页末显示本页小计和累计金额，最后一页显示总计。
+    表格的列宽和行高预先算出（产品描述超出列宽的行换行并加高），reportlab 无需逐格测量即可排版，
+    大报价单也能快速生成。
+    
+    先逐批生成报价行文字，再逐页排版，每完成一批或一页产出一次进度，总步数为报价行数的2倍。
+    文件在最后一步才保存，中途关闭生成器（取消导出）不会生成或覆盖文件。
+    
+    Args:
+        quotations (list): 报价项目列表
+        filepath (str): 输出文件路径
+        settings (dict): 公司信息等设置
+        show_cost_price (bool): 是否显示成本价和利润
+        batch_rows (int): 每批生成的报价行数
+    
+    Yields:
+        tuple: (已完成步数, 总步数)
+    
+    Raises:
+        Exception: 写入文件失败
+    """
+    # 创建一个文档
+    doc = _IncrementalDocTemplate(
+        filepath,
+        pagesize=A4,
+        leftMargin=2*cm,
+        rightMargin=2*cm,
+        topMargin=2*cm,
+        bottomMargin=2*cm
+    )
+    styles = get_pdf_styles()
+    normal_style = styles["normal"]
+    
+    # 初始化文档内容
+    elements = []
+    
+    # 添加标题
+    elements.append(Paragraph("报价单", styles["title"]))
+    elements.append(Spacer(1, 0.5*cm))
+    
+    # 添加公司信息
+    company_info = [
+        Paragraph(f"<b>公司名称:</b> {settings.get('company_name', '')}", normal_style),
+        Paragraph(f"<b>联系方式:</b> {settings.get('contact_info', '')}", normal_style),
+        Paragraph(f"<b>地址:</b> {settings.get('address', '')}", normal_style),
+        Paragraph(f"<b>日期:</b> {datetime.datetime.now().strftime('%Y-%m-%d')}", normal_style)
+    ]
+    
+    for info in company_info:
+        elements.append(info)
+        elements.append(Spacer(1, 0.2*cm))
+    
+    elements.append(Spacer(1, 0.5*cm))
+    
+    # 准备表格数据
+    table_header = list(TABLE_HEADER_WITH_COST if show_cost_price else TABLE_HEADER)
+    
+    # 一次计算所有行的价格和总金额
+    pricing = QuotationPricing(quotations)
+    total_amount = pricing.grand_total_cents
+    total_steps = 2 * len(quotations)
+    
+    rows = []
+    line_totals = []
+    for quotation, (unit_cost, total_cost, unit_price, total_price) in zip(quotations, pricing.iter_rows()):
         if show_cost_price:
-            # 包含成本价和利润率的表头
-            table_header = ["产品描述", "数量", "单位成本(¥)", "成本合计(¥)", "利润率(%)", "单价(¥)", "金额合计(¥)"]
+            row = [
+                quotation.description,
+                quotation.quantity,
+                format_cents(unit_cost),
+                format_cents(total_cost),
+                f"{quotation.profit_percentage:.0f}",
+                format_cents(unit_price),
+                format_cents(total_price)
+            ]
         else:
-            # 不包含成本和利润率的表头
-            table_header = ["产品描述", "数量", "单价(¥)", "金额合计(¥)"]
+            row = [
+                quotation.description,
+                quotation.quantity,
+                format_cents(unit_price),
+                format_cents(total_price)
+            ]
+        rows.append(row)
+        line_totals.append(total_price)
+        if len(rows) % batch_rows == 0:
+            yield len(rows), total_steps
+    
+    # 按页面可用高度分页，首页扣除标题和公司信息所占的高度
+    frame_width = doc.width
+    frame_height = doc.height - 2 * _PDF_FRAME_PADDING
+    intro_height = sum(_flowable_height(element, frame_width, frame_height) for element in elements)
+    col_widths = _pdf_column_widths(table_header, rows, frame_width)
+    row_heights = _wrap_long_descriptions(rows, col_widths[0], styles["cell"])
+    
+    running_total = 0
+    table_rows = {}  # 每页表格 -> 其中的报价行数，排版进度按已排版的报价行计
+    start = 0
+    page_height = frame_height - intro_height
+    while True:
+        end = _page_end(row_heights, start, page_height)
+        page_total = sum(line_totals[start:end])
+        running_total += page_total
+        last_page = end >= len(rows)
         
-        table_data = [table_header]
+        # 每页的表格：表头 + 本页报价行 + 页末汇总行
+        footer = []
+        if not (last_page and start == 0):
+            footer.append(_pdf_footer_row("本页小计", page_total, len(table_header)))
+        if last_page:
+            footer.append(_pdf_footer_row("总计", total_amount, len(table_header)))
+        else:
+            footer.append(_pdf_footer_row("累计", running_total, len(table_header)))
         
-        # 总金额
-        total_amount = 0
+        table = Table(
+            [table_header] + rows[start:end] + footer,
+            colWidths=col_widths,
+            rowHeights=[_PDF_HEADER_ROW_HEIGHT] + row_heights[start:end] + [_PDF_ROW_HEIGHT] * len(footer),
+            repeatRows=1
+        )
+        table.setStyle(styles["table_footer"][len(footer)])
+        elements.append(table)
+        table_rows[table] = end - start
         
-        # 填充表格数据
-        for quotation in quotations:
-            if show_cost_price:
-                row = [
-                    quotation.description,
-                    quotation.quantity,
-                    f"{quotation.unit_cost_price:.2f}",
-                    f"{quotation.total_cost_price:.2f}",
-                    f"{quotation.profit_percentage:.0f}",
-                    f"{quotation.unit_price:.2f}",
-                    f"{quotation.total_price:.2f}"
-                ]
-            else:
-                row = [
-                    quotation.description,
-                    quotation.quantity,
-                    f"{quotation.unit_price:.2f}",
-                    f"{quotation.total_price:.2f}"
-                ]
-            table_data.append(row)
-            total_amount += quotation.total_price
+        if last_page:
+            break
+        elements.append(PageBreak())
+        start = end
+        page_height = frame_height
+    
+    # 添加备注
+    elements.append(Spacer(1, 1*cm))
+    elements.append(Paragraph("<b>备注:</b>", normal_style))
+    elements.append(Paragraph("1. 本报价单有效期为30天。", normal_style))
+    elements.append(Paragraph("2. 付款方式: 预付款30%，发货前付清余款。", normal_style))
+    elements.append(Paragraph("3. 交货期: 合同签署后15个工作日内。", normal_style))
+    
+    # 逐个排版文档元素，每排完一页表格报告一次进度
+    done = len(rows)
+    for element in doc.iter_build(elements):
+        if element in table_rows:
+            done += table_rows[element]
+            yield done, total_steps
+
+
+class _IncrementalDocTemplate(SimpleDocTemplate):
+    """可以逐个元素排版的文档模板，排版过程中可以暂停或放弃"""
+    
+    def iter_build(self, flowables):
+        """
+        与 build() 相同地排版并保存文档，每排版一个元素后产出该元素
         
-        # 添加总计行
-        if show_cost_price:
-            total_row = ["总计", "", "", "", "", "", f"{total_amount:.2f}"]
-        else:
-            total_row = ["总计", "", "", f"{total_amount:.2f}"]
-        table_data.append(total_row)
+        流程与 SimpleDocTemplate.build() 一致（不含页面回调），生成器中途被关闭时不保存文件。
         
-        # 创建表格
-        table = Table(table_data)
+        Args:
+            flowables (list): 文档元素列表（排版过程中会被清空）
         
-        # 设置表格样式
-        table_style = TableStyle([
+        Yields:
+            Flowable: 刚排版完的元素
+        """
+        if not _INCREMENTAL_BUILD:
+            self.build(flowables)
+            return
+        self._calc()
+        frame = Frame(self.leftMargin, self.bottomMargin, self.width, self.height, id='normal')
+        self.addPageTemplates([PageTemplate(id='First', frames=frame, pagesize=self.pagesize),
+                               PageTemplate(id='Later', frames=frame, pagesize=self.pagesize)])
+        self._startBuild()
+        self.canv._doctemplate = self
+        try:
+            while flowables:
+                flowable = flowables[0]
+                self.clean_hanging()
+                self.handle_flowable(flowables)
+                yield flowable
+        finally:
+            del self.canv._doctemplate
+        self._endBuild()
+
+
+def get_pdf_styles():
+    """
+    获取PDF导出使用的段落和表格样式（首次调用时创建，之后各次导出共用）
+    
+    Returns:
+        dict: title、normal 段落样式，cell 单元格段落样式，以及 table_footer 表格样式（按页末汇总行数索引）
+    """
+    global _PDF_STYLES
+    if _PDF_STYLES is None:
+        sample = getSampleStyleSheet()
+        base_commands = [
             ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
             ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('FONTNAME', (0, 0), (-1, 0), _PDF_HEADER_FONT),
+            ('FONTSIZE', (0, 0), (-1, 0), _PDF_HEADER_FONT_SIZE),
             ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('ALIGN', (0, -1), (-1, -1), 'RIGHT'),
             ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+            # 描述换行而加高的行中，各列文字都从顶部开始
+            ('VALIGN', (0, 1), (-1, -1), 'TOP'),
             ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ])
-        table.setStyle(table_style)
-        
-        elements.append(table)
-        
-        # 添加备注
-        elements.append(Spacer(1, 1*cm))
-        elements.append(Paragraph("<b>备注:</b>", normal_style))
-        elements.append(Paragraph("1. 本报价单有效期为30天。", normal_style))
-        elements.append(Paragraph("2. 付款方式: 预付款30%，发货前付清余款。", normal_style))
-        elements.append(Paragraph("3. 交货期: 合同签署后15个工作日内。", normal_style))
-        
-        # 构建文档
-        doc.build(elements)
-        
-        return True
-    except Exception as e:
-        print(f"导出PDF失败: {e}")
-        return False
+        ]
+        table_footer = {}
+        for footer_rows in (1, 2):
+            table_footer[footer_rows] = TableStyle(base_commands + [
+                ('BACKGROUND', (0, -footer_rows), (-1, -1), colors.lightgrey),
+                ('FONTNAME', (0, -footer_rows), (-1, -1), 'Helvetica-Bold'),
+                ('ALIGN', (0, -footer_rows), (-1, -1), 'RIGHT')
+            ])
+        _PDF_STYLES = {
+            "title": sample["Title"],
+            "normal": sample["Normal"],
+            "cell": ParagraphStyle("QuotationCell", fontName=_PDF_FONT, fontSize=_PDF_FONT_SIZE,
+                                   leading=_PDF_LEADING),
+            "table_footer": table_footer
+        }
+    return _PDF_STYLES
+
+
+def _flowable_height(flowable, width, height):
+    """排版后元素在页面上占用的高度（含段前段后间距）"""
+    _, flowable_height = flowable.wrap(width, height)
+    return flowable_height + flowable.getSpaceBefore() + flowable.getSpaceAfter()
+
+
+def _page_end(row_heights, start, available_height):
+    """
+    从第 start 行起，一页表格在给定高度内能放下的报价行的结束位置
+
+    扣除表头和两行页末汇总的高度；每页至少放1行，避免超高的行导致无法分页。
+
+    Returns:
+        int: 本页最后一行之后的位置
+    """
+    remaining = available_height - _PDF_HEADER_ROW_HEIGHT - 2 * _PDF_ROW_HEIGHT
+    end = start
+    while end < len(row_heights) and row_heights[end] <= remaining:
+        remaining -= row_heights[end]
+        end += 1
+    if end == start and start < len(row_heights):
+        end += 1
+    return end
+
+
+def _wrap_long_descriptions(rows, column_width, style):
+    """
+    将超出描述列宽度的产品描述换成可换行的段落，并计算每行的行高
+
+    同一描述文字只测量一次；未超宽的行保持纯文字和固定行高。
+
+    Args:
+        rows (list): 报价表数据行，第一列为产品描述（原地替换）
+        column_width (float): 描述列宽度
+        style (ParagraphStyle): 单元格段落样式
+
+    Returns:
+        list: 每行的行高（磅）
+    """
+    available = column_width - 2 * _PDF_CELL_PADDING
+    heights = {}  # 描述文字 -> 行高
+    row_heights = []
+    for row in rows:
+        text = row[0]
+        height = heights.get(text)
+        if height is None:
+            height = _PDF_ROW_HEIGHT
+            if stringWidth(text, _PDF_FONT, _PDF_FONT_SIZE) > available:
+                _, text_height = Paragraph(escape(text), style).wrap(available, 1e6)
+                height = max(height, text_height + 2 * _PDF_CELL_VERTICAL_PADDING)
+            heights[text] = height
+        if height > _PDF_ROW_HEIGHT:
+            row[0] = Paragraph(escape(text), style)
+        row_heights.append(height)
+    return row_heights
+
+
+def _pdf_column_widths(header, rows, frame_width):
+    """
+    计算各页表格共用的列宽
+    
+    数值列取表头和最长数值中较宽者，产品描述列取最长描述的宽度，但不超过剩余的页面宽度。
+    """
+    widths = [0]
+    for i in range(1, len(header)):
+        longest = max((str(row[i]) for row in rows), key=len, default="")
+        widths.append(max(stringWidth(header[i], _PDF_HEADER_FONT, _PDF_HEADER_FONT_SIZE),
+                          stringWidth(longest, _PDF_FONT, _PDF_FONT_SIZE)) + 2 * _PDF_CELL_PADDING)
+    # 同一描述文字只测量一次
+    descriptions = {row[0] for row in rows}
+    description_width = max([stringWidth(text, _PDF_FONT, _PDF_FONT_SIZE) for text in descriptions] + [0])
+    widths[0] = max(min(description_width + 2 * _PDF_CELL_PADDING, frame_width - sum(widths[1:])),
+                    _PDF_MIN_DESCRIPTION_WIDTH)
+    return widths
+
+
+def _pdf_footer_row(label, amount_cents, column_count):
+    """页末汇总行：第一列为说明文字，最后一列为金额"""
+    row = [""] * column_count
+    row[0] = label
+    row[-1] = format_cents(amount_cents)
+    return row
+
 
 def export_to_excel(quotations, filepath, settings, show_cost_price=False):
     """
@@ -166,80 +408,129 @@ def export_to_excel(quotations, filepath, settings, show_cost_price=False):
         bool: 导出是否成功
     """
     try:
-        # 准备数据
-        if show_cost_price:
-            # 包含成本价和利润率的数据
-            data = {
-                "产品描述": [],
-                "数量": [],
-                "单位成本(¥)": [],
-                "成本合计(¥)": [],
-                "利润率(%)": [],
-                "单价(¥)": [],
-                "金额合计(¥)": []
-            }
-            
-            for quotation in quotations:
-                data["产品描述"].append(quotation.description)
-                data["数量"].append(quotation.quantity)
-                data["单位成本(¥)"].append(round(quotation.unit_cost_price, 2))
-                data["成本合计(¥)"].append(round(quotation.total_cost_price, 2))
-                data["利润率(%)"].append(round(quotation.profit_percentage, 0))
-                data["单价(¥)"].append(round(quotation.unit_price, 2))
-                data["金额合计(¥)"].append(round(quotation.total_price, 2))
-        else:
-            # 不包含成本和利润率的数据
-            data = {
-                "产品描述": [],
-                "数量": [],
-                "单价(¥)": [],
-                "金额合计(¥)": []
-            }
-            
-            for quotation in quotations:
-                data["产品描述"].append(quotation.description)
-                data["数量"].append(quotation.quantity)
-                data["单价(¥)"].append(round(quotation.unit_price, 2))
-                data["金额合计(¥)"].append(round(quotation.total_price, 2))
-        
-        # 创建DataFrame
-        df = pd.DataFrame(data)
-        
-        # 计算总金额
-        total_amount = sum(quotation.total_price for quotation in quotations)
-        
-        # 创建Excel写入器
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-            # 写入报价数据
-            df.to_excel(writer, sheet_name='报价单', index=False, startrow=5)
-            
-            # 获取工作簿和工作表
-            workbook = writer.book
-            worksheet = writer.sheets['报价单']
-            
-            # 写入标题和公司信息
-            worksheet.cell(row=1, column=1, value="报价单")
-            worksheet.cell(row=2, column=1, value=f"公司名称: {settings.get('company_name', '')}")
-            worksheet.cell(row=3, column=1, value=f"联系方式: {settings.get('contact_info', '')}")
-            worksheet.cell(row=4, column=1, value=f"日期: {datetime.datetime.now().strftime('%Y-%m-%d')}")
-            
-            # 添加总计行
-            total_row = len(quotations) + 6  # 标题5行 + 数据行数 + 表头1行
-            
-            # 合并单元格用于总计
-            if show_cost_price:
-                worksheet.cell(row=total_row, column=1, value="总计")
-                worksheet.cell(row=total_row, column=7, value=round(total_amount, 2))
-            else:
-                worksheet.cell(row=total_row, column=1, value="总计")
-                worksheet.cell(row=total_row, column=4, value=round(total_amount, 2))
-            
-            # 设置列宽
-            for i, column in enumerate(df.columns):
-                column_width = max(len(column) * 1.2, df[column].astype(str).map(len).max() * 1.2)
-                worksheet.column_dimensions[chr(65 + i)].width = column_width
-        
+        write_excel(quotations, filepath, settings, show_cost_price)
         return True
     except Exception as e:
         print(f"导出Excel失败: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+def write_excel(quotations, filepath, settings, show_cost_price=False):
+    """
+    将报价单写入Excel文件，失败时抛出异常
+    
+    Args:
+        quotations (list): 报价项目列表
+        filepath (str): 输出文件路径
+        settings (dict): 公司信息等设置
+        show_cost_price (bool): 是否显示成本价和利润
+    
+    Raises:
+        Exception: 写入文件失败
+    """
+    for _ in iter_write_excel(quotations, filepath, settings, show_cost_price):
+        pass
+
+
+def iter_write_excel(quotations, filepath, settings, show_cost_price=False, batch_rows=EXPORT_BATCH_ROWS):
+    """
+    分批将报价单写入Excel文件的生成器，失败时抛出异常
+    
+    使用 openpyxl 只写模式逐行写入，报价行不在内存中另存副本。只写模式需要在写入第一行前
+    设置列宽，因此先遍历一次报价行累计列宽和总金额，再遍历一次写入数据。
+    每遍每处理一批报价行产出一次进度，总步数为报价行数的2倍。文件在最后一步才保存，
+    中途关闭生成器（取消导出）不会生成或覆盖文件。
+    
+    Args:
+        quotations (list): 报价项目列表
+        filepath (str): 输出文件路径
+        settings (dict): 公司信息等设置
+        show_cost_price (bool): 是否显示成本价和利润
+        batch_rows (int): 每批处理的报价行数
+    
+    Yields:
+        tuple: (已完成步数, 总步数)
+    
+    Raises:
+        Exception: 写入文件失败
+    """
+    header = TABLE_HEADER_WITH_COST if show_cost_price else TABLE_HEADER
+    
+    # 第一遍：逐行累计每列最长的文本长度和总金额（分）
+    widths = [len(column) for column in header]
+    total_amount = 0
+    total_steps = 2 * len(quotations)
+    for done, (row, total_price) in enumerate(_iter_excel_rows(quotations, show_cost_price), 1):
+        total_amount += total_price
+        for i, value in enumerate(row):
+            length = len(str(value))
+            if length > widths[i]:
+                widths[i] = length
+        if done % batch_rows == 0:
+            yield done, total_steps
+    
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet('报价单')
+    for i, width in enumerate(widths):
+        worksheet.column_dimensions[get_column_letter(i + 1)].width = width * 1.2
+    
+    # 标题和公司信息占前5行，第6行为表头
+    worksheet.append(["报价单"])
+    worksheet.append([f"公司名称: {settings.get('company_name', '')}"])
+    worksheet.append([f"联系方式: {settings.get('contact_info', '')}"])
+    worksheet.append([f"日期: {datetime.datetime.now().strftime('%Y-%m-%d')}"])
+    worksheet.append([])
+    worksheet.append(list(header))
+    
+    # 第二遍：逐行写入数据
+    try:
+        for done, (row, _) in enumerate(_iter_excel_rows(quotations, show_cost_price), len(quotations) + 1):
+            worksheet.append(row)
+            if done % batch_rows == 0:
+                yield done, total_steps
+    except GeneratorExit:
+        # 取消导出：结束工作表的临时文件，不保存工作簿
+        worksheet.close()
+        raise
+    
+    # 总计行，金额放在最后一列
+    total_row = [None] * len(header)
+    total_row[0] = "总计"
+    total_row[-1] = cents_to_yuan(total_amount)
+    worksheet.append(total_row)
+    
+    workbook.save(filepath)
+
+
+def _iter_excel_rows(quotations, show_cost_price):
+    """
+    逐行生成Excel数据行，价格取自报价行的价格缓存
+    
+    Args:
+        quotations (list): 报价项目列表
+        show_cost_price (bool): 是否包含成本价和利润率列
+    
+    Yields:
+        tuple: (数据行列表, 该行金额合计(分))
+    """
+    for quotation in quotations:
+        unit_price = quotation.unit_price_cents
+        total_price = quotation.total_price_cents
+        if show_cost_price:
+            row = [
+                quotation.description,
+                quotation.quantity,
+                cents_to_yuan(quotation.unit_cost_cents),
+                cents_to_yuan(quotation.total_cost_cents),
+                round(quotation.profit_percentage, 0),
+                cents_to_yuan(unit_price),
+                cents_to_yuan(total_price)
+            ]
+        else:
+            row = [
+                quotation.description,
+                quotation.quantity,
+                cents_to_yuan(unit_price),
+                cents_to_yuan(total_price)
+            ]
+        yield row, total_price
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+文件工具模块
+提供崩溃安全的文件写入功能
+"""
+
+import os
+import json
+import stat
+import shutil
+import tempfile
+
+
+def _read_umask():
+    """读取进程的 umask（只能通过设置再恢复来读取，因此在导入模块时、尚未启动其他线程前读取一次）"""
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+# 新建文件的默认权限，与 open(..., 'w') 创建的文件相同
+_NEW_FILE_MODE = 0o666 & ~_read_umask()
+
+
+def atomic_write_json(filepath, data, backup_count=0, indent=2):
+    """
+    以原子方式将数据写入JSON文件
+
+    先写入同目录下的临时文件并fsync，再通过重命名替换目标文件。
+    写入过程中崩溃或断电时，目标文件保持旧内容，不会被截断。
+
+    Args:
+        filepath (str): 目标文件路径
+        data: 可JSON序列化的数据
+        backup_count (int): 保留的轮换备份数量，0表示不备份
+        indent (int): JSON缩进
+
+    Raises:
+        OSError: 写入或替换文件失败
+    """
+    # 一次性序列化后整体写入，比 json.dump 逐块写文件更快
+    text = json.dumps(data, ensure_ascii=False, indent=indent)
+    atomic_write_bytes(filepath, text.encode('utf-8'), backup_count)
+
+
+def atomic_write_bytes(filepath, data, backup_count=0):
+    """
+    以原子方式将二进制数据写入文件（临时文件 + fsync + 重命名）
+
+    目标文件已存在时，临时文件沿用其权限，替换后文件权限不变；新建的文件按 umask 设置权限。
+
+    Args:
+        filepath (str): 目标文件路径
+        data (bytes): 要写入的数据
+        backup_count (int): 保留的轮换备份数量，0表示不备份
+
+    Raises:
+        OSError: 写入或替换文件失败
+    """
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(filepath)}.", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # mkstemp 创建的临时文件权限为 0600，替换前改为原文件的权限，新建文件改为按 umask 的默认权限
+        try:
+            mode = stat.S_IMODE(os.stat(filepath).st_mode)
+        except FileNotFoundError:
+            mode = _NEW_FILE_MODE
+        os.chmod(temp_path, mode)
+
+        if backup_count > 0 and os.path.exists(filepath):
+            rotate_backups(filepath, backup_count)
+
+        os.replace(temp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+    _fsync_directory(directory)
+
+
+def rotate_backups(filepath, backup_count):
+    """
+    轮换备份文件：file.bak.1 为最新备份，超出数量的最旧备份被删除
+
+    Args:
+        filepath (str): 要备份的文件路径
+        backup_count (int): 保留的备份数量
+    """
+    oldest = f"{filepath}.bak.{backup_count}"
+    if os.path.exists(oldest):
+        os.remove(oldest)
+    for i in range(backup_count - 1, 0, -1):
+        source = f"{filepath}.bak.{i}"
+        if os.path.exists(source):
+            os.replace(source, f"{filepath}.bak.{i + 1}")
+
+    # 优先使用硬链接，避免复制整个文件；文件系统不支持时退回复制
+    newest = f"{filepath}.bak.1"
+    try:
+        os.link(filepath, newest)
+    except (OSError, AttributeError):
+        shutil.copy2(filepath, newest)
+
+
+def _fsync_directory(directory):
+    """同步目录项，确保重命名在断电后依然有效（Windows上不支持，直接忽略）"""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -16,6 +16,7 @@ if %errorlevel% neq 0 (
 )
 
 :: 打包应用程序
+:: 不打包 pandas（程序体积约减小 19 MB），打包版不能导入旧版 .xls 价格表，需先另存为 .xlsx
 echo.
 echo 正在打包应用程序...
 echo.
@@ -24,7 +25,7 @@ python -m PyInstaller --noconfirm --onefile --console --name "橡胶接头报价
   --add-data "assets;assets" ^
   --add-data "data;data" ^
   --hidden-import "tkinter" ^
-  --hidden-import "pandas" ^
+  --exclude-module "pandas" ^
   --hidden-import "openpyxl" ^
   --hidden-import "reportlab" ^
   --hidden-import "src.ui" ^